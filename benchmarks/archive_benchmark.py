@@ -0,0 +1,74 @@
+"""
+مقایسه حافظه و زمان نمایش ۱۰ نتیجه جستجو از آرشیو mmap شده با بارگذاری کامل فایل JSON.
+اجرا از root پروژه:
+    python benchmarks/archive_benchmark.py [--records 100000 200000 400000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.codec_benchmark import make_theses  # noqa: E402
+from src.utils import codec  # noqa: E402
+from src.utils.archive import encode_records, sync_index, RecordArchive  # noqa: E402
+
+
+def measure(function) -> tuple:
+    """(زمان به ثانیه، اوج حافظه تخصیص یافته پایتون به مگابایت)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1_000_000
+
+
+def first_matches(records, professor_id: str, limit: int = 10) -> list:
+    """۱۰ پایان‌نامه اول یک استاد (مثل نمایش نتایج جستجو)"""
+    found = []
+    for record in records:
+        if record.get("professor_id") == professor_id:
+            found.append(record)
+            if len(found) == limit:
+                break
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, nargs="+", default=[100_000, 200_000, 400_000])
+    args = parser.parse_args()
+
+    print(f"{'رکوردها':>9} {'JSON (s)':>9} {'JSON (MB)':>10} {'آرشیو (s)':>10} {'آرشیو (MB)':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.records:
+            theses = make_theses(count)
+            json_path = os.path.join(directory, "defended_theses.json")
+            archive_path = os.path.join(directory, "defended_theses.jsonl")
+            with open(json_path, 'w', encoding='utf-8') as file:
+                file.write(json.dumps(theses, ensure_ascii=False, indent=4))
+            with open(archive_path, 'w', encoding='utf-8') as file:
+                file.write(encode_records(theses))
+            sync_index(archive_path)
+            del theses
+
+            def from_json():
+                with open(json_path, 'rb') as file:
+                    first_matches(codec.loads(file.read()), "prof_150")
+
+            def from_archive():
+                first_matches(RecordArchive(archive_path), "prof_150")
+
+            json_time, json_memory = measure(from_json)
+            archive_time, archive_memory = measure(from_archive)
+            print(f"{count:>9,} {json_time:>9.2f} {json_memory:>10.1f} {archive_time:>10.4f} {archive_memory:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""
+بنچمارک سرتاسری گردش‌های اصلی سامانه روی داده‌های ساختگی با اندازه‌های مختلف:
+
+    python -m benchmarks.bench --sizes 1000,10000 --ops 200
+    python -m benchmarks.bench --sizes 10000 --save-baseline        # ذخیره نتیجه به عنوان مبنا
+    THESIS_STORAGE=sqlite python -m benchmarks.bench --sizes 10000
+
+برای هر اندازه (تعداد دانشجو) یک پردازه جدا با THESIS_DATA_ROOT موقت اجرا می‌شود، داده‌ها با
+src.storage.generate ساخته می‌شوند و سپس منطق واقعی پشت هر منو (سرویس‌ها، صف‌های کاری و جستجو)
+به ترتیب گردش کار اجرا می‌شود. برای هر عملیات صدک‌های تأخیر، ops/sec، بایت خوانده و نوشته شده
+به ازای هر عملیات (از /proc/self/io در لینوکس) و بیشترین RSS پردازه گزارش می‌شود.
+نتیجه در --output (JSON) ذخیره و با baseline مقایسه می‌شود؛ کندتر شدن میانه تأخیر بیش از
+--threshold به عنوان regression گزارش می‌شود و کد خروج 1 است.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCHMARKS_DIR)
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCHMARKS_DIR, "results.json")
+
+# عبارت‌های جستجو (از واژگان داده‌های ساختگی) برای هر نوع جستجو
+SEARCH_QUERIES = {
+    "title": ("شبکه", "تحلیل", "انرژی"),
+    "keywords": ("یادگیری عمیق", "منطق فازی", "رباتیک"),
+    "fulltext": ("شبکه عصبی", "داده‌کاوی", "کیفیت هوا"),
+    "professor": ("احمدی", "دکتر علی"),
+    "author": ("رضایی", "فاطمه"),
+    "year": ("2024", "2025"),
+    "judges": ("حسینی",),
+}
+
+
+def _io_counters() -> Optional[Dict[str, int]]:
+    """بایت‌های خوانده و نوشته شده با فراخوانی‌های سیستمی پردازه (فقط لینوکس)"""
+    try:
+        with open("/proc/self/io") as f:
+            counters = dict(line.split(": ") for line in f.read().splitlines())
+        return {"read": int(counters["rchar"]), "written": int(counters["wchar"])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # در macOS بر حسب بایت و در لینوکس بر حسب کیلوبایت
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(operations: List[Callable[[], Any]]) -> Dict[str, Any]:
+    """
+    اجرای پشت سر هم عملیات‌ها و خلاصه آماری آن‌ها.
+    عملیاتی که ServiceError بدهد جزو errors شمرده می‌شود ولی زمانش هم حساب می‌شود.
+    """
+    from src.services import ServiceError
+
+    latencies = []
+    errors = 0
+    io_before = _io_counters()
+    started = time.perf_counter()
+    for operation in operations:
+        op_started = time.perf_counter()
+        try:
+            operation()
+        except ServiceError:
+            errors += 1
+        latencies.append(time.perf_counter() - op_started)
+    total = time.perf_counter() - started
+    io_after = _io_counters()
+
+    if not latencies:
+        return {"ops": 0}
+    latencies.sort()
+    result = {
+        "ops": len(latencies),
+        "errors": errors,
+        "ops_per_sec": round(len(latencies) / total, 1) if total else None,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p90_ms": round(_percentile(latencies, 90) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    if io_before and io_after:
+        result["bytes_read_per_op"] = (io_after["read"] - io_before["read"]) // len(latencies)
+        result["bytes_written_per_op"] = (io_after["written"] - io_before["written"]) // len(latencies)
+    return result
+
+
+def _workloads(ops: int, rng: random.Random) -> Dict[str, Callable[[], List[Callable[[], Any]]]]:
+    """
+    نام عملیات -> سازنده لیست عملیات‌ها؛ کاندیدها قبل از زمان‌گیری و بعد از اجرای عملیات قبلی
+    انتخاب می‌شوند، پس هر مرحله روی نتیجه مرحله قبل (مثل گردش کار واقعی) کار می‌کند
+    """
+    from src import services
+    from src.menus.professor_menu import get_available_internal_judges, get_available_external_judges
+    from src.models import DefenseRequest, EnrollmentRequest, RequestStatus
+    from src.storage import get_storage
+    from src.utils.auth import verify_user
+    from src.utils.helpers import search_theses
+    from src.utils.work_queues import get_queue, due_defenses, EXTERNAL_GRADES_OWED, PENDING_DEFENSES, \
+        PENDING_ENROLLMENTS
+
+    storage = get_storage()
+    today = date.today()
+
+    def _first(items):
+        """اولین مورد صف (صف خالی یعنی داده در این فاصله تغییر کرده است)"""
+        for item in items:
+            return item
+        raise services.ServiceError("not_found", "موردی در صف نیست")
+
+    def request_thesis_course():
+        """request_thesis_course: دانشجویان بدون درخواست اخذ"""
+        enrolled = {r["student_id"] for r in storage.all("enrollment_requests")}
+        students = [s["user_id"] for s in storage.all("students") if s["user_id"] not in enrolled][:ops]
+
+        def _enroll(student_id):
+            courses = [c for c in services.thesis_courses() if c.capacity > 0]
+            if not courses:
+                raise services.ServiceError("capacity_full", "ظرفیت همه دروس پر است")
+            services.enroll(student_id, rng.choice(courses).course_id)
+
+        return [lambda s=s: _enroll(s) for s in students]
+
+    def review_enrollment_requests():
+        """review_enrollment_requests: صف درخواست‌های اخذ استاد و تایید اولین درخواست"""
+        professors = list(dict.fromkeys(r["professor_id"] for r in storage.all("enrollment_requests")
+                                        if r["status"] == RequestStatus.PENDING))[:ops]
+
+        def _review(professor_id):
+            requests = get_queue(PENDING_ENROLLMENTS, professor_id)
+            services.review_enrollments([(EnrollmentRequest.from_dict(_first(requests)), True)])
+
+        return [lambda p=p: _review(p) for p in professors]
+
+    def manage_defense_requests():
+        """manage_defense_requests: صف درخواست‌های دفاع، انتخاب داوران و تعیین جلسه"""
+        professors = list(dict.fromkeys(r["professor_id"] for r in storage.all("defense_requests")
+                                        if r["status"] == RequestStatus.PENDING))[:ops]
+
+        def _schedule(professor_id):
+            request = _first(get_queue(PENDING_DEFENSES, professor_id))
+            internal_judges = get_available_internal_judges(professor_id)
+            external_judges = get_available_external_judges()
+            if not internal_judges or not external_judges:
+                raise services.ServiceError("no_judge", "داوری با ظرفیت خالی نیست")
+            services.schedule_defense(DefenseRequest.from_dict(request), today.strftime("%Y-%m-%d"),
+                                      rng.choice(internal_judges).user_id, rng.choice(external_judges).user_id)
+
+        return [lambda p=p: _schedule(p) for p in professors]
+
+    def _due(role: str) -> List[str]:
+        return list(dict.fromkeys(
+            r[f"{role}_judge_id"] for r in storage.all("defense_requests")
+            if r["status"] == RequestStatus.APPROVED and f"{role}_grade" not in r
+            and r.get("defense_date", "9999") <= today.strftime("%Y-%m-%d")))[:ops]
+
+    def grade_defense_sessions():
+        """grade_defense_sessions: دفاع‌های برگزار شده استاد و ثبت نمره داور داخلی"""
+        def _grade(judge_id):
+            defense = _first(d for d in due_defenses(judge_id, today)
+                             if d.get("internal_judge_id") == judge_id and "internal_grade" not in d)
+            services.grade_defense(DefenseRequest.from_dict(defense), judge_id, rng.randint(12, 20))
+
+        return [lambda j=j: _grade(j) for j in _due("internal")]
+
+    def grade_theses_as_external():
+        """grade_theses_as_external: صف داور خارجی و ثبت نمره"""
+        def _grade(judge_id):
+            defense = _first(get_queue(EXTERNAL_GRADES_OWED, judge_id))
+            services.grade_defense(DefenseRequest.from_dict(defense), judge_id, rng.randint(12, 20))
+
+        return [lambda j=j: _grade(j) for j in _due("external")]
+
+    def verify():
+        """verify_user: ورود دانشجویان تصادفی (نتیجه بررسی رمز تکراری در حافظه کش می‌شود)"""
+        students = storage.all("students")
+        chosen = [students[rng.randrange(len(students))]["user_id"] for _ in range(ops)]
+
+        def _verify(user_id):
+            if verify_user(user_id, "password", "student") is None:
+                raise services.ServiceError("unauthorized", "ورود ناموفق")
+
+        return [lambda u=u: _verify(u) for u in chosen]
+
+    def search():
+        """helpers.search_theses: همه انواع جستجو به نوبت"""
+        queries = [(search_type, query) for search_type, options in SEARCH_QUERIES.items() for query in options]
+        return [lambda t=t, q=q: search_theses(q, t) for t, q in (queries[i % len(queries)] for i in range(ops))]
+
+    return {
+        "request_thesis_course": request_thesis_course,
+        "review_enrollment_requests": review_enrollment_requests,
+        "manage_defense_requests": manage_defense_requests,
+        "grade_defense_sessions": grade_defense_sessions,
+        "grade_theses_as_external": grade_theses_as_external,
+        "verify_user": verify,
+        "search_theses": search,
+    }
+
+
+def run_worker(students: int, ops: int, seed: int) -> Dict[str, Any]:
+    """اجرای یک اندازه در همین پردازه (THESIS_DATA_ROOT باید از قبل به پوشه خالی اشاره کند)"""
+    from src.storage import get_storage
+    from src.storage.generate import generate, write
+
+    started = time.perf_counter()
+    data = generate(students, seed)
+    records = sum(len(records) for records in data.values())
+    if not write(data):
+        raise RuntimeError("ساخت داده‌های ساختگی ناموفق بود")
+    del data
+    get_storage().recover()
+    result = {"records": records, "setup_seconds": round(time.perf_counter() - started, 2), "operations": {}}
+
+    rng = random.Random(seed)
+    for name, build in _workloads(ops, rng).items():
+        result["operations"][name] = measure(build())
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def run_size(students: int, ops: int, seed: int) -> Dict[str, Any]:
+    """اجرای یک اندازه در پردازه جدا با پوشه داده موقت"""
+    data_root = tempfile.mkdtemp(prefix=f"thesis-bench-{students}-")
+    try:
+        env = dict(os.environ, THESIS_DATA_ROOT=data_root)
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench", "--worker", "--sizes", str(students), "--ops", str(ops),
+             "--seed", str(seed)],
+            cwd=PROJECT_ROOT, env=env, stdout=subprocess.PIPE, text=True, check=True)
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(data_root, ignore_errors=True)
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    مقایسه میانه تأخیر هر عملیات با baseline.
+    بازگشت: خطوط گزارش regressionها (کندتر شدن بیش از threshold)
+    """
+    regressions = []
+    for size, current in results["results"].items():
+        previous = baseline.get("results", {}).get(size)
+        if not previous:
+            continue
+        for name, stats in current["operations"].items():
+            old = previous["operations"].get(name, {})
+            if not old.get("p50_ms") or not stats.get("p50_ms"):
+                continue
+            change = stats["p50_ms"] / old["p50_ms"] - 1
+            marker = "❌" if change > threshold else "✅"
+            line = (f"{marker} {size:>8} {name:<28} p50 {old['p50_ms']:>9.3f} -> {stats['p50_ms']:>9.3f} ms "
+                    f"({change:+.0%})")
+            print(line)
+            if change > threshold:
+                regressions.append(line)
+    return regressions
+
+
+def print_table(results: Dict[str, Any]) -> None:
+    for size, result in results["results"].items():
+        print(f"\n📊 {size} دانشجو ({result['records']} رکورد، ساخت داده {result['setup_seconds']}s، "
+              f"بیشترین RSS {result['peak_rss_mb']} MB)")
+        print(f"{'عملیات':<28} {'ops':>5} {'err':>4} {'ops/s':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+              f"{'read/op':>10} {'write/op':>10}")
+        for name, stats in result["operations"].items():
+            if not stats.get("ops"):
+                print(f"{name:<28} {0:>5}")
+                continue
+            print(f"{name:<28} {stats['ops']:>5} {stats['errors']:>4} {stats['ops_per_sec']:>9} "
+                  f"{stats['p50_ms']:>9} {stats['p90_ms']:>9} {stats['p99_ms']:>9} "
+                  f"{stats.get('bytes_read_per_op', '-'):>10} {stats.get('bytes_written_per_op', '-'):>10}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000", help="تعداد دانشجویان، با کاما جدا شده")
+    parser.add_argument("--ops", type=int, default=200, help="بیشترین تعداد اجرای هر عملیات")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="ذخیره نتیجه به عنوان baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="کندتر شدن مجاز میانه تأخیر (0.2 = 20%%)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    if args.worker:
+        print(json.dumps(run_worker(sizes[0], args.ops, args.seed), ensure_ascii=False))
+        return 0
+
+    from src.storage import STORAGE_ENV
+    from src.utils.passwords import KDF, COST
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "backend": os.environ.get(STORAGE_ENV, "json"),
+            "kdf": f"{KDF}:{COST}",
+            "ops": args.ops,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+    for students in sizes:
+        print(f"⏳ اجرای بنچمارک برای {students} دانشجو...", flush=True)
+        results["results"][str(students)] = run_size(students, args.ops, args.seed)
+    print_table(results)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ نتایج در {args.output} ذخیره شد.")
+
+    if args.save_baseline:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"✅ baseline در {args.baseline} ذخیره شد.")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("ℹ️  baseline وجود ندارد؛ برای ساخت آن از --save-baseline استفاده کنید.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("backend") != results["meta"]["backend"]:
+        print("⚠️  backend ذخیره‌سازی baseline با این اجرا متفاوت است.")
+    print("\n📈 مقایسه با baseline:")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} عملیات بیش از {args.threshold:.0%} کندتر شده است.")
+        return 1
+    print("\n✅ regression دیده نشد.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+مقایسه سرعت parse و serialize فایل defended_theses.json با کتابخانه‌های JSON موجود.
+اجرا از root پروژه:
+    python benchmarks/codec_benchmark.py [--records 100000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import codec  # noqa: E402
+
+WORDS = ["یادگیری", "ماشین", "شبکه", "عصبی", "داده", "robotic", "سامانه", "توزیع‌شده",
+         "بهینه‌سازی", "پردازش", "تصویر", "زبان", "طبیعی", "امنیت", "graph", "مدل"]
+
+
+def make_theses(count: int, seed: int = 1) -> list:
+    """ساخت رکوردهای مصنوعی هم‌شکل با defended_theses.json"""
+    rng = random.Random(seed)
+    theses = []
+    for i in range(count):
+        internal = round(rng.uniform(10, 20), 1)
+        external = round(rng.uniform(10, 20), 1)
+        theses.append({
+            "student_id": f"student_{i}",
+            "professor_id": f"prof_{i % 200}",
+            "title": " ".join(rng.choices(WORDS, k=4)),
+            "abstract": " ".join(rng.choices(WORDS, k=40)),
+            "keywords": rng.sample(WORDS, 3),
+            "status": "مختومه",
+            "submission_date": "2025-09-10",
+            "file_path": f"documents/theses/student_{i}.course_{i % 50}.pdf",
+            "image_path": [f"documents/images/student_{i}.course_{i % 50}.page1.jpg"],
+            "approved_date": "2025-09-12",
+            "defense_date": "2025-09-15",
+            "internal_judge_id": f"prof_{(i + 1) % 200}",
+            "external_judge_id": f"ex_{i % 30}",
+            "internal_grade": internal,
+            "internal_grade_date": "2025-09-15",
+            "external_grade": external,
+            "external_grade_date": "2025-09-15",
+            "final_grade": round((internal + external) / 2, 2),
+            "final_letter_grade": "ب",
+        })
+    return theses
+
+
+def best_of(repeat: int, function) -> float:
+    """کمترین زمان اجرا در repeat بار (ثانیه)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def codecs():
+    """(نام، تابع parse، تابع serialize خوانا، تابع serialize فشرده)"""
+    yield ("json", json.loads,
+           lambda data: json.dumps(data, ensure_ascii=False, indent=4),
+           lambda data: json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    if codec.ujson is not None:
+        yield ("ujson", codec.ujson.loads,
+               lambda data: codec.ujson.dumps(data, ensure_ascii=False, indent=4),
+               lambda data: codec.ujson.dumps(data, ensure_ascii=False))
+    if codec.orjson is not None:
+        yield ("orjson", codec.orjson.loads,
+               lambda data: codec.orjson.dumps(data, option=codec.orjson.OPT_INDENT_2).decode('utf-8'),
+               lambda data: codec.orjson.dumps(data).decode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = make_theses(args.records)
+    texts = {
+        "pretty": json.dumps(data, ensure_ascii=False, indent=4),
+        "compact": json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+    }
+    for name, text in texts.items():
+        print(f"📄 {name}: {len(text.encode('utf-8')) / 1_000_000:.1f} MB")
+    print(f"🔧 کتابخانه فعال codec: {codec.BACKEND}\n")
+
+    print(f"{'کتابخانه':<8} {'قالب':<8} {'parse (rec/s)':>15} {'serialize (rec/s)':>19}")
+    for name, loads, dumps_pretty, dumps_compact in codecs():
+        for layout, dumps in (("pretty", dumps_pretty), ("compact", dumps_compact)):
+            # مثل file_io، متن به صورت bytes به parser داده می‌شود
+            raw = texts[layout].encode('utf-8')
+            parse = best_of(args.repeat, lambda: loads(raw))
+            serialize = best_of(args.repeat, lambda: dumps(data))
+            print(f"{name:<8} {layout:<8} {args.records / parse:>15,.0f} {args.records / serialize:>19,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+مقایسه فیلتر «جلسات دفاع گذشته یک داور» با حلقه و strptime در برابر نمای ستونی.
+اجرا از root پروژه:
+    python benchmarks/columnar_benchmark.py [--records 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import RequestStatus  # noqa: E402
+from src.utils import columnar  # noqa: E402
+from src.utils.columnar import DefenseSnapshot  # noqa: E402
+
+
+def make_requests(count: int, seed: int = 1) -> list:
+    """درخواست‌های دفاع مصنوعی با داوران و تاریخ‌های تصادفی"""
+    rng = random.Random(seed)
+    statuses = list(RequestStatus)
+    requests = []
+    for i in range(count):
+        request = {"student_id": f"student_{i}", "professor_id": f"prof_{i % 200}",
+                   "title": f"thesis {i}", "status": rng.choice(statuses).value,
+                   "submission_date": "2025-01-01"}
+        if request["status"] != RequestStatus.PENDING:
+            request.update(internal_judge_id=f"prof_{rng.randrange(200)}",
+                           external_judge_id=f"ex_{rng.randrange(30)}",
+                           defense_date=f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+        requests.append(request)
+    return requests
+
+
+def loop_filter(requests: list, judge_id: str, today: date) -> list:
+    """روش قبلی: حلقه روی دیکشنری‌ها با parse تاریخ هر ردیف"""
+    found = []
+    for r in requests:
+        if judge_id in (r.get("internal_judge_id"), r.get("external_judge_id")) \
+                and r.get("status") == RequestStatus.APPROVED and "defense_date" in r:
+            if datetime.strptime(r["defense_date"], "%Y-%m-%d").date() <= today:
+                found.append(r)
+    return found
+
+
+def best_of(repeat: int, function) -> float:
+    """کمترین زمان اجرا در repeat بار (ثانیه)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    requests = make_requests(args.records)
+    today = date(2025, 7, 1)
+    conditions = dict(judge_id="prof_7", status=RequestStatus.APPROVED, due_by=today)
+
+    snapshot = DefenseSnapshot()
+    build = best_of(1, lambda: snapshot.apply(requests, None))
+    assert snapshot.select(**conditions) == loop_filter(requests, "prof_7", today)
+
+    # به‌روزرسانی افزایشی: تغییر یک ردیف
+    requests[10]["status"] = RequestStatus.APPROVED
+    update = best_of(1, lambda: snapshot.apply(requests, [10]))
+
+    print(f"📄 {args.records:,} درخواست دفاع ({'NumPy' if columnar.np is not None else 'array'})")
+    print(f"⏱️  ساخت کامل: {build * 1000:.0f} ms   به‌روزرسانی یک ردیف: {update * 1000:.3f} ms")
+    print(f"⏱️  حلقه + strptime: {best_of(args.repeat, lambda: loop_filter(requests, 'prof_7', today)) * 1000:.1f} ms")
+    print(f"⏱️  نمای ستونی: {best_of(args.repeat, lambda: snapshot.find(**conditions)) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+مقایسه حافظه و سرعت فیلتر رکوردهای دیکشنری با مدل‌های slots (src.models).
+اجرا از root پروژه:
+    python benchmarks/models_benchmark.py [--records 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.codec_benchmark import make_theses  # noqa: E402
+from src.utils import codec  # noqa: E402
+from src.models import DefenseRequest, RequestStatus, hydrate  # noqa: E402
+
+
+def best_of(repeat: int, function) -> float:
+    """کمترین زمان اجرا در repeat بار (ثانیه)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = codec.dumps(make_theses(args.records), compact=True).encode('utf-8')
+    records = codec.loads(raw)
+    hydrate_time = best_of(1, lambda: hydrate(DefenseRequest, records))
+    models = hydrate(DefenseRequest, records)
+
+    # اندازه خود ظرف رکورد (مقادیر فیلدها در هر دو حالت مشترک‌اند)
+    dict_bytes = sum(map(sys.getsizeof, records)) / len(records)
+    model_bytes = sum(map(sys.getsizeof, models)) / len(models)
+
+    def filter_dicts():
+        return [r for r in records if r["professor_id"] == "prof_7" and r["status"] == "مختومه"]
+
+    def filter_models():
+        return [m for m in models if m.professor_id == "prof_7" and m.status is RequestStatus.CLOSED]
+
+    print(f"📄 {args.records:,} رکورد")
+    print(f"🧠 هر رکورد: دیکشنری {dict_bytes:.0f} بایت   مدل slots {model_bytes:.0f} بایت")
+    print(f"⏱️  hydrate یک‌جا: {hydrate_time:.3f} s")
+    print(f"⏱️  فیلتر دیکشنری: {best_of(args.repeat, filter_dicts) * 1000:.1f} ms   "
+          f"فیلتر مدل: {best_of(args.repeat, filter_models) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
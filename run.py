@@ -3,10 +3,30 @@
 
 import sys
 import os
+import argparse
 
 sys.path.insert(0, os.path.dirname(__file__))
 
 from src.main import main
+from src.utils import io_stats, profiling
+
+
+def parse_args():
+    """گزینه‌های اختیاری اجرای منوها (همان تنظیمات متغیرهای محیطی THESIS_PROFILE* و THESIS_IO_STATS)"""
+    parser = argparse.ArgumentParser(description="سامانه مدیریت پایان‌نامه‌ها")
+    parser.add_argument("--profile", metavar="DIR", help="پروفایل اقدام‌های منو و ذخیره فایل‌های .pstats در DIR")
+    parser.add_argument("--profile-rate", type=float, default=1.0, metavar="RATE",
+                        help="نسبت اقدام‌هایی که پروفایل می‌شوند (بین 0 و 1، پیش‌فرض 1)")
+    parser.add_argument("--profile-memory", action="store_true", help="ثبت بیشترین تخصیص‌های حافظه با tracemalloc")
+    parser.add_argument("--io-stats", nargs="?", const="stderr", metavar="FILE",
+                        help="گزارش شمارنده‌های ورودی/خروجی هر اقدام منو در stderr یا افزودن آن به فایل JSON Lines")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.profile:
+        profiling.configure(args.profile, args.profile_rate, args.profile_memory)
+    if args.io_stats:
+        io_stats.configure(args.io_stats)
     main()
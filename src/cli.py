@@ -0,0 +1,231 @@
+"""
+خط فرمان غیرتعاملی سامانه (بدون input)، برای اسکریپت‌نویسی و پردازش دسته‌ای:
+
+    python -m src enroll   --student student_3 --course course_1
+    python -m src approve  --professor prof_1 --student student_3 [--reject]
+    python -m src schedule --professor prof_1 --student student_4 --date 2025-06-01 --internal prof_2 --external ex_1
+    python -m src grade    --judge prof_2 --student student_4 --grade 18
+    python -m src search   --type fulltext --query "شبکه عصبی"
+    python -m src export   --format csv --output theses.csv
+    python -m src serve    --host 127.0.0.1 --port 8080
+
+هر عملیات با --input FILE روی همه ردیف‌های یک فایل JSON (لیست)، JSON Lines یا CSV اجرا می‌شود؛
+نام ستون‌ها همان نام گزینه‌هاست (student، course، professor، reject و ...).
+نتیجه هر ردیف یک خط JSON در خروجی است و خلاصه اجرا (تعداد، زمان، ops/sec) در stderr چاپ می‌شود.
+زیرفرمان serve سرور HTTP (src/server.py) را اجرا می‌کند و بدون زیرفرمان، منوی تعاملی اجرا می‌شود.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+from src import services
+from src.models import Thesis
+from src.services import ServiceError
+from src.storage import get_storage
+from src.utils import codec
+
+# مقدارهایی از ستون‌های بولی (مثل reject) در فایل ورودی که درست حساب می‌شوند
+TRUE_VALUES = ("1", "true", "yes", "y", "on")
+
+
+def _flag(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_VALUES
+    return bool(value)
+
+
+def read_batch(path: str) -> Iterator[Dict[str, Any]]:
+    """ردیف‌های فایل ورودی بر اساس پسوند: .csv، .jsonl یا JSON (لیست اشیا)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+    elif extension == ".jsonl":
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield codec.loads(line)
+    else:
+        with open(path, "rb") as f:
+            data = codec.loads(f.read())
+        if not isinstance(data, list):
+            raise ValueError("فایل JSON ورودی باید لیستی از اشیا باشد")
+        yield from data
+
+
+def _require(row: Dict[str, Any], *names: str) -> List[Any]:
+    missing = [name for name in names if row.get(name) in (None, "")]
+    if missing:
+        raise ServiceError("missing_field", f"فیلدهای لازم وارد نشده‌اند: {', '.join(missing)}")
+    return [row[name] for name in names]
+
+
+def _enroll(row: Dict[str, Any]) -> Dict[str, Any]:
+    student_id, course_id = _require(row, "student", "course")
+    request, remaining = services.enroll(student_id, course_id)
+    return {"request": request.to_dict(), "remaining_capacity": remaining}
+
+
+def _approve(row: Dict[str, Any]) -> Dict[str, Any]:
+    professor_id, student_id = _require(row, "professor", "student")
+    request, course = services.review_enrollment(professor_id, student_id, not _flag(row.get("reject")),
+                                                 row.get("course") or None)
+    return {"request": request.to_dict(), "course": course.to_dict() if course else None}
+
+
+def _schedule(row: Dict[str, Any]) -> Dict[str, Any]:
+    professor_id, student_id = _require(row, "professor", "student")
+    request = services.pending_defense(professor_id, student_id)
+    if _flag(row.get("reject")):
+        return {"request": services.reject_defense(request).to_dict()}
+    defense_date, internal_judge_id, external_judge_id = _require(row, "date", "internal", "external")
+    return {"request": services.schedule_defense(request, defense_date, internal_judge_id,
+                                                 external_judge_id).to_dict()}
+
+
+def _grade(row: Dict[str, Any]) -> Dict[str, Any]:
+    judge_id, student_id, grade = _require(row, "judge", "student", "grade")
+    try:
+        grade = float(grade)
+    except (TypeError, ValueError):
+        raise ServiceError("invalid_grade", "نمره باید عدد باشد!")
+    defense = services.defense_to_grade(judge_id, student_id)
+    result = services.grade_defense(defense, judge_id, grade, regrade=_flag(row.get("regrade")))
+    return {"request": result.defense.to_dict(), "closed": result.closed, "judge_capacity": result.judge_capacity,
+            "course": result.course.to_dict() if result.course else None}
+
+
+def _search(row: Dict[str, Any]) -> Dict[str, Any]:
+    (query,) = _require(row, "query")
+    theses = services.search_archive(query, row.get("type") or "fulltext")
+    try:
+        limit = int(row.get("limit") or 0)
+    except (TypeError, ValueError):
+        raise ServiceError("invalid_limit", "limit باید عدد باشد!")
+    return {"count": len(theses), "theses": [t.to_dict() for t in (theses[:limit] if limit else theses)]}
+
+
+# زیرفرمان -> (تابع اجرای یک ردیف، گزینه‌های خط فرمان)
+COMMANDS: Dict[str, tuple] = {
+    "enroll": (_enroll, ("student", "course")),
+    "approve": (_approve, ("professor", "student", "course", "reject")),
+    "schedule": (_schedule, ("professor", "student", "date", "internal", "external", "reject")),
+    "grade": (_grade, ("judge", "student", "grade", "regrade")),
+    "search": (_search, ("type", "query", "limit")),
+}
+
+FLAGS = ("reject", "regrade")
+
+
+def run_batch(command: str, rows: Iterator[Dict[str, Any]], write: Callable[[str], Any]) -> Dict[str, Any]:
+    """
+    اجرای یک زیرفرمان روی همه ردیف‌ها؛ هر نتیجه یک خط JSON است.
+    خطای یک ردیف بقیه را متوقف نمی‌کند. بازگشت: خلاصه اجرا
+    """
+    handler = COMMANDS[command][0]
+    summary = {"command": command, "ops": 0, "ok": 0, "failed": 0}
+    started = time.perf_counter()
+    for row in rows:
+        summary["ops"] += 1
+        try:
+            output = {"op": command, "ok": True, **handler(row)}
+            summary["ok"] += 1
+        except ServiceError as e:
+            output = {"op": command, "ok": False, "code": e.code, "error": e.message, "input": row}
+            summary["failed"] += 1
+        except Exception as e:
+            # خطای پیش‌بینی نشده هم فقط همین ردیف را ناموفق می‌کند
+            output = {"op": command, "ok": False, "code": "internal_error", "error": f"{type(e).__name__}: {e}",
+                      "input": row}
+            summary["failed"] += 1
+        write(codec.dumps(output, compact=True) + "\n")
+    summary["seconds"] = round(time.perf_counter() - started, 6)
+    summary["ops_per_sec"] = round(summary["ops"] / summary["seconds"], 1) if summary["seconds"] else None
+    return summary
+
+
+def export(output_format: str, out: TextIO) -> int:
+    """نوشتن آرشیو پایان‌نامه‌ها به صورت JSON Lines یا CSV؛ بازگشت: تعداد رکوردها"""
+    count = 0
+    if output_format == "csv":
+        columns = list(Thesis.field_names())
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        for record in services.export_archive():
+            writer.writerow([value if isinstance(value, (str, int, float)) or value is None
+                             else codec.dumps(value, compact=True)
+                             for value in (record.get(column) for column in columns)])
+            count += 1
+    else:
+        for record in services.export_archive():
+            out.write(codec.dumps(record, compact=True) + "\n")
+            count += 1
+    return count
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command")
+    for command, (_, options) in COMMANDS.items():
+        subparser = subparsers.add_parser(command)
+        for option in options:
+            if option in FLAGS:
+                subparser.add_argument(f"--{option}", action="store_true")
+            else:
+                subparser.add_argument(f"--{option}")
+        subparser.add_argument("--input", help="فایل ردیف‌ها (JSON، JSON Lines یا CSV)")
+        subparser.add_argument("--output", help="فایل خروجی JSON Lines (پیش‌فرض stdout)")
+
+    export_parser = subparsers.add_parser("export")
+    export_parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    export_parser.add_argument("--output", help="فایل خروجی (پیش‌فرض stdout)")
+
+    serve_parser = subparsers.add_parser("serve")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """اجرای خط فرمان؛ بازگشت: کد خروج (0 موفق، 1 خطای بعضی ردیف‌ها، 2 ورودی نامعتبر)"""
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        from src.main import main as interactive_main
+        interactive_main()
+        return 0
+    if args.command == "serve":
+        import asyncio
+        from src.server import serve
+        try:
+            asyncio.run(serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    # کامل کردن تراکنش‌هایی که در اجرای قبلی نیمه‌کاره مانده‌اند
+    get_storage().recover()
+
+    output = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.command == "export":
+            count = export(args.format, output)
+            print(codec.dumps({"command": "export", "records": count}, compact=True), file=sys.stderr)
+            return 0
+
+        options = COMMANDS[args.command][1]
+        try:
+            rows = list(read_batch(args.input)) if args.input else [
+                {option: getattr(args, option) for option in options}]
+        except (OSError, ValueError) as e:
+            print(f"❌ خطا در خواندن فایل ورودی: {e}", file=sys.stderr)
+            return 2
+
+        summary = run_batch(args.command, iter(rows), output.write)
+        print(codec.dumps(summary, compact=True), file=sys.stderr)
+        return 0 if summary["failed"] == 0 else 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
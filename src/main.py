@@ -1,4 +1,5 @@
 from src.menus.main_menu import show_main_menu
+from src.storage import get_storage
 
 
 def main():
@@ -7,6 +8,11 @@ def main():
     print("       سامانه مدیریت پایان‌نامه‌ها - خوش آمدید")
     print("=" * 60)
 
+    # کامل کردن تراکنش‌هایی که در اجرای قبلی نیمه‌کاره مانده‌اند
+    recovered = get_storage().recover()
+    if recovered:
+        print(f"⚠️  {recovered} تراکنش نیمه‌کاره از اجرای قبلی بازیابی شد.")
+
     while True:
         show_main_menu()
 
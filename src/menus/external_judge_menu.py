@@ -1,10 +1,10 @@
-from datetime import datetime, date
-from src.utils.file_io import read_json, write_json
-from src.utils.helpers import display_menu
-
-
-DEFENSE_REQUESTS_FILE = "data/requests/defense_requests.json"
-DEFENDED_THESES_FILE = "data/theses/defended_theses.json"
+from datetime import date
+from src import services
+from src.services import ServiceError
+from src.utils.helpers import display_menu, menu_action
+from src.storage import get_storage
+from src.models import DefenseRequest
+from src.utils.work_queues import get_queue, EXTERNAL_GRADES_OWED
 
 
 def external_judge_menu(user):
@@ -22,9 +22,9 @@ def external_judge_menu(user):
         choice = input("لطفاً گزینه مورد نظر را انتخاب کنید: ").strip()
 
         if choice == "1":
-            grade_theses_as_external(user)
+            menu_action("external_judge", grade_theses_as_external, user)
         elif choice == "2":
-            change_password(user)
+            menu_action("external_judge", change_password, user)
         elif choice == "3":
             print("خروج از حساب کاربری...")
             break
@@ -38,26 +38,19 @@ def grade_theses_as_external(user):
     print("\n📊 نمره‌دهی جلسات دفاع شده")
     print("=" * 50)
 
-    defense_requests = read_json(DEFENSE_REQUESTS_FILE)
     today = date.today()
 
     # پایان‌نامه‌هایی که این کاربر داور خارجی آن‌هاست و هنوز نمره نداده
-    theses_for_judge = [
-        th for th in defense_requests
-        if th.get("external_judge_id") == user.user_id and "external_grade" not in th
-    ]
+    theses_for_judge = get_queue(EXTERNAL_GRADES_OWED, user.user_id)
 
     if not theses_for_judge:
         print("📂 پایان‌نامه‌ای برای نمره‌دهی یافت نشد.")
         input("برای ادامه Enter بزنید...")
         return
 
-    students = read_json("data/users/students.json")
-    students_dict = {s["user_id"]: s for s in students} if students else {}
-
     print("\n📚 لیست پایان‌نامه‌های در انتظار نمره‌دهی (داور خارجی):")
     for idx, thesis in enumerate(theses_for_judge, start=1):
-        student_info = students_dict.get(thesis["student_id"], {})
+        student_info = get_storage().find_one("students", "user_id", thesis["student_id"]) or {}
         student_name = student_info.get("name", "نامشخص")
 
         print(f"\n{idx}. 👨‍🎓 دانشجو: {student_name}")
@@ -91,65 +84,25 @@ def grade_theses_as_external(user):
         input("برای ادامه Enter بزنید...")
         return
 
-    # ثبت نمره و تاریخ آن
-    for th in defense_requests:
-        if th["student_id"] == thesis["student_id"] and th["title"] == thesis["title"]:
-            th["external_grade"] = grade
-            th["external_grade_date"] = today.strftime("%Y-%m-%d")
-            print("✅ نمره داور خارجی ثبت شد.")
-
-            # اگر internal_grade_date هم موجود بود، نمره نهایی محاسبه شود
-            if "internal_grade" in th and "internal_grade_date" in th:
-                internal_grade = th["internal_grade"]
-                external_grade = th["external_grade"]
-                final_grade = (internal_grade + external_grade) / 2
-
-                # محاسبه نمره حروفی
-                if final_grade >= 17:
-                    final_letter = "الف"
-                elif final_grade >= 14:
-                    final_letter = "ب"
-                elif final_grade >= 10:
-                    final_letter = "ج"
-                else:
-                    final_letter = "د"
-
-                th["final_grade"] = final_grade
-                th["final_letter_grade"] = final_letter
-                th["status"] = "مختومه"
-
-                # افزایش ظرفیت درس برای استاد راهنما
-                courses = read_json("data/courses/thesis_courses.json")
-                for course in courses:
-                    if course["professor_id"] == th["professor_id"]:
-                        course["capacity"] = course.get("capacity", 0) + 1
-                        print(f"✅ ظرفیت درس '{course['title']}' به {course['capacity']} افزایش یافت.")
-                        break
-                write_json("data/courses/thesis_courses.json", courses)
-
-                print(f"🎯 نمره نهایی: {final_grade:.2f} ({final_letter})")
-
-                # انتقال به defended_theses.json
-                defended = read_json(DEFENDED_THESES_FILE)
-                defended.append(th.copy())
-                write_json(DEFENDED_THESES_FILE, defended)
-
-                print("📂 پایان‌نامه به لیست نهایی اضافه شد.")
+    # نمره، ظرفیت‌ها و آرشیو در یک تراکنش ثبت می‌شوند
+    try:
+        result = services.grade_defense(DefenseRequest.from_dict(thesis), user.user_id, grade, today=today)
+    except ServiceError:
+        print("❌ خطا در ثبت نمره! (ممکن است قبلاً نمره داده شده باشد)")
+        input("برای ادامه Enter بزنید...")
+        return
 
-            break
+    print("✅ نمره داور خارجی ثبت شد.")
 
-    # ذخیره تغییرات
-    write_json(DEFENSE_REQUESTS_FILE, defense_requests)
+    if result.closed:
+        if result.course:
+            print(f"✅ ظرفیت درس '{result.course.title}' به {result.course.capacity} افزایش یافت.")
 
-    # افزایش ظرفیت داور خارجی پس از نمره‌دهی
-    external_judges = read_json("data/users/external_judges.json")
-    for judge in external_judges:
-        if judge["user_id"] == user.user_id:
-            judge["judge_capacity"] = judge.get("judge_capacity", 0) + 1
-            print(f"✅ ظرفیت داوری شما به {judge['judge_capacity']} افزایش یافت.")
-            break
+        print(f"🎯 نمره نهایی: {result.defense.final_grade:.2f} ({result.defense.final_letter_grade})")
+        print("📂 پایان‌نامه به لیست نهایی اضافه شد.")
 
-    write_json("data/users/external_judges.json", external_judges)
+    if result.judge_capacity is not None:
+        print(f"✅ ظرفیت داوری شما به {result.judge_capacity} افزایش یافت.")
 
     input("برای ادامه Enter بزنید...")
 
@@ -42,10 +42,11 @@ def show_login_menu(role: str):
     user_id = input("کد کاربری: ").strip()
     password = input("رمز عبور: ").strip()
 
-    # بررسی اعتبار کاربر
-    from src.utils.auth import verify_user
-    user = verify_user(user_id, password, role)
-    # کاربر را تبدیل به شی از کلاس دانشجو یا استاد میکند و داخل user میگذارد.
+    # بررسی اعتبار کاربر و ساخت session
+    from src.utils.sessions import authenticate, get_session_user, end_session
+    token = authenticate(user_id, password, role)
+    # شیء کاربر (دانشجو، استاد یا داور) از کش session؛ ورود دوباره همین کاربر فایل کاربران را نمی‌خواند
+    user = get_session_user(token) if token else None
 
     if user:
         print(f"\n✅ ورود موفق! خوش آمدید {user.name}")
@@ -58,6 +59,7 @@ def show_login_menu(role: str):
             show_professor_menu(user)
         else:
             external_judge_menu(user)
+        end_session(token)
     else:
         print("\n❌ کد کاربری یا رمز عبور اشتباه است!")
         input("برای بازگشت Enter بزنید...")
\ No newline at end of file
@@ -1,52 +1,37 @@
 import sys
 import os
 import subprocess
-from src.utils.file_io import read_json, write_json, get_full_path
-from src.utils.helpers import display_menu
-from datetime import datetime, date
+from src import services
+from src.services import ServiceError
+from src.utils.file_io import get_full_path
+from src.utils.helpers import display_menu, parse_selection, menu_action
+from src.storage import get_storage
+from src.models import EnrollmentRequest, DefenseRequest, hydrate
+from src.menus.search_menu import search_theses
+from src.utils.work_queues import (get_queue, queue_count, due_defenses, grades_owed, PENDING_ENROLLMENTS,
+                                   PENDING_DEFENSES)
+from datetime import date
 
 
 def get_available_internal_judges(exclude_professor_id=None):
     """دریافت لیست اساتید با ظرفیت داوری بجز استاد راهنما"""
-    professors = read_json("data/users/professors.json")
+    professors = get_storage().models("professors")
 
     available_judges = [
         p for p in professors
-        if p.get("judge_capacity", 0) > 0
-           and p["user_id"] != exclude_professor_id
+        if p.has_judgment_capacity()
+           and p.user_id != exclude_professor_id
     ]
     return available_judges
 
 
 def get_available_external_judges():
     """دریافت لیست داوران خارجی با ظرفیت موجود"""
-    external_judges = read_json("data/users/external_judges.json")
-    available_judges = [j for j in external_judges if j.get("judge_capacity", 0) > 0]
+    external_judges = get_storage().models("external_judges")
+    available_judges = [j for j in external_judges if j.has_judgment_capacity()]
     return available_judges
 
 
-def decrease_judge_capacity(judge_id, is_external=False):
-    """کاهش ظرفیت داوری یک استاد یا داور خارجی"""
-    try:
-        if is_external:
-            file_path = "data/users/external_judges.json"
-            judges = read_json(file_path)
-        else:
-            file_path = "data/users/professors.json"
-            judges = read_json(file_path)
-
-        for judge in judges:
-            if judge["user_id"] == judge_id and judge.get("judge_capacity", 0) > 0:
-                judge["judge_capacity"] -= 1
-                break
-
-        write_json(file_path, judges)
-        return True
-    except Exception as e:
-        print(f"خطا در کاهش ظرفیت داور: {e}")
-        return False
-
-
 def open_file(file_path):
     """باز کردن فایل با برنامه پیشفرض سیستم"""
     try:
@@ -65,7 +50,11 @@ def open_file(file_path):
 def show_professor_menu(professor):
     """نمایش منوی اصلی استاد"""
     while True:
-        menu_title = f"منوی استاد - {professor.name}"
+        # شمارش از صف‌های کاری همین استاد (بدون پیمایش همه درخواست‌ها)
+        badge = (f"📥 {queue_count(PENDING_ENROLLMENTS, professor.user_id)} اخذ | "
+                 f"🗓️ {queue_count(PENDING_DEFENSES, professor.user_id)} دفاع | "
+                 f"📊 {grades_owed(professor.user_id)} نمره")
+        menu_title = f"منوی استاد - {professor.name}  ({badge})"
         options = [
             "مشاهده و بررسی درخواست‌های اخذ پایان‌نامه",
             "مدیریت درخواست‌های دفاع",
@@ -80,15 +69,15 @@ def show_professor_menu(professor):
         choice = input("لطفاً گزینه مورد نظر را انتخاب کنید: ").strip()
 
         if choice == "1":
-            review_enrollment_requests(professor)
+            menu_action("professor", review_enrollment_requests, professor)
         elif choice == "2":
-            manage_defense_requests(professor)
+            menu_action("professor", manage_defense_requests, professor)
         elif choice == "3":
-            grade_defense_sessions(professor)
+            menu_action("professor", grade_defense_sessions, professor)
         elif choice == "4":
-            search_theses()
+            menu_action("professor", search_theses)
         elif choice == "5":
-            change_password(professor)
+            menu_action("professor", change_password, professor)
         elif choice == "6":
             print("خروج از حساب کاربری...")
             break
@@ -99,31 +88,23 @@ def show_professor_menu(professor):
 
 def review_enrollment_requests(professor):
     """بررسی درخواست‌های اخذ پایان‌نامه"""
+    storage = get_storage()
     print("\n📋 درخواست‌های اخذ پایان‌نامه")
     print("-" * 40)
 
-    requests = read_json("data/requests/enrollment_requests.json")
-    professor_requests = [r for r in requests if
-                          r["professor_id"] == professor.user_id and r["status"] == "در انتظار تأیید استاد"]
+    professor_requests = get_queue(PENDING_ENROLLMENTS, professor.user_id)
 
     if not professor_requests:
         print("❌ هیچ درخواست pending ندارید.")
         input("برای بازگشت Enter بزنید...")
         return
 
-    # خواندن اطلاعات دانشجویان
-    students = read_json("data/users/students.json")
-    students_dict = {s["user_id"]: s for s in students} if students else {}
-
-    # خواندن اطلاعات دروس
-    courses = read_json("data/courses/thesis_courses.json")
-    courses_dict = {c["course_id"]: c for c in courses} if courses else {}
 
     print(f"\n📝 لیست درخواست‌های اخذ درس پایان نامه برای شما:")
     print("=" * 60)
 
     for i, req in enumerate(professor_requests, 1):
-        student_info = students_dict.get(req["student_id"], {})
+        student_info = storage.find_one("students", "user_id", req["student_id"]) or {}
         student_name = student_info.get("name", "نامشخص")
         student_id = req["student_id"]
         course_id = req["course_id"]
@@ -135,89 +116,122 @@ def review_enrollment_requests(professor):
         print("-" * 40)
 
     try:
-        choice = int(input("\nشماره درخواست برای بررسی: ")) - 1
-        selected_request = professor_requests[choice]
+        choice = input("\nشماره درخواست برای بررسی (g: بررسی گروهی): ").strip().lower()
+        if choice == "g":
+            batch_review_enrollment_requests(professor_requests)
+            return
+        selected_request = professor_requests[int(choice) - 1]
 
         # نمایش اطلاعات کامل درخواست
-        student_info = students_dict.get(selected_request["student_id"], {})
+        student_info = storage.find_one("students", "user_id", selected_request["student_id"]) or {}
         student_name = student_info.get("name", "نامشخص")
-        course_info = courses_dict.get(selected_request["course_id"], {})
+        course_info = storage.find_one("courses", "course_id", selected_request["course_id"]) or {}
         course_title = course_info.get("title", "نامشخص")
 
         print(f"\n 🔍 درخواست دانشجو {selected_request['student_id']} برای درس پایان نامه")
         action = input("تایید (y) یا رد (n)? [y/n]: ").strip().lower()
 
-        if action == 'y':
-            selected_request["status"] = "تایید شده"
-            selected_request["approved_date"] = date.today().strftime("%Y-%m-%d")  # تاریخ واقعی تایید
-            print("✅ درخواست تایید شد.")
+        if action not in ('y', 'n'):
+            print("⚠️  عمل نامعتبر!")
+            return
 
-        elif action == 'n':
-            selected_request["status"] = "رد شده"
-            selected_request["rejected_date"] = date.today().strftime("%Y-%m-%d")  # تاریخ رد
+        # تغییر وضعیت و در صورت رد، برگرداندن ظرفیت درس در یک تراکنش
+        report = services.review_enrollments([(EnrollmentRequest.from_dict(selected_request), action == 'y')])
+        if report.skipped:
+            print("❌ خطا در ذخیره تغییرات درخواست! (ممکن است درخواست قبلاً بررسی شده باشد)")
+        elif action == 'y':
+            print("✅ درخواست تایید شد.")
+        else:
             print("❌ درخواست رد شد.")
 
-            for course in courses:
-                if course["course_id"] == selected_request["course_id"]:
-                    course["capacity"] += 1
-                    print(f"✅ ظرفیت درس '{course_title}' به {course['capacity']} افزایش یافت.")
-                    break
+            # فقط اگر درخواست رد شده باشد ظرفیت درس برمی‌گردد
+            course = report.courses.get(selected_request["course_id"])
+            if course:
+                print(f"✅ ظرفیت درس '{course_title}' به {course.capacity} افزایش یافت.")
+                print("✅ تغییرات ظرفیت درس نیز ذخیره شد.")
 
-        else:
-            print("⚠️  عمل نامعتبر!")
-            return
+    except (ValueError, IndexError):
+        print("❌ انتخاب نامعتبر!")
 
-        # آپدیت فایل درخواست‌ها
-        for i, req in enumerate(requests):
-            if req["student_id"] == selected_request["student_id"]:
-                if req["status"] == "در انتظار تأیید استاد":
-                    requests[i] = selected_request
-                break
+    input("برای بازگشت Enter بزنید...")
 
-        if write_json("data/requests/enrollment_requests.json", requests):
-            if action == 'n':  # فقط اگر درخواست رد شده باشد
-                if write_json("data/courses/thesis_courses.json", courses):
-                    print("✅ تغییرات ظرفیت درس نیز ذخیره شد.")
-                else:
-                    print("❌ خطا در ذخیره تغییرات ظرفیت درس!")
-        else:
-            print("❌ خطا در ذخیره تغییرات درخواست!")
 
-    except (ValueError, IndexError):
+def batch_review_enrollment_requests(professor_requests):
+    """بررسی گروهی درخواست‌های اخذ: همه تصمیم‌ها در یک تراکنش و با یک بار نوشتن هر فایل"""
+    print("\n📋 بررسی گروهی درخواست‌ها")
+    print("1. تایید درخواست‌های انتخابی")
+    print("2. رد درخواست‌های انتخابی")
+    print("3. تایید N درخواست اول به ترتیب زمان ثبت")
+    mode = input("لطفاً گزینه مورد نظر را انتخاب کنید: ").strip()
+
+    decisions = {}  # اندیس درخواست -> True برای تایید، False برای رد
+    if mode in ("1", "2"):
+        selected = parse_selection(input("شماره درخواست‌ها (مثلاً 1,3,5-8): "), len(professor_requests))
+        decisions = {index: mode == "1" for index in selected}
+    elif mode == "3":
+        by_date = sorted(range(len(professor_requests)),
+                         key=lambda index: professor_requests[index].get("created_at") or "")
+        try:
+            count = int(input("تعداد درخواست‌هایی که تایید شوند: "))
+        except ValueError:
+            count = 0
+        if count > 0:
+            decisions = {index: True for index in by_date[:count]}
+            if by_date[count:] and input("❓ بقیه درخواست‌ها رد شوند؟ (y/n): ").strip().lower() == 'y':
+                decisions.update({index: False for index in by_date[count:]})
+
+    if not decisions:
         print("❌ انتخاب نامعتبر!")
+        input("برای بازگشت Enter بزنید...")
+        return
+
+    approved_count = sum(decisions.values())
+    print(f"\n📋 {approved_count} درخواست تایید و {len(decisions) - approved_count} درخواست رد می‌شود.")
+    if input("❓ آیا از اعمال این تصمیم‌ها اطمینان دارید؟ (y/n): ").strip().lower() != 'y':
+        print("❌ عملیات لغو شد.")
+        input("برای بازگشت Enter بزنید...")
+        return
+
+    requests = hydrate(EnrollmentRequest, professor_requests)
+    report = services.review_enrollments((requests[index], approve) for index, approve in sorted(decisions.items()))
+    if not report.approved and not report.rejected:
+        print("❌ هیچ تغییری ذخیره نشد! (ممکن است درخواست‌ها قبلاً بررسی شده باشند)")
+        input("برای بازگشت Enter بزنید...")
+        return
+
+    print("\n📊 گزارش بررسی گروهی:")
+    for key, icon, label in (("approved", "✅", "تایید شد"), ("rejected", "❌", "رد شد"),
+                             ("skipped", "⏭️", "قبلاً بررسی شده بود")):
+        for request in getattr(report, key):
+            student_info = get_storage().find_one("students", "user_id", request.student_id) or {}
+            print(f"   {icon} {student_info.get('name', 'نامشخص')} ({request.student_id}): {label}")
+    print(f"\n   ✅ تایید شده: {len(report.approved)}   ❌ رد شده: {len(report.rejected)}   "
+          f"⏭️ بدون تغییر: {len(report.skipped)}")
+    for course in report.courses.values():
+        print(f"   ✅ ظرفیت درس '{course.title or 'نامشخص'}' به {course.capacity} افزایش یافت.")
 
     input("برای بازگشت Enter بزنید...")
 
 
 def manage_defense_requests(professor):
     """مدیریت درخواست‌های دفاع ارسالی برای استاد"""
+    storage = get_storage()
     print("\n📝 مدیریت درخواست‌های دفاع")
     print("=" * 50)
 
-    # خواندن درخواست‌های دفاع
-    defense_requests = read_json("data/requests/defense_requests.json")
-
-    # فیلتر کردن درخواست‌های مربوط به این استاد و با وضعیت "در انتظار تأیید استاد"
-    professor_defense_requests = [
-        r for r in defense_requests
-        if r["professor_id"] == professor.user_id
-           and r["status"] == "در انتظار تأیید استاد"
-    ]
+    # صف کاری درخواست‌های دفاع این استاد با وضعیت "در انتظار تأیید استاد"
+    professor_defense_requests = get_queue(PENDING_DEFENSES, professor.user_id)
 
     if not professor_defense_requests:
         print("✅ هیچ درخواست دفاع pending ندارید.")
         input("\nبرای بازگشت Enter بزنید...")
         return
 
-    # خواندن اطلاعات دانشجویان
-    students = read_json("data/users/students.json")
-    students_dict = {s["user_id"]: s for s in students} if students else {}
-
     print("\n📋 لیست درخواست‌های دفاع pending:")
     print("=" * 60)
 
     for i, req in enumerate(professor_defense_requests, 1):
-        student_info = students_dict.get(req["student_id"], {})
+        student_info = storage.find_one("students", "user_id", req["student_id"]) or {}
         student_name = student_info.get("name", "نامشخص")
 
         print(f"\n{i}. 👨‍🎓 دانشجو: {student_name}")
@@ -235,11 +249,12 @@ def manage_defense_requests(professor):
             return
 
         selected_request = professor_defense_requests[choice]
+        selected_student = storage.find_one("students", "user_id", selected_request["student_id"]) or {}
 
         # نمایش منوی مدیریت درخواست
         while True:
             print(
-                f"\n📋 مدیریت درخواست دفاع دانشجو: {students_dict.get(selected_request['student_id'], {}).get('name', 'نامشخص')}")
+                f"\n📋 مدیریت درخواست دفاع دانشجو: {selected_student.get('name', 'نامشخص')}")
             print("=" * 50)
             print("1. 📄 باز کردن فایل PDF پایان‌نامه")
             print("2. 🖼️ باز کردن عکس صفحه اول")
@@ -278,19 +293,11 @@ def manage_defense_requests(professor):
                 # رد درخواست
                 confirm = input("❓ آیا از رد این درخواست اطمینان دارید؟ (y/n): ").strip().lower()
                 if confirm == 'y':
-                    selected_request["status"] = "رد شده"
-                    selected_request["rejected_date"] = date.today().strftime("%Y-%m-%d")
-
-                    # آپدیت فایل درخواست‌ها
-                    for i, req in enumerate(defense_requests):
-                        if req["student_id"] == selected_request["student_id"]:
-                            defense_requests[i] = selected_request
-                            break
-
-                    if write_json("data/requests/defense_requests.json", defense_requests):
+                    try:
+                        services.reject_defense(DefenseRequest.from_dict(selected_request))
                         print("✅ درخواست دفاع رد شد.")
-                    else:
-                        print("❌ خطا در ذخیره تغییرات!")
+                    except ServiceError:
+                        print("❌ خطا در ذخیره تغییرات! (ممکن است درخواست قبلاً بررسی شده باشد)")
 
                     input("\nبرای ادامه Enter بزنید...")
                     break
@@ -322,19 +329,18 @@ def manage_defense_requests(professor):
                     print("❌ هیچ داور داخلی با ظرفیت خالی موجود نیست!")
                     # نمایش پیام توضیحی اگر فقط خود استاد راهنما available باشد
                     all_judges = get_available_internal_judges()  # بدون exclude
-                    if all_judges and len(all_judges) == 1 and all_judges[0]["user_id"] == professor.user_id:
+                    if all_judges and len(all_judges) == 1 and all_judges[0].user_id == professor.user_id:
                         print("ℹ️  فقط خود شما به عنوان داور available هستید که نمی‌توانید انتخاب شوید.")
                     input("\nبرای ادامه Enter بزنید...")
                     continue
 
                 print("\nلیست داوران داخلی available:")
                 for i, judge in enumerate(internal_judges, 1):
-                    print(f"{i}. {judge['name']} - ظرفیت: {judge.get('judge_capacity', 0)}")
+                    print(f"{i}. {judge.name} - ظرفیت: {judge.judge_capacity}")
 
                 # نمایش استاد راهنما به عنوان غیرقابل انتخاب (اختیاری)
-                all_judges = get_available_internal_judges()  # بدون exclude
-                professor_judge = next((j for j in all_judges if j["user_id"] == professor.user_id), None)
-                if professor_judge:
+                professor_judge = storage.find_one("professors", "user_id", professor.user_id)
+                if professor_judge and professor_judge.get("judge_capacity", 0) > 0:
                     print(f"👑 شما (استاد راهنما) - ظرفیت: {professor_judge.get('judge_capacity', 0)} - غیرقابل انتخاب")
 
                 try:
@@ -343,8 +349,8 @@ def manage_defense_requests(professor):
                         print("❌ انتخاب نامعتبر!")
                         continue
 
-                    internal_judge = internal_judges[choice]["user_id"]
-                    internal_judge_name = internal_judges[choice]["name"]
+                    internal_judge = internal_judges[choice].user_id
+                    internal_judge_name = internal_judges[choice].name
                     print(f"✅ داور داخلی انتخاب شد: {internal_judge_name}")
 
                 except (ValueError, IndexError):
@@ -369,7 +375,7 @@ def manage_defense_requests(professor):
                 print("\nلیست داوران خارجی available:")
 
                 for i, judge in enumerate(external_judges, 1):
-                    print(f"{i}. {judge['name']} - ظرفیت: {judge.get('judge_capacity', 0)}")
+                    print(f"{i}. {judge.name} - ظرفیت: {judge.judge_capacity}")
 
                 try:
 
@@ -380,9 +386,9 @@ def manage_defense_requests(professor):
 
                         continue
 
-                    external_judge = external_judges[choice]["user_id"]
+                    external_judge = external_judges[choice].user_id
 
-                    external_judge_name = external_judges[choice]["name"]
+                    external_judge_name = external_judges[choice].name
 
                     print(f"✅ داور خارجی انتخاب شد: {external_judge_name}")
 
@@ -393,55 +399,23 @@ def manage_defense_requests(professor):
 
                     continue
 
-                # آپدیت درخواست دفاع
-
-                selected_request["status"] = "تایید شده"
-
-                selected_request["approved_date"] = date.today().strftime("%Y-%m-%d")
-
-                selected_request["defense_date"] = defense_date
-
-                selected_request["internal_judge_id"] = internal_judge
-
-                selected_request["external_judge_id"] = external_judge
-
-                # آپدیت فایل درخواست‌ها
-
-                for i, req in enumerate(defense_requests):
-
-                    if req["student_id"] == selected_request["student_id"]:
-                        defense_requests[i] = selected_request
-
-                        break
-
-                if write_json("data/requests/defense_requests.json", defense_requests):
-
-                    # کاهش ظرفیت داوران
-
-                    if decrease_judge_capacity(internal_judge, is_external=False) and decrease_judge_capacity(
-                            external_judge, is_external=True):
-
-                        print("✅ درخواست دفاع تایید شد و جزئیات ثبت گردید.")
-
-                        print("✅ ظرفیت داوران نیز کاهش یافت.")
-
-                        # نمایش اطلاعات
-
-                        print(f"\n📋 اطلاعات دفاع:")
-
-                        print(f"   📅 تاریخ دفاع: {defense_date}")
-
-                        print(f"   👨‍🏫 داور داخلی: {internal_judge_name}")
-
-                        print(f"   👨‍🏫 داور خارجی: {external_judge_name}")
-
-                    else:
+                # تایید درخواست و کاهش ظرفیت هر دو داور در یک تراکنش
+                try:
+                    services.schedule_defense(DefenseRequest.from_dict(selected_request), defense_date,
+                                              internal_judge, external_judge)
+                except ServiceError as e:
+                    print(f"❌ {e.message}")
+                    input("\nبرای ادامه Enter بزنید...")
+                    break
 
-                        print("⚠️ درخواست تایید شد اما کاهش ظرفیت داوران با مشکل مواجه شد!")
+                print("✅ درخواست دفاع تایید شد و جزئیات ثبت گردید.")
+                print("✅ ظرفیت داوران نیز کاهش یافت.")
 
-                else:
-
-                    print("❌ خطا در ذخیره تغییرات!")
+                # نمایش اطلاعات
+                print(f"\n📋 اطلاعات دفاع:")
+                print(f"   📅 تاریخ دفاع: {defense_date}")
+                print(f"   👨‍🏫 داور داخلی: {internal_judge_name}")
+                print(f"   👨‍🏫 داور خارجی: {external_judge_name}")
 
                 input("\nبرای ادامه Enter بزنید...")
 
@@ -465,33 +439,17 @@ def manage_defense_requests(professor):
 
 def grade_defense_sessions(professor):
     """نمره‌دهی جلسات دفاع شده"""
+    storage = get_storage()
     print("\n📊 نمره‌دهی جلسات دفاع شده")
     print("=" * 50)
 
-    # خواندن درخواست‌های دفاع
-    defense_requests = read_json("data/requests/defense_requests.json")
     today = date.today()
 
-    # فیلتر کردن درخواست‌هایی که:
+    # از صف کاری استاد، درخواست‌هایی که:
     # 1. داور داخلی یا خارجی این استاد باشد
     # 2. وضعیت "تایید شده" داشته باشند
     # 3. تاریخ دفاع گذشته باشد
-    professor_defense_requests = [
-        r for r in defense_requests
-        if (r.get("internal_judge_id") == professor.user_id or r.get("external_judge_id") == professor.user_id)
-           and r.get("status") == "تایید شده"
-           and "defense_date" in r
-    ]
-
-    # فقط درخواست‌هایی که تاریخ دفاعشان گذشته است
-    graded_defenses = []
-    for req in professor_defense_requests:
-        try:
-            defense_date = datetime.strptime(req["defense_date"], "%Y-%m-%d").date()
-            if defense_date <= today:
-                graded_defenses.append(req)
-        except ValueError:
-            continue
+    graded_defenses = due_defenses(professor.user_id, today)
 
     if not graded_defenses:
         print("✅ هیچ جلسه دفاعی برای نمره‌دهی وجود ندارد.")
@@ -501,12 +459,8 @@ def grade_defense_sessions(professor):
     print("\n📝 لیست جلسات دفاع شده برای نمره‌دهی:")
     print("=" * 60)
 
-    # خواندن اطلاعات دانشجویان
-    students = read_json("data/users/students.json")
-    students_dict = {s["user_id"]: s for s in students} if students else {}
-
     for i, req in enumerate(graded_defenses, 1):
-        student_info = students_dict.get(req["student_id"], {})
+        student_info = storage.find_one("students", "user_id", req["student_id"]) or {}
         student_name = student_info.get("name", "نامشخص")
 
         # تعیین نقش استاد (داور داخلی یا خارجی)
@@ -537,7 +491,7 @@ def grade_defense_sessions(professor):
             return
 
         selected_defense = graded_defenses[choice]
-        student_info = students_dict.get(selected_defense["student_id"], {})
+        student_info = storage.find_one("students", "user_id", selected_defense["student_id"]) or {}
         student_name = student_info.get("name", "نامشخص")
 
         # تعیین نقش استاد
@@ -550,8 +504,9 @@ def grade_defense_sessions(professor):
         print(f"📅 تاریخ دفاع: {selected_defense.get('defense_date', 'نامشخص')}")
 
         # بررسی آیا قبلاً نمره داده شده
-        if (is_internal_judge and "internal_grade" in selected_defense) or (
-                not is_internal_judge and "external_grade" in selected_defense):
+        regrade = (is_internal_judge and "internal_grade" in selected_defense) or (
+                not is_internal_judge and "external_grade" in selected_defense)
+        if regrade:
             print("⚠️  شما قبلاً به این دفاع نمره داده‌اید.")
             change_grade = input("آیا می‌خواهید نمره را تغییر دهید؟ (y/n): ").strip().lower()
             if change_grade != 'y':
@@ -572,17 +527,7 @@ def grade_defense_sessions(professor):
             except ValueError:
                 print("❌ لطفاً یک عدد وارد کنید!")
 
-        # تعیین نمره حروفی
-        if grade_value >= 17:
-            letter_grade = "الف"
-        elif grade_value >= 14:
-            letter_grade = "ب"
-        elif grade_value >= 10:
-            letter_grade = "ج"
-        else:
-            letter_grade = "د"
-
-        print(f"📊 نمره حروفی: {letter_grade}")
+        print(f"📊 نمره حروفی: {services.letter_grade(grade_value)}")
 
         # تأیید نمره
         confirm = input("\n❓ آیا از نمره وارد شده اطمینان دارید؟ (y/n): ").strip().lower()
@@ -591,202 +536,38 @@ def grade_defense_sessions(professor):
             input("\nبرای بازگشت Enter بزنید...")
             return
 
-        # آپدیت نمره در درخواست دفاع
-        if is_internal_judge:
-            selected_defense["internal_grade"] = grade_value
-            # selected_defense["internal_letter_grade"] = letter_grade
-            selected_defense["internal_grade_date"] = today.strftime("%Y-%m-%d")
-        else:
-            selected_defense["external_grade"] = grade_value
-            # selected_defense["external_letter_grade"] = letter_grade
-            selected_defense["external_grade_date"] = today.strftime("%Y-%m-%d")
-
-        # بررسی آیا هر دو داور نمره داده‌اند
-        both_graded = "internal_grade" in selected_defense and "external_grade" in selected_defense
+        # نمره، ظرفیت‌ها و آرشیو در یک تراکنش ثبت می‌شوند تا نیمه‌کاره نمانند
+        try:
+            result = services.grade_defense(DefenseRequest.from_dict(selected_defense), professor.user_id,
+                                            grade_value, regrade=regrade, today=today)
+        except ServiceError:
+            print("❌ خطا در ثبت نمره! (ممکن است وضعیت دفاع تغییر کرده باشد)")
+            input("\nبرای بازگشت Enter بزنید...")
+            return
 
-        if both_graded:
+        if result.closed:
             print("✅ هر دو داور نمره داده‌اند.")
 
-            # محاسبه نمره نهایی (میانگین دو نمره)
-            internal_grade = selected_defense["internal_grade"]
-            external_grade = selected_defense["external_grade"]
-            final_grade = (internal_grade + external_grade) / 2
-
-            # تعیین نمره حروفی نهایی
-            if final_grade >= 17:
-                final_letter_grade = "الف"
-            elif final_grade >= 14:
-                final_letter_grade = "ب"
-            elif final_grade >= 10:
-                final_letter_grade = "ج"
-            else:
-                final_letter_grade = "د"
-
-            selected_defense["final_grade"] = final_grade
-            selected_defense["final_letter_grade"] = final_letter_grade
-            selected_defense["status"] = "مختومه"
-
-            # افزایش ظرفیت درس برای استاد راهنما
-            courses = read_json("data/courses/thesis_courses.json")
-            for course in courses:
-                if course["professor_id"] == selected_defense["professor_id"]:
-                    course["capacity"] = course.get("capacity", 0) + 1
-                    print(f"✅ ظرفیت درس '{course['title']}' به {course['capacity']} افزایش یافت.")
-                    break
-            write_json("data/courses/thesis_courses.json", courses)
-
+            if result.course:
+                print(f"✅ ظرفیت درس '{result.course.title}' به {result.course.capacity} افزایش یافت.")
 
-            print(f"🎯 نمره نهایی: {final_grade:.2f} ({final_letter_grade})")
+            print(f"🎯 نمره نهایی: {result.defense.final_grade:.2f} ({result.defense.final_letter_grade})")
             print("✅ پایان‌نامه مختومه شد.")
-
-            # کپی به فایل defended_theses.json (نه انتقال)
-            defended_theses = read_json("data/theses/defended_theses.json")
-            defended_theses.append(selected_defense.copy())  # کپی کردن object
-            write_json("data/theses/defended_theses.json", defended_theses)
-
             print("✅ اطلاعات پایان‌نامه به آرشیو اضافه شد.")
         else:
             print("✅ نمره شما ثبت شد.")
             # وضعیت تغییر نمی‌کند (همچنان "تایید شده" باقی می‌ماند)
 
-        # ذخیره تغییرات در defense_requests.json
-        for i, req in enumerate(defense_requests):
-            if req["student_id"] == selected_defense["student_id"]:
-                defense_requests[i] = selected_defense
-                break
-
-        write_json("data/requests/defense_requests.json", defense_requests)
         print("✅ نمره با موفقیت ثبت شد.")
 
+        if result.judge_capacity is not None:
+            print(f"✅ ظرفیت داوری شما به {result.judge_capacity} افزایش یافت.")
+
     except (ValueError, IndexError):
         print("❌ انتخاب نامعتبر!")
 
-    # افزایش ظرفیت داور خارجی پس از نمره‌دهی
-    professors = read_json("data/users/professors.json")
-    for judge in professors:
-        if judge["user_id"] == professor.user_id:
-            judge["judge_capacity"] = judge.get("judge_capacity", 0) + 1
-            print(f"✅ ظرفیت داوری شما به {judge['judge_capacity']} افزایش یافت.")
-            break
-
-    write_json("data/users/professors.json", professors)
-
-    input("\nبرای بازگشت Enter بزنید...")
-
-def search_theses():
-    """جستجو در بانک پایان‌نامه‌ها"""
-    print("\n🔍 جستجو در بانک پایان‌نامه‌های مختومه")
-    print("=" * 50)
-
-    print("\n📋 انواع جستجو:")
-    print("1. عنوان پایان‌نامه")
-    print("2. نام استاد راهنما")
-    print("3. کلمات کلیدی")
-    print("4. نام نویسنده (دانشجو)")
-    print("5. سال دفاع")
-    print("6. نام داوران")
-
-    try:
-        choice = input("\n🎯 نوع جستجو را انتخاب کنید (1-6): ").strip()
-        search_types = {
-            "1": "title",
-            "2": "professor",
-            "3": "keywords",
-            "4": "author",
-            "5": "year",
-            "6": "judges"
-        }
-
-        if choice not in search_types:
-            print("❌ انتخاب نامعتبر!")
-            input("\nبرای بازگشت Enter بزنید...")
-            return
-
-        search_query = input("🔍 عبارت جستجو را وارد کنید: ").strip()
-
-        if not search_query:
-            print("❌ عبارت جستجو نمی‌تواند خالی باشد!")
-            input("\nبرای بازگشت Enter بزنید...")
-            return
-
-        # انجام جستجو
-        from src.utils.helpers import search_theses, open_file
-        results = search_theses(search_query, search_types[choice])
-
-        # نمایش نتایج
-        print(f"\n✅ تعداد نتایج یافت شده: {len(results)}")
-        print("=" * 60)
-
-        if not results:
-            print("❌ هیچ نتیجه‌ای یافت نشد.")
-        else:
-            # خواندن اطلاعات کاربران
-            students = read_json("data/users/students.json")
-            professors = read_json("data/users/professors.json")
-            external_judges = read_json("data/users/external_judges.json")
-
-            students_dict = {s["user_id"]: s for s in students}
-            professors_dict = {p["user_id"]: p for p in professors}
-            external_judges_dict = {j["user_id"]: j for j in external_judges}
-
-            for i, thesis in enumerate(results, 1):
-                # پیدا کردن نام‌ها
-                student_name = students_dict.get(thesis.get("student_id", ""), {}).get("name", "نامشخص")
-                professor_name = professors_dict.get(thesis.get("professor_id", ""), {}).get("name", "نامشخص")
-                internal_judge_name = professors_dict.get(thesis.get("internal_judge_id", ""), {}).get("name", "نامشخص")
-                external_judge_name = external_judges_dict.get(thesis.get("external_judge_id", ""), {}).get("name", "نامشخص")
-
-                from src.utils.helpers import get_semester_year
-
-                if thesis.get("defense_date"):
-                    semester_info = get_semester_year(thesis["defense_date"])
-
-                print(f"\n{i}. 📚 عنوان: {thesis.get('title', 'نامشخص')}")
-                print(f"   📝 چکیده: {thesis.get('abstract', 'نامشخص')[:100]}...")  # نمایش 100 کاراکتر اول
-                print(f"   🔖 کلمات کلیدی: {', '.join(thesis.get('keywords', []))}")
-                print(f"   👨‍🎓 نویسنده: {student_name}")
-                print(f"   📅 سال/نیمسال: {semester_info}")
-                print(f"   👨‍🏫 استاد راهنما: {professor_name}")
-                print(f"   👨‍⚖️ داور داخلی: {internal_judge_name}")
-                print(f"   👨‍⚖️ داور خارجی: {external_judge_name}")
-                print(f"   📊 نمره: {thesis.get('final_grade', 'نامشخص')}")
-                print(f"   🏆 نمره حروفی: {thesis.get('final_letter_grade', 'نامشخص')}")
-                print(f"   📁 فایل: {thesis.get('file_path', 'نامشخص')}")
-                print("-" * 60)
-
-        # نمایش منوی مدیریت نتایج
-        if results:
-            print("\n📋 مدیریت نتایج:")
-            print("1. باز کردن فایل یک پایان‌نامه")
-            print("2. بازگشت به منوی اصلی")
-
-            manage_choice = input("لطفاً گزینه مورد نظر را انتخاب کنید: ").strip()
-
-            if manage_choice == "1":
-                try:
-                    thesis_choice = int(input("شماره پایان‌نامه برای باز کردن فایل: ")) - 1
-                    if 0 <= thesis_choice < len(results):
-                        thesis = results[thesis_choice]
-                        if thesis.get('file_path'):
-                            file_path = get_full_path(thesis['file_path'])
-                            if os.path.exists(file_path):
-                                open_file(file_path)
-                                print("✅ فایل باز شد.")
-                            else:
-                                print("❌ فایل پیدا نشد!")
-                        else:
-                            print("❌ فایلی برای این پایان‌نامه وجود ندارد.")
-                    else:
-                        print("❌ شماره نامعتبر!")
-                except ValueError:
-                    print("❌ لطفاً عدد وارد کنید!")
-
-    except Exception as e:
-        print(f"❌ خطا در جستجو: {e}")
-
     input("\nبرای بازگشت Enter بزنید...")
 
-
 def change_password(professor):
     """تغییر رمز عبور"""
     print("\n🔒 تغییر رمز عبور")
@@ -0,0 +1,105 @@
+import os
+from src import services
+from src.services import ServiceError
+from src.storage import get_storage
+from src.utils.file_io import get_full_path
+from src.utils.helpers import get_semester_year, open_file
+
+
+def search_theses():
+    """جستجو در بانک پایان‌نامه‌ها"""
+    storage = get_storage()
+    print("\n🔍 جستجو در بانک پایان‌نامه‌های مختومه")
+    print("=" * 50)
+
+    print("\n📋 انواع جستجو:")
+    print("1. عنوان پایان‌نامه")
+    print("2. نام استاد راهنما")
+    print("3. کلمات کلیدی")
+    print("4. نام نویسنده (دانشجو)")
+    print("5. سال دفاع")
+    print("6. نام داوران")
+    print("7. جستجوی متنی (عنوان، چکیده، کلمات کلیدی و نام‌ها)")
+
+    try:
+        choice = input("\n🎯 نوع جستجو را انتخاب کنید (1-7): ").strip()
+        # شماره گزینه -> نوع جستجو (به همان ترتیب services.SEARCH_TYPES)
+        search_types = {str(i): search_type for i, search_type in enumerate(services.SEARCH_TYPES, 1)}
+
+        if choice not in search_types:
+            print("❌ انتخاب نامعتبر!")
+            input("\nبرای بازگشت Enter بزنید...")
+            return
+
+        search_query = input("🔍 عبارت جستجو را وارد کنید: ").strip()
+
+        if not search_query:
+            print("❌ عبارت جستجو نمی‌تواند خالی باشد!")
+            input("\nبرای بازگشت Enter بزنید...")
+            return
+
+        # انجام جستجو
+        results = services.search_archive(search_query, search_types[choice])
+
+        # نمایش نتایج
+        print(f"\n✅ تعداد نتایج یافت شده: {len(results)}")
+        print("=" * 60)
+
+        if not results:
+            print("❌ هیچ نتیجه‌ای یافت نشد.")
+        else:
+            for i, thesis in enumerate(results, 1):
+                # پیدا کردن نام‌ها (از طریق ایندکس کاربران)
+                student_name = (storage.find_one("students", "user_id", thesis.student_id) or {}).get("name", "نامشخص")
+                professor_name = (storage.find_one("professors", "user_id", thesis.professor_id) or {}).get("name", "نامشخص")
+                internal_judge_name = (storage.find_one("professors", "user_id", thesis.internal_judge_id) or {}).get("name", "نامشخص")
+                external_judge_name = (storage.find_one("external_judges", "user_id", thesis.external_judge_id) or {}).get("name", "نامشخص")
+
+                semester_info = get_semester_year(thesis.defense_date) if thesis.defense_date else "نامشخص"
+
+                print(f"\n{i}. 📚 عنوان: {thesis.title or 'نامشخص'}")
+                print(f"   📝 چکیده: {(thesis.abstract or 'نامشخص')[:100]}...")  # نمایش 100 کاراکتر اول
+                print(f"   🔖 کلمات کلیدی: {', '.join(thesis.keywords or [])}")
+                print(f"   👨‍🎓 نویسنده: {student_name}")
+                print(f"   📅 سال/نیمسال: {semester_info}")
+                print(f"   👨‍🏫 استاد راهنما: {professor_name}")
+                print(f"   👨‍⚖️ داور داخلی: {internal_judge_name}")
+                print(f"   👨‍⚖️ داور خارجی: {external_judge_name}")
+                print(f"   📊 نمره: {thesis.final_grade if thesis.final_grade is not None else 'نامشخص'}")
+                print(f"   🏆 نمره حروفی: {thesis.final_letter_grade or 'نامشخص'}")
+                print(f"   📁 فایل: {thesis.file_path or 'نامشخص'}")
+                print("-" * 60)
+
+        # نمایش منوی مدیریت نتایج
+        if results:
+            print("\n📋 مدیریت نتایج:")
+            print("1. باز کردن فایل یک پایان‌نامه")
+            print("2. بازگشت به منوی اصلی")
+
+            manage_choice = input("لطفاً گزینه مورد نظر را انتخاب کنید: ").strip()
+
+            if manage_choice == "1":
+                try:
+                    thesis_choice = int(input("شماره پایان‌نامه برای باز کردن فایل: ")) - 1
+                    if 0 <= thesis_choice < len(results):
+                        thesis = results[thesis_choice]
+                        if thesis.file_path:
+                            file_path = get_full_path(thesis.file_path)
+                            if os.path.exists(file_path):
+                                open_file(file_path)
+                                print("✅ فایل باز شد.")
+                            else:
+                                print("❌ فایل پیدا نشد!")
+                        else:
+                            print("❌ فایلی برای این پایان‌نامه وجود ندارد.")
+                    else:
+                        print("❌ شماره نامعتبر!")
+                except ValueError:
+                    print("❌ لطفاً عدد وارد کنید!")
+
+    except ServiceError as e:
+        print(f"❌ {e.message}")
+    except Exception as e:
+        print(f"❌ خطا در جستجو: {e}")
+
+    input("\nبرای بازگشت Enter بزنید...")
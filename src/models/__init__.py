@@ -0,0 +1,24 @@
+from src.models.record import Record, hydrate
+from src.models.status import RequestStatus, parse_status
+from src.models.user import User, Student, Professor, ExternalJudge
+from src.models.course import ThesisCourse
+from src.models.request import EnrollmentRequest, DefenseRequest
+from src.models.thesis import Thesis
+
+# مدل هر مجموعه منطقی storage
+MODELS = {
+    "students": Student,
+    "professors": Professor,
+    "external_judges": ExternalJudge,
+    "courses": ThesisCourse,
+    "enrollment_requests": EnrollmentRequest,
+    "defense_requests": DefenseRequest,
+    "defended_theses": Thesis,
+}
+
+# مدل کاربر هر نقش
+USER_MODELS = {
+    "student": Student,
+    "professor": Professor,
+    "external_judge": ExternalJudge,
+}
@@ -0,0 +1,64 @@
+from dataclasses import fields
+from enum import Enum
+from typing import Any, Dict, Iterable, List
+from src.models.status import parse_status
+
+
+class Record:
+    """
+    پایه مدل‌های داده (dataclassهای slots=True).
+    نام فیلدها همان کلیدهای رکورد روی دیسک است؛ کلید ناموجود None می‌شود و کلیدهای
+    ناشناخته در extra نگه داشته می‌شوند تا to_dict رکورد را بدون کم و کاست برگرداند.
+    """
+    __slots__ = ("_extra",)
+
+    @classmethod
+    def field_names(cls) -> tuple:
+        """نام فیلدهای مدل به ترتیب تعریف (یک بار برای هر کلاس محاسبه می‌شود)"""
+        names = cls.__dict__.get("_field_names")
+        if names is None:
+            names = tuple(field.name for field in fields(cls))
+            cls._field_names = names
+        return names
+
+    @property
+    def extra(self) -> Dict[str, Any]:
+        """کلیدهای رکورد که فیلد متناظر در مدل ندارند"""
+        return getattr(self, "_extra", None) or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """تبدیل شیء به دیکشنری برای ذخیره در JSON (فیلدهای None حذف می‌شوند)"""
+        data = {}
+        for name in self.field_names():
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value.value if isinstance(value, Enum) else value
+        data.update(self.extra)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """ساخت یک شیء از دیکشنری رکورد"""
+        return hydrate(cls, (data,))[0]
+
+
+def hydrate(model: type, records: Iterable[Dict[str, Any]]) -> List[Any]:
+    """
+    ساخت یک‌جای اشیای model از رکوردها.
+    نام فیلدها یک بار محاسبه و هر رکورد با فراخوانی مستقیم سازنده ساخته می‌شود؛
+    وضعیت‌ها به اعضای مشترک RequestStatus تبدیل می‌شوند.
+    """
+    names = model.field_names()
+    known = frozenset(names)
+    has_status = "status" in known
+
+    objects = []
+    append = objects.append
+    for record in records:
+        instance = model(*[record.get(name) for name in names])
+        if has_status:
+            instance.status = parse_status(instance.status)
+        if not known.issuperset(record):
+            instance._extra = {key: value for key, value in record.items() if key not in known}
+        append(instance)
+    return objects
@@ -1,42 +1,44 @@
-from datetime import datetime
+from dataclasses import dataclass
+from typing import List, Optional, Union
+from src.models.record import Record
+from src.models.status import RequestStatus
 
 
-class EnrollmentRequest:
+@dataclass(slots=True)
+class EnrollmentRequest(Record):
     """
     کلاس درخواست اخذ پایان‌نامه
     """
-    STATUS_PENDING = "در انتظار تأیید استاد"
-    STATUS_APPROVED = "تأیید شده"
-    STATUS_REJECTED = "رد شده"
+    student_id: str
+    course_id: str
+    professor_id: str
+    status: Union[RequestStatus, str] = RequestStatus.PENDING
+    created_at: Optional[str] = None  # تاریخ ایجاد (YYYY-MM-DD)
+    approved_date: Optional[str] = None  # "-" تا زمان تایید
+    rejected_date: Optional[str] = None  # "-" تا زمان رد
 
-    def __init__(self, request_id: str, student_id: str, course_id: str, professor_id: str, status: str = STATUS_PENDING):
-        self.request_id = request_id
-        self.student_id = student_id
-        self.course_id = course_id
-        self.professor_id = professor_id
-        self.status = status
-        self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # تاریخ ایجاد
 
-    def to_dict(self) -> dict:
-        """تبدیل شیء درخواست به دیکشنری برای ذخیره در JSON"""
-        return {
-            "request_id": self.request_id,
-            "student_id": self.student_id,
-            "course_id": self.course_id,
-            "professor_id": self.professor_id,
-            "status": self.status,
-            "created_at": self.created_at
-        }
-
-    @classmethod
-    def from_dict(cls, data: dict):
-        """ساخت یک شیء EnrollmentRequest از یک دیکشنری"""
-        request = cls(
-            data["request_id"],
-            data["student_id"],
-            data["course_id"],
-            data["professor_id"],
-            data["status"]
-        )
-        request.created_at = data["created_at"]
-        return request
\ No newline at end of file
+@dataclass(slots=True)
+class DefenseRequest(Record):
+    """
+    کلاس درخواست دفاع؛ پس از تایید، داوری و نمره‌دهی در همین رکورد تکمیل می‌شود
+    """
+    student_id: str
+    professor_id: str
+    title: str
+    abstract: Optional[str] = None
+    keywords: Optional[List[str]] = None
+    status: Union[RequestStatus, str] = RequestStatus.PENDING
+    submission_date: Optional[str] = None
+    file_path: Optional[str] = None  # مسیر فایل PDF
+    image_path: Optional[List[str]] = None  # مسیر تصاویر صفحه اول و آخر
+    approved_date: Optional[str] = None
+    defense_date: Optional[str] = None
+    internal_judge_id: Optional[str] = None  # کد داور داخلی
+    external_judge_id: Optional[str] = None  # کد داور خارجی
+    internal_grade: Optional[float] = None
+    internal_grade_date: Optional[str] = None
+    external_grade: Optional[float] = None
+    external_grade_date: Optional[str] = None
+    final_grade: Optional[float] = None
+    final_letter_grade: Optional[str] = None  # الف، ب، ج، د
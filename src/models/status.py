@@ -0,0 +1,27 @@
+from enum import Enum
+
+
+class RequestStatus(str, Enum):
+    """
+    وضعیت درخواست‌های اخذ و دفاع.
+    اعضا زیرکلاس str هستند، پس با رشته‌های ذخیره شده روی دیسک برابرند و همان‌طور serialize می‌شوند.
+    """
+    PENDING = "در انتظار تأیید استاد"
+    APPROVED = "تایید شده"
+    REJECTED = "رد شده"
+    CLOSED = "مختومه"
+
+    # نمایش و f-string همان متن فارسی باشد، نه نام عضو
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+
+_STATUS_BY_VALUE = {status.value: status for status in RequestStatus}
+
+
+def parse_status(value):
+    """
+    تبدیل متن وضعیت به عضو مشترک RequestStatus (intern شده).
+    وضعیت ناشناخته همان رشته باقی می‌ماند.
+    """
+    return _STATUS_BY_VALUE.get(value, value)
@@ -0,0 +1,338 @@
+"""
+حالت سرور: یک پردازه asyncio (فقط کتابخانه استاندارد) که API JSON روی HTTP را برای همه کاربران ارائه می‌دهد.
+
+    python -m src serve --host 127.0.0.1 --port 8080
+
+مسیرها (بدنه درخواست و پاسخ JSON؛ همه به جز login با هدر Authorization: Bearer <token>):
+
+    POST /login               {"role", "user_id", "password"}   -> {"token", "user"}
+    POST /logout
+    POST /enrollments         {"course"}                                               (دانشجو)
+    POST /enrollments/review  {"student", "course"?, "reject"?}                        (استاد)
+    POST /defenses            {"title", "abstract", "keywords", "pdf",
+                               "first_page", "last_page"}   (محتوای فایل‌ها base64)    (دانشجو)
+    POST /defenses/schedule   {"student", "date", "internal", "external", "reject"?}   (استاد راهنما)
+    POST /defenses/grade      {"student", "grade", "regrade"?}                        (داور)
+    GET  /theses?query=...&type=fulltext&limit=20
+
+مجموعه‌ها، ایندکس‌ها و کش فایل‌ها یک بار در این پردازه گرم می‌شوند و بین همه درخواست‌ها مشترک‌اند.
+کارهای مسدودکننده (خواندن و نوشتن فایل‌ها) در یک نخ جداگانه ذخیره‌سازی اجرا می‌شوند تا حلقه رویداد
+آزاد بماند؛ این نخ یکی است چون کش و ایندکس‌های درون حافظه برای دسترسی همزمان طراحی نشده‌اند و
+نوشتن‌ها به هر حال با قفل فایل پشت سر هم انجام می‌شوند. محاسبه هش رمزها در استخر نخ KDF انجام می‌شود
+و نخ ذخیره‌سازی را معطل نمی‌کند.
+"""
+import asyncio
+import base64
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from src import services
+from src.models import User, USER_MODELS
+from src.services import ServiceError
+from src.storage import get_storage, COLLECTIONS
+from src.utils import codec
+from src.utils.auth import collection_of, rehash_password
+from src.utils.passwords import needs_rehash, submit_verify
+from src.utils.sessions import create_session, end_session, get_session_user
+from src.utils.text_index import get_text_index
+
+# بیشترین اندازه بدنه درخواست (بایت)؛ فایل‌های درخواست دفاع به صورت base64 در همین بدنه می‌آیند
+MAX_BODY_ENV = "THESIS_SERVER_MAX_BODY"
+MAX_BODY = int(os.environ.get(MAX_BODY_ENV) or 1 << 25)
+
+# مهلت خواندن هر درخواست از یک اتصال باز (ثانیه)
+IDLE_TIMEOUT = 30
+
+# کد خطای سرویس -> وضعیت HTTP (بقیه 400)
+STATUS_OF = {
+    "not_found": 404,
+    "conflict": 409,
+    "duplicate": 409,
+    "capacity_full": 409,
+    "unauthorized": 401,
+    "forbidden": 403,
+}
+
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 411: "Length Required", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+_storage_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _run_blocking(function: Callable, *args) -> Awaitable:
+    """اجرای یک تابع مسدودکننده ذخیره‌سازی در نخ ذخیره‌سازی"""
+    global _storage_executor
+    if _storage_executor is None:
+        _storage_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thesis-storage")
+    return asyncio.get_running_loop().run_in_executor(_storage_executor, function, *args)
+
+
+def _require(body: Dict[str, Any], *names: str) -> list:
+    missing = [name for name in names if body.get(name) in (None, "")]
+    if missing:
+        raise ServiceError("missing_field", f"فیلدهای لازم وارد نشده‌اند: {', '.join(missing)}")
+    return [body[name] for name in names]
+
+
+def _require_role(user: Optional[User], *roles: str) -> User:
+    if user is None:
+        raise ServiceError("unauthorized", "ابتدا وارد حساب کاربری شوید!")
+    if user.get_role() not in roles:
+        raise ServiceError("forbidden", "این عملیات برای نقش شما مجاز نیست!")
+    return user
+
+
+def _public(user: User) -> Dict[str, Any]:
+    """اطلاعات کاربر بدون هش رمز"""
+    data = user.to_dict()
+    data.pop("password", None)
+    return data
+
+
+async def login(body: Dict[str, Any], user: Optional[User], token: Optional[str]) -> Dict[str, Any]:
+    """ورود؛ جستجوی کاربر در نخ ذخیره‌سازی و بررسی رمز در استخر KDF"""
+    role, user_id, password = _require(body, "role", "user_id", "password")
+    if role not in USER_MODELS:
+        raise ServiceError("invalid_role", "نقش کاربری نامعتبر است!")
+    collection = collection_of(role)
+    user_data = await _run_blocking(get_storage().find_one, collection, "user_id", user_id)
+    if not user_data or not await asyncio.wrap_future(submit_verify(password, user_data["password"])):
+        raise ServiceError("unauthorized", "کد کاربری یا رمز عبور اشتباه است!")
+    if needs_rehash(user_data["password"]):
+        new_password = await _run_blocking(rehash_password, collection, user_id, password,
+                                           user_data["password"])
+        user_data = dict(user_data, password=new_password)
+    user = USER_MODELS[role].from_dict(user_data)
+    return {"token": create_session(user), "user": _public(user)}
+
+
+def logout(body: Dict[str, Any], user: Optional[User], token: Optional[str]) -> Dict[str, Any]:
+    _require_role(user, *USER_MODELS)
+    end_session(token)
+    return {}
+
+
+def enroll(body: Dict[str, Any], user: Optional[User], token: Optional[str]) -> Dict[str, Any]:
+    student = _require_role(user, "student")
+    (course_id,) = _require(body, "course")
+    request, remaining = services.enroll(student.user_id, course_id)
+    return {"request": request.to_dict(), "remaining_capacity": remaining}
+
+
+def review_enrollment(body: Dict[str, Any], user: Optional[User], token: Optional[str]) -> Dict[str, Any]:
+    professor = _require_role(user, "professor")
+    (student_id,) = _require(body, "student")
+    request, course = services.review_enrollment(professor.user_id, student_id, not body.get("reject"),
+                                                 body.get("course") or None)
+    return {"request": request.to_dict(), "course": course.to_dict() if course else None}
+
+
+def _decode_upload(body: Dict[str, Any], name: str) -> bytes:
+    """محتوای فایل آپلود شده که به صورت base64 در بدنه JSON آمده است"""
+    try:
+        return base64.b64decode(body[name], validate=True)
+    except (TypeError, ValueError):
+        raise ServiceError("invalid_file", f"محتوای فایل {name} باید base64 باشد!")
+
+
+def request_defense(body: Dict[str, Any], user: Optional[User], token: Optional[str]) -> Dict[str, Any]:
+    student = _require_role(user, "student")
+    title, abstract = _require(body, "title", "abstract", "pdf", "first_page", "last_page")[:2]
+    keywords = body.get("keywords") or []
+    if isinstance(keywords, str):
+        keywords = [k.strip() for k in keywords.split('-') if k.strip()]
+    request = services.submit_defense(student.user_id, title, abstract, keywords, _decode_upload(body, "pdf"),
+                                      _decode_upload(body, "first_page"), _decode_upload(body, "last_page"))
+    return {"request": request.to_dict()}
+
+
+def schedule_defense(body: Dict[str, Any], user: Optional[User], token: Optional[str]) -> Dict[str, Any]:
+    professor = _require_role(user, "professor")
+    (student_id,) = _require(body, "student")
+    request = services.pending_defense(professor.user_id, student_id)
+    if body.get("reject"):
+        return {"request": services.reject_defense(request).to_dict()}
+    defense_date, internal_judge_id, external_judge_id = _require(body, "date", "internal", "external")
+    return {"request": services.schedule_defense(request, defense_date, internal_judge_id,
+                                                 external_judge_id).to_dict()}
+
+
+def grade_defense(body: Dict[str, Any], user: Optional[User], token: Optional[str]) -> Dict[str, Any]:
+    judge = _require_role(user, "professor", "external_judge")
+    student_id, grade = _require(body, "student", "grade")
+    try:
+        grade = float(grade)
+    except (TypeError, ValueError):
+        raise ServiceError("invalid_grade", "نمره باید عدد باشد!")
+    defense = services.defense_to_grade(judge.user_id, student_id)
+    result = services.grade_defense(defense, judge.user_id, grade, regrade=bool(body.get("regrade")))
+    return {"request": result.defense.to_dict(), "closed": result.closed, "judge_capacity": result.judge_capacity,
+            "course": result.course.to_dict() if result.course else None}
+
+
+def search(body: Dict[str, Any], user: Optional[User], token: Optional[str]) -> Dict[str, Any]:
+    _require_role(user, *USER_MODELS)
+    (query,) = _require(body, "query")
+    theses = services.search_archive(query, body.get("type") or "fulltext")
+    try:
+        limit = int(body.get("limit") or 0)
+    except ValueError:
+        raise ServiceError("invalid_limit", "limit باید عدد باشد!")
+    return {"count": len(theses), "theses": [t.to_dict() for t in (theses[:limit] if limit else theses)]}
+
+
+# (متد، مسیر) -> تابع پاسخ؛ توابع async خودشان کارهای مسدودکننده را به نخ‌ها می‌سپارند،
+# بقیه کامل در نخ ذخیره‌سازی اجرا می‌شوند
+ROUTES: Dict[Tuple[str, str], Callable] = {
+    ("POST", "/login"): login,
+    ("POST", "/logout"): logout,
+    ("POST", "/enrollments"): enroll,
+    ("POST", "/enrollments/review"): review_enrollment,
+    ("POST", "/defenses"): request_defense,
+    ("POST", "/defenses/schedule"): schedule_defense,
+    ("POST", "/defenses/grade"): grade_defense,
+    ("GET", "/theses"): search,
+}
+
+
+class HttpError(Exception):
+    """درخواست HTTP نامعتبر (قبل از رسیدن به سرویس‌ها)"""
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def dispatch(method: str, target: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, Any]]:
+    """اجرای یک درخواست؛ بازگشت: (وضعیت HTTP، بدنه پاسخ)"""
+    url = urlsplit(target)
+    handler = ROUTES.get((method, url.path))
+    if handler is None:
+        if any(path == url.path for _, path in ROUTES):
+            raise HttpError(405, "متد برای این مسیر مجاز نیست!")
+        raise HttpError(404, "مسیر یافت نشد!")
+
+    params: Dict[str, Any] = dict(parse_qsl(url.query))
+    if body:
+        try:
+            data = codec.loads(body)
+        except ValueError:
+            raise HttpError(400, "بدنه درخواست JSON معتبر نیست!")
+        if not isinstance(data, dict):
+            raise HttpError(400, "بدنه درخواست باید یک شیء JSON باشد!")
+        params.update(data)
+
+    token = None
+    authorization = headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:].strip()
+
+    def _call():
+        # توکنی که در این پردازه ساخته نشده ممکن است کاربر را از ذخیره‌سازی بخواند
+        return handler(params, get_session_user(token) if token else None, token)
+
+    try:
+        if asyncio.iscoroutinefunction(handler):
+            result = await handler(params, None, token)
+        else:
+            result = await _run_blocking(_call)
+    except ServiceError as e:
+        return STATUS_OF.get(e.code, 400), {"ok": False, "code": e.code, "error": e.message}
+    return 200, {"ok": True, **result}
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+    """خواندن یک درخواست HTTP/1.x؛ None اگر اتصال بسته شده باشد"""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, version = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HttpError(400, "خط درخواست نامعتبر است!")
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HttpError(411, "بدنه درخواست باید Content-Length داشته باشد!")
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HttpError(400, "Content-Length نامعتبر است!")
+    if length > MAX_BODY:
+        raise HttpError(413, "بدنه درخواست بیش از حد بزرگ است!")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, version.upper(), headers, body
+
+
+def _response(status: int, payload: Dict[str, Any], keep_alive: bool) -> bytes:
+    body = codec.dumps(payload, compact=True).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """پاسخ به درخواست‌های پشت سر هم یک اتصال (keep-alive)"""
+    try:
+        while True:
+            try:
+                request = await asyncio.wait_for(read_request(reader), IDLE_TIMEOUT)
+            except HttpError as e:
+                writer.write(_response(e.status, {"ok": False, "error": e.message}, False))
+                break
+            if request is None:
+                break
+
+            method, target, version, headers, body = request
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+            try:
+                status, payload = await dispatch(method, target, headers, body)
+            except HttpError as e:
+                status, payload = e.status, {"ok": False, "error": e.message}
+            except Exception as e:
+                status, payload = 500, {"ok": False, "error": f"خطای داخلی سرور: {e}"}
+
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def warm_up() -> None:
+    """بازیابی تراکنش‌های نیمه‌کاره و بارگذاری مجموعه‌ها و ایندکس جستجو در حافظه"""
+    storage = get_storage()
+    storage.recover()
+    for collection in COLLECTIONS:
+        if collection != "defended_theses":  # آرشیو mmap می‌شود و از طریق ایندکس جستجو گرم می‌شود
+            storage.all(collection)
+    get_text_index()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8080) -> None:
+    """اجرای سرور تا زمان توقف پردازه"""
+    await _run_blocking(warm_up)
+    server = await asyncio.start_server(handle_connection, host, port, backlog=1024)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"✅ سرور سامانه پایان‌نامه روی {addresses} اجرا شد.", flush=True)
+    async with server:
+        await server.serve_forever()
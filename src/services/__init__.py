@@ -0,0 +1,9 @@
+from src.services.errors import ServiceError
+from src.services.enrollment import (ReviewReport, thesis_courses, has_thesis_request, enroll, pending_enrollment,
+                                     review_enrollments, review_enrollment)
+from src.services.defense import (DEFENSE_WAIT, IMAGE_EXTENSIONS, approved_enrollment, active_defense_request,
+                                  defense_window, read_upload, submit_defense, pending_defense, schedule_defense,
+                                  reject_defense)
+from src.services.grading import (GradeResult, letter_grade, final_grade, judge_role, defense_to_grade,
+                                  grade_defense)
+from src.services.archive import SEARCH_TYPES, search_archive, export_archive
@@ -0,0 +1,25 @@
+from typing import Any, Dict, Iterator, List
+from src.models import Thesis, hydrate
+from src.services.errors import ServiceError
+from src.storage import get_storage
+from src.utils.helpers import search_theses
+
+# انواع جستجو در بانک پایان‌نامه‌ها (همان گزینه‌های منوی جستجو)
+SEARCH_TYPES = ("title", "professor", "keywords", "author", "year", "judges", "fulltext")
+
+
+def search_archive(query: str, search_type: str = "fulltext") -> List[Thesis]:
+    """جستجو در پایان‌نامه‌های مختومه"""
+    if search_type not in SEARCH_TYPES:
+        raise ServiceError("invalid_search_type", "نوع جستجو نامعتبر است!")
+    if not query.strip():
+        raise ServiceError("empty_query", "عبارت جستجو نمی‌تواند خالی باشد!")
+    return hydrate(Thesis, search_theses(query, search_type))
+
+
+def export_archive() -> Iterator[Dict[str, Any]]:
+    """
+    همه رکوردهای آرشیو پایان‌نامه‌ها به ترتیب ثبت (فقط برای خواندن).
+    آرشیو mmap شده است و رکوردها یکی‌یکی decode می‌شوند، پس کل آرشیو در حافظه ساخته نمی‌شود.
+    """
+    yield from get_storage().all("defended_theses")
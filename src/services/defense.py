@@ -0,0 +1,165 @@
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+from dateutil.relativedelta import relativedelta
+from src.models import DefenseRequest, EnrollmentRequest, RequestStatus
+from src.services.errors import ServiceError
+from src.storage import get_storage, DEFENSE_REQUEST_KEY
+from src.utils.file_io import get_full_path, save_uploaded_file
+from src.utils.helpers import change_judge_capacity, is_valid_date, update_request
+
+# فاصله لازم بین تایید درخواست اخذ و ارسال درخواست دفاع
+DEFENSE_WAIT = relativedelta(months=3)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# نوع فایل‌های آپلود شده از روی چند بایت اول محتوا تشخیص داده می‌شود، نه نام فایل
+PDF_SIGNATURE = b"%PDF-"
+IMAGE_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n")
+
+
+def approved_enrollment(student_id: str) -> EnrollmentRequest:
+    """درخواست اخذ تایید شده دانشجو (شرط ارسال درخواست دفاع)"""
+    record = next((r for r in get_storage().find_all("enrollment_requests", "student_id", student_id)
+                   if r["status"] == RequestStatus.APPROVED), None)
+    if not record:
+        raise ServiceError("not_approved", "شما بدلیل وضعیت درس امکان درخواست دفاع ندارید.")
+    return EnrollmentRequest.from_dict(record)
+
+
+def active_defense_request(student_id: str) -> Optional[DefenseRequest]:
+    """درخواست دفاع قبلی دانشجو که رد نشده باشد"""
+    record = next((r for r in get_storage().find_all("defense_requests", "student_id", student_id)
+                   if r["status"] != RequestStatus.REJECTED), None)
+    return DefenseRequest.from_dict(record) if record else None
+
+
+def defense_window(enrollment: EnrollmentRequest) -> Tuple[date, date]:
+    """بازگشت: (تاریخ تایید درخواست اخذ، اولین روزی که درخواست دفاع مجاز است)"""
+    if enrollment.approved_date in (None, "-"):
+        raise ServiceError("missing_approval_date", "خطا در اطلاعات درخواست! تاریخ تایید ثبت نشده است.")
+    try:
+        approval_date = datetime.strptime(enrollment.approved_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise ServiceError("invalid_date", "خطا در فرمت تاریخ! لطفاً با پشتیبانی تماس بگیرید.")
+    return approval_date, approval_date + DEFENSE_WAIT
+
+
+def read_upload(path: str, extensions: Tuple[str, ...]) -> bytes:
+    """
+    خواندن فایلی که کاربر منو از روی سیستم خودش انتخاب کرده (برای submit_defense).
+    سرور هیچ‌وقت مسیر فایل از کلاینت نمی‌گیرد و محتوای فایل را در بدنه درخواست دریافت می‌کند.
+    """
+    if not path.lower().endswith(extensions):
+        allowed = ", ".join(extension[1:].upper() for extension in extensions)
+        raise ServiceError("invalid_file", f"فرمت فایل نامعتبر است (فقط {allowed}): {path}")
+    try:
+        with open(path, 'rb') as file:
+            return file.read()
+    except OSError:
+        raise ServiceError("file_not_found", f"فایل پیدا نشد! لطفاً مسیر را بررسی کنید: {path}")
+
+
+def submit_defense(student_id: str, title: str, abstract: str, keywords: List[str], pdf: bytes,
+                   first_page: bytes, last_page: bytes, today: Optional[date] = None) -> DefenseRequest:
+    """
+    ثبت درخواست دفاع: بررسی شرایط (درخواست اخذ تایید شده، نداشتن درخواست فعال و گذشتن سه ماه)،
+    ذخیره محتوای فایل PDF و عکس صفحه اول و آخر در پوشه documents و ثبت درخواست برای استاد راهنما.
+    """
+    today = today or date.today()
+    enrollment = approved_enrollment(student_id)
+    if active_defense_request(student_id):
+        raise ServiceError("duplicate", "شما قبلاً درخواست دفاع داده‌اید!")
+    if today < defense_window(enrollment)[1]:
+        raise ServiceError("too_early", "هنوز سه ماه از تاریخ تایید نگذشته است.")
+
+    if not pdf.startswith(PDF_SIGNATURE):
+        raise ServiceError("invalid_file", "فقط فایل‌های PDF قابل قبول هستند!")
+    if not all(image.startswith(IMAGE_SIGNATURES) for image in (first_page, last_page)):
+        raise ServiceError("invalid_file", "فرمت فایل عکس نامعتبر است (فقط JPG, JPEG, PNG)!")
+
+    # نام فایل‌ها: <کد دانشجو>.<کد درس> با مسیر نسبی برای JSON
+    base_filename = f"{student_id}.{enrollment.course_id}"
+    relative_pdf_path = f"documents/theses/{base_filename}.pdf"
+    relative_image_path = [f"documents/images/{base_filename}.page1.jpg",
+                           f"documents/images/{base_filename}.page2.jpg"]
+    for content, relative in ((pdf, relative_pdf_path), (first_page, relative_image_path[0]),
+                              (last_page, relative_image_path[1])):
+        folder, file_name = relative.rsplit("/", 1)
+        if not save_uploaded_file(get_full_path(folder), file_name, content):
+            raise ServiceError("upload_failed", f"خطا در آپلود فایل {file_name}!")
+
+    new_defense_request = {
+        "student_id": student_id,
+        "professor_id": enrollment.professor_id,
+        "title": title,
+        "abstract": abstract,
+        "keywords": keywords,
+        "status": RequestStatus.PENDING,
+        "submission_date": today.strftime("%Y-%m-%d"),
+        "file_path": relative_pdf_path,  # مسیر فایل PDF
+        "image_path": relative_image_path  # مسیر تصاویر
+    }
+    if not get_storage().insert("defense_requests", new_defense_request):
+        raise ServiceError("write_failed", "خطا در ثبت درخواست دفاع!")
+    return DefenseRequest.from_dict(new_defense_request)
+
+
+def pending_defense(professor_id: str, student_id: str) -> DefenseRequest:
+    """درخواست دفاع در انتظار تأیید یک دانشجو برای این استاد راهنما"""
+    for record in get_storage().find_all("defense_requests", "student_id", student_id):
+        if record["professor_id"] == professor_id and record["status"] == RequestStatus.PENDING:
+            return DefenseRequest.from_dict(record)
+    raise ServiceError("not_found", "درخواست دفاع در انتظار تأییدی برای این دانشجو یافت نشد!")
+
+
+def schedule_defense(request: DefenseRequest, defense_date: str, internal_judge_id: str, external_judge_id: str,
+                     today: Optional[date] = None) -> DefenseRequest:
+    """
+    تایید درخواست دفاع، تعیین تاریخ و داوران و کاهش ظرفیت هر دو داور در یک تراکنش.
+    بازگشت: درخواست به‌روز شده
+    """
+    if not is_valid_date(defense_date):
+        raise ServiceError("invalid_date", "تاریخ دفاع باید به شکل YYYY-MM-DD باشد!")
+    if internal_judge_id == request.professor_id:
+        raise ServiceError("invalid_judge", "استاد راهنما نمی‌تواند داور داخلی باشد!")
+
+    changes = {
+        "status": RequestStatus.APPROVED,
+        "approved_date": (today or date.today()).strftime("%Y-%m-%d"),
+        "defense_date": defense_date,
+        "internal_judge_id": internal_judge_id,
+        "external_judge_id": external_judge_id
+    }
+
+    def _approve(session):
+        """تایید درخواست و کاهش ظرفیت هر دو داور در یک تراکنش"""
+        # ثبت فقط اگر درخواست هنوز در انتظار تأیید باشد
+        updated = update_request(session, "defense_requests", request.to_dict(), DEFENSE_REQUEST_KEY,
+                                 changes, RequestStatus.PENDING)
+        if not updated:
+            return None
+
+        # کاهش ظرفیت داوران؛ اگر ظرفیت یکی در این فاصله تمام شده باشد کل تراکنش لغو می‌شود
+        if change_judge_capacity(session, "professors", internal_judge_id, -1) is None:
+            return None
+        if change_judge_capacity(session, "external_judges", external_judge_id, -1) is None:
+            return None
+        return updated
+
+    updated = get_storage().transaction(["defense_requests", "professors", "external_judges"], _approve)
+    if updated is None:
+        raise ServiceError("conflict", "درخواست قبلاً بررسی شده، داور یافت نشد یا ظرفیت داوران تکمیل شده است!")
+    return DefenseRequest.from_dict(updated)
+
+
+def reject_defense(request: DefenseRequest, today: Optional[date] = None) -> DefenseRequest:
+    """رد درخواست دفاع در انتظار تأیید؛ بازگشت: درخواست به‌روز شده"""
+    changes = {
+        "status": RequestStatus.REJECTED,
+        "rejected_date": (today or date.today()).strftime("%Y-%m-%d")
+    }
+    updated = get_storage().transaction(["defense_requests"], lambda session: update_request(
+        session, "defense_requests", request.to_dict(), DEFENSE_REQUEST_KEY, changes, RequestStatus.PENDING))
+    if not updated:
+        raise ServiceError("conflict", "درخواست قبلاً بررسی شده است!")
+    return DefenseRequest.from_dict(updated)
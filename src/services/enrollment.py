@@ -0,0 +1,132 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.models import EnrollmentRequest, RequestStatus, ThesisCourse
+from src.services.errors import ServiceError
+from src.storage import get_storage, ENROLLMENT_REQUEST_KEY
+from src.utils.helpers import release_course_seat, take_course_seat, update_request
+
+# دروس پایان‌نامه با این پیشوند در عنوانشان شناخته می‌شوند
+THESIS_COURSE_PREFIX = "پایان نامه"
+
+
+@dataclass(slots=True)
+class ReviewReport:
+    """نتیجه بررسی یک یا چند درخواست اخذ"""
+    approved: List[EnrollmentRequest] = field(default_factory=list)
+    rejected: List[EnrollmentRequest] = field(default_factory=list)
+    skipped: List[EnrollmentRequest] = field(default_factory=list)  # در این فاصله بررسی شده بودند
+    courses: Dict[str, ThesisCourse] = field(default_factory=dict)  # درس‌هایی که ظرفیتشان برگشت
+
+
+def thesis_courses() -> List[ThesisCourse]:
+    """دروس پایان‌نامه"""
+    return [c for c in get_storage().models("courses") if c.title.startswith(THESIS_COURSE_PREFIX)]
+
+
+def has_thesis_request(student_id: str) -> bool:
+    """آیا دانشجو قبلاً برای یکی از دروس پایان‌نامه درخواست داده است"""
+    thesis_course_ids = {c.course_id for c in thesis_courses()}
+    return any(r["course_id"] in thesis_course_ids
+               for r in get_storage().find_all("enrollment_requests", "student_id", student_id))
+
+
+def enroll(student_id: str, course_id: str, today: Optional[date] = None) -> Tuple[EnrollmentRequest, int]:
+    """
+    ثبت درخواست اخذ درس پایان‌نامه و گرفتن یک صندلی از ظرفیت درس در یک تراکنش.
+    بازگشت: (درخواست ثبت شده، ظرفیت باقی‌مانده درس)
+    """
+    storage = get_storage()
+    if not storage.find_one("students", "user_id", student_id):
+        raise ServiceError("not_found", "دانشجو یافت نشد!")
+
+    course = storage.find_one("courses", "course_id", course_id)
+    if not course or course["capacity"] <= 0:
+        raise ServiceError("invalid_course", "کد درس نامعتبر یا ظرفیت آن پر است!")
+
+    # امکان برداشتن بیش از یک درس پایان‌نامه وجود ندارد
+    if has_thesis_request(student_id):
+        raise ServiceError("duplicate", "شما قبلاً برای درس 'پایان نامه' درخواست داده‌اید!")
+
+    new_request = {
+        "student_id": student_id,
+        "course_id": course["course_id"],
+        "professor_id": course["professor_id"],
+        "status": RequestStatus.PENDING,
+        "created_at": (today or date.today()).strftime("%Y-%m-%d"),
+        "approved_date": "-",  # مقدار پیش‌فرض تا زمانی که استاد تایید نکند
+        "rejected_date": "-"  # مقدار پیش‌فرض برای رد شدن
+    }
+
+    def _enroll(session):
+        """کم کردن ظرفیت درس و ثبت درخواست در یک تراکنش"""
+        # ممکن است دانشجوی دیگری همزمان ثبت‌نام کرده و ظرفیت پر شده باشد
+        remaining = take_course_seat(session, course["course_id"])
+        if remaining is None:
+            return None
+        session.insert("enrollment_requests", new_request)
+        return remaining
+
+    remaining = storage.transaction(["courses", "enrollment_requests"], _enroll)
+    if remaining is None:
+        raise ServiceError("capacity_full", "ظرفیت درس قبلاً پر شده است!")
+    return EnrollmentRequest.from_dict(new_request), remaining
+
+
+def pending_enrollment(professor_id: str, student_id: str, course_id: Optional[str] = None) -> EnrollmentRequest:
+    """درخواست اخذ در انتظار تأیید یک دانشجو برای این استاد"""
+    for record in get_storage().find_all("enrollment_requests", "student_id", student_id):
+        if (record["professor_id"] == professor_id and record["status"] == RequestStatus.PENDING
+                and course_id in (None, record["course_id"])):
+            return EnrollmentRequest.from_dict(record)
+    raise ServiceError("not_found", "درخواست در انتظار تأییدی برای این دانشجو یافت نشد!")
+
+
+def review_enrollments(decisions: Iterable[Tuple[EnrollmentRequest, bool]],
+                       today: Optional[date] = None) -> ReviewReport:
+    """
+    تایید (True) یا رد (False) چند درخواست اخذ در یک تراکنش، با یک بار نوشتن هر فایل.
+    ظرفیت درس درخواست‌های رد شده برمی‌گردد؛ درخواستی که در این فاصله بررسی شده باشد
+    بدون تغییر در skipped گزارش می‌شود.
+    """
+    decisions = list(decisions)
+    day = (today or date.today()).strftime("%Y-%m-%d")
+
+    def _review_all(session):
+        report = ReviewReport()
+        for request, approve in decisions:
+            if approve:
+                changes = {"status": RequestStatus.APPROVED, "approved_date": day}
+            else:
+                changes = {"status": RequestStatus.REJECTED, "rejected_date": day}
+            updated = update_request(session, "enrollment_requests", request.to_dict(), ENROLLMENT_REQUEST_KEY,
+                                     changes, RequestStatus.PENDING)
+            if not updated:
+                report.skipped.append(request)
+                continue
+            (report.approved if approve else report.rejected).append(EnrollmentRequest.from_dict(updated))
+            if not approve:
+                course = release_course_seat(session, course_id=request.course_id)
+                if course:
+                    report.courses[course["course_id"]] = ThesisCourse.from_dict(course)
+        # اگر هیچ درخواستی تغییر نکرد چیزی نوشته نمی‌شود
+        return report if report.approved or report.rejected else None
+
+    report = get_storage().transaction(["enrollment_requests", "courses"], _review_all)
+    if report is None:
+        return ReviewReport(skipped=[request for request, _ in decisions])
+    return report
+
+
+def review_enrollment(professor_id: str, student_id: str, approve: bool, course_id: Optional[str] = None,
+                      today: Optional[date] = None) -> Tuple[EnrollmentRequest, Optional[ThesisCourse]]:
+    """
+    تایید یا رد درخواست اخذ یک دانشجو.
+    بازگشت: (درخواست به‌روز شده، درسی که ظرفیتش برگشت یا None)
+    """
+    request = pending_enrollment(professor_id, student_id, course_id)
+    report = review_enrollments([(request, approve)], today)
+    reviewed = report.approved or report.rejected
+    if not reviewed:
+        raise ServiceError("conflict", "درخواست قبلاً بررسی شده است!")
+    return reviewed[0], report.courses.get(request.course_id)
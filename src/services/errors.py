@@ -0,0 +1,9 @@
+class ServiceError(Exception):
+    """
+    خطای قابل انتظار یک عملیات (درخواست پیدا نشد، ظرفیت پر است و ...).
+    code یک شناسه کوتاه برای خروجی ماشینی است و message متن فارسی برای نمایش به کاربر.
+    """
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
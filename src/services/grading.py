@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+from src.models import DefenseRequest, RequestStatus, ThesisCourse
+from src.services.errors import ServiceError
+from src.storage import get_storage, key_of, DEFENSE_REQUEST_KEY
+from src.utils.helpers import change_judge_capacity, close_defense
+from src.utils.text_index import get_text_index
+
+
+@dataclass(slots=True)
+class GradeResult:
+    """نتیجه ثبت نمره یک داور"""
+    defense: DefenseRequest
+    judge_capacity: Optional[int]  # ظرفیت داوری جدید (None اگر تغییری نکرد)
+    course: Optional[ThesisCourse]  # درس استاد راهنما که ظرفیتش برگشت (فقط هنگام مختومه شدن)
+
+    @property
+    def closed(self) -> bool:
+        """آیا با این نمره هر دو داور نمره داده‌اند و پایان‌نامه مختومه شد"""
+        return self.defense.status == RequestStatus.CLOSED
+
+
+def letter_grade(grade: float) -> str:
+    """نمره حروفی: الف (۱۷ و بالاتر)، ب (۱۴)، ج (۱۰) و د"""
+    if grade >= 17:
+        return "الف"
+    elif grade >= 14:
+        return "ب"
+    elif grade >= 10:
+        return "ج"
+    return "د"
+
+
+def final_grade(internal_grade: float, external_grade: float) -> float:
+    """نمره نهایی: میانگین نمره دو داور"""
+    return (internal_grade + external_grade) / 2
+
+
+def judge_role(defense: DefenseRequest, judge_id: str) -> str:
+    """نقش داور در این دفاع: "internal" یا "external" """
+    return "internal" if defense.internal_judge_id == judge_id else "external"
+
+
+def defense_to_grade(judge_id: str, student_id: str) -> DefenseRequest:
+    """دفاع تایید شده یک دانشجو که judge_id داور داخلی یا خارجی آن است"""
+    for record in get_storage().find_all("defense_requests", "student_id", student_id):
+        if (record["status"] == RequestStatus.APPROVED
+                and judge_id in (record.get("internal_judge_id"), record.get("external_judge_id"))):
+            return DefenseRequest.from_dict(record)
+    raise ServiceError("not_found", "دفاع تایید شده‌ای با این داور برای این دانشجو یافت نشد!")
+
+
+def grade_defense(defense: DefenseRequest, judge_id: str, grade: float, regrade: bool = False,
+                  today: Optional[date] = None) -> GradeResult:
+    """
+    ثبت نمره یک داور، افزایش ظرفیت داوری و در صورت کامل شدن نمره‌ها بستن پایان‌نامه
+    (نمره نهایی، مختومه شدن، برگشت ظرفیت درس و افزودن به آرشیو) در یک تراکنش.
+    نمره قبلی فقط با regrade تغییر می‌کند و ظرفیت داوری فقط برای اولین نمره برمی‌گردد.
+    """
+    if not 0 <= grade <= 20:
+        raise ServiceError("invalid_grade", "نمره باید بین 0 تا 20 باشد!")
+
+    role = judge_role(defense, judge_id)
+    judges = "professors" if role == "internal" else "external_judges"
+    day = (today or date.today()).strftime("%Y-%m-%d")
+
+    def _apply_grade(session):
+        """بازگشت: (درخواست، ظرفیت داوری جدید، درس به‌روز شده یا None)"""
+        match = dict(key_of(defense.to_dict(), DEFENSE_REQUEST_KEY), status=RequestStatus.APPROVED)
+        current = session.get("defense_requests", match)
+        if not current or current.get(f"{role}_judge_id") != judge_id:
+            return None
+        first_grade = f"{role}_grade" not in current
+        if not first_grade and not regrade:
+            return None
+
+        # ثبت نمره و تاریخ آن
+        current[f"{role}_grade"] = grade
+        current[f"{role}_grade_date"] = day
+
+        # افزایش ظرفیت داوری پس از اولین نمره‌دهی
+        capacity = change_judge_capacity(session, judges, judge_id, +1) if first_grade else None
+
+        # بررسی آیا هر دو داور نمره داده‌اند
+        if "internal_grade" not in current or "external_grade" not in current:
+            return session.update("defense_requests", match, current), capacity, None
+
+        current["final_grade"] = final_grade(current["internal_grade"], current["external_grade"])
+        current["final_letter_grade"] = letter_grade(current["final_grade"])
+        current["status"] = RequestStatus.CLOSED
+        session.update("defense_requests", match, current)
+
+        # افزایش ظرفیت درس استاد راهنما و کپی به آرشیو
+        return current, capacity, close_defense(session, current)
+
+    # نمره، ظرفیت‌ها و آرشیو در یک تراکنش ثبت می‌شوند تا نیمه‌کاره نمانند
+    result = get_storage().transaction(["defense_requests", judges, "courses", "defended_theses"], _apply_grade)
+    if result is None:
+        raise ServiceError("conflict", "نمره ثبت نشد! (ممکن است قبلاً نمره داده شده یا وضعیت دفاع تغییر کرده باشد)")
+
+    graded, capacity, course = result
+    if graded["status"] == RequestStatus.CLOSED:
+        # به‌روزرسانی افزایشی ایندکس جستجو با رکورد جدید آرشیو
+        get_text_index()
+    return GradeResult(DefenseRequest.from_dict(graded), capacity,
+                       ThesisCourse.from_dict(course) if course else None)
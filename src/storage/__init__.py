@@ -0,0 +1,22 @@
+import os
+from src.storage.base import (COLLECTIONS, ENROLLMENT_REQUEST_KEY, DEFENSE_REQUEST_KEY, StorageBackend,
+                              StorageSession, key_of)
+
+# انتخاب backend ذخیره‌سازی: json (پیش‌فرض) یا sqlite
+STORAGE_ENV = "THESIS_STORAGE"
+
+_backend = None
+
+
+def get_storage() -> StorageBackend:
+    """backend ذخیره‌سازی فعال (یک نمونه مشترک برای کل برنامه)"""
+    global _backend
+    if _backend is None:
+        name = os.environ.get(STORAGE_ENV, "json").strip().lower()
+        if name == "sqlite":
+            from src.storage.sqlite_backend import SqliteBackend
+            _backend = SqliteBackend()
+        else:
+            from src.storage.json_backend import JsonBackend
+            _backend = JsonBackend()
+    return _backend
@@ -0,0 +1,172 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from src.models import MODELS, hydrate
+
+# نام منطقی هر مجموعه -> مسیر فایل JSON آن (نسبت به root پروژه)
+COLLECTIONS = {
+    "students": "data/users/students.json",
+    "professors": "data/users/professors.json",
+    "external_judges": "data/users/external_judges.json",
+    "courses": "data/courses/thesis_courses.json",
+    "enrollment_requests": "data/requests/enrollment_requests.json",
+    "defense_requests": "data/requests/defense_requests.json",
+    "defended_theses": "data/theses/defended_theses.jsonl",
+}
+
+# فیلدهایی که یک درخواست را به طور یکتا مشخص می‌کنند (درخواست‌ها شناسه جداگانه ندارند)
+ENROLLMENT_REQUEST_KEY = ("student_id", "course_id", "created_at")
+DEFENSE_REQUEST_KEY = ("student_id", "submission_date", "title")
+
+
+def key_of(record: Dict[str, Any], key_fields: tuple) -> Dict[str, Any]:
+    """ساخت شرط تطابق یک رکورد از روی فیلدهای کلید آن"""
+    return {field: record.get(field) for field in key_fields}
+
+
+def matches(record: Dict[str, Any], match: Dict[str, Any]) -> bool:
+    """بررسی برابری رکورد با همه فیلدهای شرط"""
+    return all(record.get(field) == value for field, value in match.items())
+
+
+class StorageSession(ABC):
+    """
+    عملیات نوشتن داخل یک تراکنش.
+    همه تغییرات یک session با هم ثبت می‌شوند یا هیچ‌کدام.
+    """
+    @abstractmethod
+    def get(self, collection: str, match: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """اولین رکورد منطبق با همه فیلدهای match (کپی) یا None"""
+        pass
+
+    @abstractmethod
+    def insert(self, collection: str, record: Dict[str, Any]) -> None:
+        """اضافه کردن رکورد به انتهای مجموعه"""
+        pass
+
+    @abstractmethod
+    def update(self, collection: str, match: Dict[str, Any], changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        اعمال changes روی اولین رکورد منطبق با match.
+        بازگشت: کپی رکورد به‌روز شده یا None اگر رکوردی پیدا نشد
+        """
+        pass
+
+    @abstractmethod
+    def increment(self, collection: str, match: Dict[str, Any], field: str, delta: int,
+                  minimum: int = 0) -> Optional[int]:
+        """
+        تغییر یک شمارنده (مثل ظرفیت) در اولین رکورد منطبق.
+        بازگشت: مقدار جدید یا None اگر رکورد پیدا نشد یا مقدار از minimum کمتر می‌شد
+        """
+        pass
+
+
+class StorageBackend(ABC):
+    """
+    رابط ذخیره‌سازی که منوها و auth به جای مسیر فایل‌ها از آن استفاده می‌کنند.
+    رکوردهای برگشتی از متدهای خواندن فقط برای خواندن هستند؛ تغییرات باید با
+    transaction یا متدهای insert/update/increment انجام شوند.
+    """
+    name = ""
+
+    @abstractmethod
+    def all(self, collection: str) -> List[Dict[str, Any]]:
+        """همه رکوردهای یک مجموعه به ترتیب ثبت (لیست یا دنباله‌ای مثل آرشیو mmap شده)"""
+        pass
+
+    @abstractmethod
+    def find_all(self, collection: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        """همه رکوردهایی که فیلد field آن‌ها برابر value است (به ترتیب ثبت)"""
+        pass
+
+    @abstractmethod
+    def version(self, collection: str) -> int:
+        """نسخه فعلی مجموعه؛ با هر تغییر عوض می‌شود (برای کش ساختارهای مشتق)"""
+        pass
+
+    @abstractmethod
+    def transaction(self, collections: Iterable[str], operation: Callable[[StorageSession], Any]) -> Any:
+        """
+        اجرای operation روی یک session که همه مجموعه‌های collections را در بر می‌گیرد.
+        اگر operation مقدار None یا False برگرداند تراکنش لغو می‌شود.
+        بازگشت: مقدار برگشتی operation، یا None در صورت خطا
+        """
+        pass
+
+    @abstractmethod
+    def is_empty(self) -> bool:
+        """بررسی خالی بودن همه مجموعه‌ها (برای مهاجرت و ساخت داده‌های ساختگی)"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """پاک کردن همه رکوردهای همه مجموعه‌ها"""
+        pass
+
+    def changes_since(self, collection: str, token: Any) -> tuple:
+        """
+        تغییرات مجموعه از زمان token (برای به‌روزرسانی افزایشی ساختارهای مشتق).
+        بازگشت: (همه رکوردها، شماره ردیف‌های تغییر کرده یا اضافه شده، token جدید)؛
+        اگر تغییرات قابل تشخیص نباشد به جای لیست ردیف‌ها None برمی‌گردد (ساخت دوباره کامل).
+        """
+        version = self.version(collection)
+        return self.all(collection), ([] if token == version else None), version
+
+    def recover(self) -> int:
+        """بازیابی تراکنش‌های نیمه‌کاره در شروع برنامه؛ بازگشت: تعداد تراکنش‌های بازیابی شده"""
+        return 0
+
+    def models(self, collection: str) -> List[Any]:
+        """
+        همه رکوردهای مجموعه به صورت اشیای مدل (src.models) که یک‌جا ساخته می‌شوند.
+        نتیجه تا تغییر بعدی مجموعه کش می‌شود و اشیا فقط برای خواندن هستند.
+        آرشیوهای mmap شده کش نمی‌شوند تا حافظه با اندازه آرشیو رشد نکند.
+        """
+        cache = self.__dict__.setdefault("_models", {})
+        version = self.version(collection)
+        cached = cache.get(collection)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        records = self.all(collection)
+        objects = hydrate(MODELS[collection], records)
+        if isinstance(records, list):
+            cache[collection] = (version, objects)
+        return objects
+
+    def find_one(self, collection: str, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        """اولین رکورد منطبق یا None"""
+        records = self.find_all(collection, field, value)
+        return records[0] if records else None
+
+    def find_last(self, collection: str, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        """آخرین رکورد منطبق (جدیدترین) یا None"""
+        records = self.find_all(collection, field, value)
+        return records[-1] if records else None
+
+    def insert(self, collection: str, record: Dict[str, Any]) -> bool:
+        """اضافه کردن یک رکورد در یک تراکنش مستقل"""
+        def _insert(session):
+            session.insert(collection, record)
+            return True
+
+        return bool(self.transaction([collection], _insert))
+
+    def update(self, collection: str, match: Dict[str, Any], changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """به‌روزرسانی یک رکورد در یک تراکنش مستقل"""
+        return self.transaction([collection], lambda session: session.update(collection, match, changes))
+
+    def bulk_insert(self, collection: str, records: Iterable[Dict[str, Any]]) -> bool:
+        """اضافه کردن تعداد زیادی رکورد (بارگذاری انبوه، مثل داده‌های ساختگی)؛ بازگشت: True در صورت موفقیت"""
+        def _insert(session):
+            for record in records:
+                session.insert(collection, record)
+            return True
+
+        return bool(self.transaction([collection], _insert))
+
+    def increment(self, collection: str, match: Dict[str, Any], field: str, delta: int,
+                  minimum: int = 0) -> Optional[int]:
+        """تغییر یک شمارنده در یک تراکنش مستقل"""
+        return self.transaction([collection],
+                                lambda session: session.increment(collection, match, field, delta, minimum))
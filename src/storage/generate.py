@@ -0,0 +1,300 @@
+"""
+ساخت داده‌های ساختگی در مقیاس دانشگاه (برای آزمون بار و بنچمارک):
+
+    THESIS_DATA_ROOT=/tmp/thesis-10k python -m src.storage.generate --students 10000 --seed 1
+
+همه مجموعه‌ها (کاربران، دروس، درخواست‌ها و آرشیو) با نام‌ها، کلمات کلیدی و چکیده‌های فارسی ساخته
+می‌شوند و از طریق backend فعال (json یا sqlite) نوشته می‌شوند. وضعیت‌ها با گردش کار
+برنامه سازگارند: هر دانشجو حداکثر یک درخواست اخذ دارد، درخواست دفاع فقط سه ماه بعد از تایید اخذ
+ثبت می‌شود، پایان‌نامه‌های مختومه هر دو نمره و نمره نهایی دارند و در آرشیو هم هستند.
+ظرفیت باقی‌مانده دروس و داوران از اخذها و داوری‌های ساخته شده کم شده است و هرگز منفی نیست.
+با seed و --today یکسان خروجی دقیقاً یکسان است. رمز همه کاربران --password است (یک بار هش می‌شود).
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+from src.models import RequestStatus
+from src.services.grading import final_grade, letter_grade
+from src.storage import get_storage, COLLECTIONS
+from src.utils.passwords import hash_password
+
+# تاریخ مرجع پیش‌فرض؛ ثابت است تا خروجی به روز اجرا وابسته نباشد
+DEFAULT_TODAY = "2025-09-01"
+
+# نسبت‌های دانشگاه ساختگی
+STUDENTS_PER_PROFESSOR = 25
+STUDENTS_PER_EXTERNAL_JUDGE = 50
+ENROLLED_RATIO = 0.9  # دانشجویانی که درخواست اخذ داده‌اند
+COURSE_SEATS = (8, 20)  # کل ظرفیت هر درس پایان‌نامه
+JUDGE_CAPACITY = (3, 15)  # کل ظرفیت داوری هر استاد یا داور خارجی
+# وضعیت درخواست اخذ -> احتمال
+ENROLLMENT_STATUSES = ((RequestStatus.APPROVED, 0.7), (RequestStatus.PENDING, 0.15), (RequestStatus.REJECTED, 0.15))
+DEFENSE_RATIO = 0.8  # دانشجویان تایید شده‌ای که درخواست دفاع داده‌اند
+DEFENSE_STATUSES = ((RequestStatus.CLOSED, 0.5), (RequestStatus.APPROVED, 0.25), (RequestStatus.PENDING, 0.15),
+                    (RequestStatus.REJECTED, 0.1))
+
+FIRST_NAMES = ("علی", "محمد", "حسین", "رضا", "مهدی", "امیر", "سعید", "حمید", "مجید", "کاوه", "بهرام", "آرش",
+               "پویا", "سینا", "فاطمه", "زهرا", "مریم", "سارا", "نرگس", "ریحانه", "عطیه", "الهام", "نیلوفر",
+               "شیرین", "مهسا", "پریسا", "لیلا", "سمیرا", "هانیه", "یاسمن", "کیانا", "ترانه")
+LAST_NAMES = ("رضایی", "محمدی", "احمدی", "حسینی", "کریمی", "موسوی", "جعفری", "صادقی", "رحیمی", "نوابی",
+              "امامی", "رضوانی", "قاسمی", "کاظمی", "عباسی", "طاهری", "شریفی", "نوری", "مرادی", "یزدانی",
+              "فرهادی", "اکبری", "بهرامی", "سلیمانی", "زمانی", "توکلی", "خسروی", "میرزایی", "شجاعی", "باقری")
+
+TITLE_ACTIONS = ("بهبود", "تحلیل", "طراحی", "ارزیابی", "پیش‌بینی", "بهینه‌سازی", "شناسایی", "مدل‌سازی")
+SUBJECTS = ("ترافیک شهری", "تصاویر پزشکی", "متن فارسی", "شبکه‌های اجتماعی", "مصرف انرژی", "بازار بورس",
+            "سیگنال‌های مغزی", "زنجیره تامین", "شبکه‌های حسگر", "گفتار فارسی", "کیفیت هوا", "تشخیص نفوذ",
+            "سامانه‌های توصیه‌گر", "رباتیک", "اینترنت اشیا", "محاسبات ابری")
+METHODS = ("یادگیری عمیق", "شبکه عصبی", "الگوریتم ژنتیک", "یادگیری تقویتی", "منطق فازی", "مدل‌های زبانی",
+           "بینایی ماشین", "داده‌کاوی", "یادگیری ماشین", "پردازش موازی", "نظریه گراف", "بهینه‌سازی محدب")
+SENTENCES = ("در این پژوهش روشی جدید برای {subject} ارائه می‌شود.",
+             "رویکرد پیشنهادی بر پایه {method} است و با روش‌های پیشین مقایسه شده است.",
+             "نتایج آزمایش‌ها نشان می‌دهد دقت روش پیشنهادی به طور معناداری افزایش یافته است.",
+             "داده‌های مورد استفاده از منابع عمومی و نمونه‌های بومی گردآوری شده‌اند.",
+             "هزینه محاسباتی روش با استفاده از {method} کاهش یافته است.",
+             "در پایان محدودیت‌ها و پیشنهادهایی برای ادامه کار در حوزه {subject} بیان می‌شود.")
+SEMESTERS = ("نیمسال اول", "نیمسال دوم")
+
+
+def _day(value: date) -> str:
+    return value.strftime("%Y-%m-%d")
+
+
+def _pick(rng: random.Random, weighted: tuple):
+    """انتخاب یک مقدار از ((مقدار، احتمال)، ...)"""
+    threshold = rng.random()
+    for value, probability in weighted:
+        threshold -= probability
+        if threshold < 0:
+            return value
+    return weighted[-1][0]
+
+
+def _grade(rng: random.Random) -> float:
+    """نمره داور با گام 0.25 بین 10 و 20"""
+    return min(20.0, max(10.0, round(rng.gauss(16.5, 2) * 4) / 4))
+
+
+def _available(rng: random.Random, records: List[Dict[str, Any]], field: Optional[str] = None,
+               exclude: str = None) -> Optional[Dict[str, Any]]:
+    """
+    یک رکورد تصادفی که ظرفیت field آن (اگر داده شده باشد) هنوز تمام نشده و شناسه‌اش exclude نیست
+    (استاد راهنما نمی‌تواند داور داخلی باشد). بازگشت: رکورد یا None اگر ظرفیتی نمانده باشد
+    """
+    def usable(record):
+        return (field is None or record[field] > 0) and record.get("user_id") != exclude
+
+    for _ in range(20):
+        candidate = rng.choice(records)
+        if usable(candidate):
+            return candidate
+    # بیشتر رکوردها پر شده‌اند؛ انتخاب از میان باقی‌مانده‌ها
+    remaining = [record for record in records if usable(record)]
+    return rng.choice(remaining) if remaining else None
+
+
+def _user(rng: random.Random, user_id: str, national_id: str, role: str, password: str,
+          title: str = "") -> Dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "national_id": national_id,
+        "name": f"{title}{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "password": password,
+        "role": role
+    }
+
+
+def _thesis_text(rng: random.Random) -> tuple:
+    """(عنوان، چکیده، کلمات کلیدی)"""
+    subject, method = rng.choice(SUBJECTS), rng.choice(METHODS)
+    title = f"{rng.choice(TITLE_ACTIONS)} {subject} با استفاده از {method}"
+    abstract = " ".join(sentence.format(subject=subject, method=method)
+                        for sentence in rng.sample(SENTENCES, rng.randint(2, 4)))
+    keywords = [subject, method] + rng.sample(METHODS, rng.randint(0, 2))
+    return title, abstract, list(dict.fromkeys(keywords))
+
+
+def generate(students: int, seed: int = 1, today: date = None,
+             password: str = "password") -> Dict[str, List[Dict[str, Any]]]:
+    """
+    ساخت همه مجموعه‌ها در حافظه.
+    بازگشت: {نام مجموعه: لیست رکوردها} با همان ترتیب ثبتی که برنامه می‌سازد
+    """
+    rng = random.Random(seed)
+    today = today or datetime.strptime(DEFAULT_TODAY, "%Y-%m-%d").date()
+    password_hash = hash_password(password)
+
+    professors_count = max(2, students // STUDENTS_PER_PROFESSOR)
+    judges_count = max(1, students // STUDENTS_PER_EXTERNAL_JUDGE)
+
+    data: Dict[str, List[Dict[str, Any]]] = {collection: [] for collection in COLLECTIONS}
+    data["students"] = [_user(rng, f"student_{i}", f"0{i:09d}", "student", password_hash)
+                        for i in range(1, students + 1)]
+    data["professors"] = [dict(_user(rng, f"prof_{i}", f"1{i:09d}", "professor", password_hash, "دکتر "),
+                               judge_capacity=rng.randint(*JUDGE_CAPACITY))
+                          for i in range(1, professors_count + 1)]
+    data["external_judges"] = [dict(_user(rng, f"ex_{i}", f"2{i:09d}", "external_judge", password_hash, "دکتر "),
+                                    judge_capacity=rng.randint(*JUDGE_CAPACITY))
+                               for i in range(1, judges_count + 1)]
+
+    # هر استاد یک یا دو درس پایان‌نامه دارد. capacity و judge_capacity مثل برنامه ظرفیت باقی‌مانده‌اند:
+    # از کل ظرفیت شروع می‌شوند و با هر اخذ یا داوری ساخته شده کم می‌شوند، پس هیچ‌وقت منفی نمی‌شوند.
+    for professor in data["professors"]:
+        for _ in range(rng.randint(1, 2)):
+            data["courses"].append({
+                "course_id": f"course_{len(data['courses']) + 1}",
+                "title": "پایان نامه",
+                "professor_id": professor["user_id"],
+                "year": rng.randint(1400, 1404),
+                "semester": rng.choice(SEMESTERS),
+                "capacity": rng.randint(*COURSE_SEATS),
+                "resources": f"منابع {rng.choice(SUBJECTS)}",
+                "sessions_count": 16,
+                "units": rng.choice((4, 6))
+            })
+
+    defenses = []
+    for student in data["students"]:
+        if rng.random() >= ENROLLED_RATIO:
+            continue
+        course = rng.choice(data["courses"])
+        created = today - timedelta(days=rng.randint(30, 900))
+        status = _pick(rng, ENROLLMENT_STATUSES)
+        if status != RequestStatus.REJECTED:
+            # درخواست در انتظار یا تایید شده یک صندلی درس را گرفته است (رد شده آن را برگردانده است)
+            if course["capacity"] <= 0:
+                course = _available(rng, data["courses"], "capacity")
+                if course is None:
+                    continue
+            course["capacity"] -= 1
+        reviewed = _day(min(today, created + timedelta(days=rng.randint(1, 20))))
+        data["enrollment_requests"].append({
+            "student_id": student["user_id"],
+            "course_id": course["course_id"],
+            "professor_id": course["professor_id"],
+            "status": status,
+            "created_at": _day(created),
+            "approved_date": reviewed if status == RequestStatus.APPROVED else "-",
+            "rejected_date": reviewed if status == RequestStatus.REJECTED else "-"
+        })
+
+        # درخواست دفاع حداقل سه ماه بعد از تایید اخذ
+        if status != RequestStatus.APPROVED or rng.random() >= DEFENSE_RATIO:
+            continue
+        submitted = datetime.strptime(reviewed, "%Y-%m-%d").date() + timedelta(days=rng.randint(92, 300))
+        if submitted > today:
+            continue
+        title, abstract, keywords = _thesis_text(rng)
+        base_filename = f"{student['user_id']}.{course['course_id']}"
+        defense = {
+            "student_id": student["user_id"],
+            "professor_id": course["professor_id"],
+            "title": title,
+            "abstract": abstract,
+            "keywords": keywords,
+            "status": _pick(rng, DEFENSE_STATUSES),
+            "submission_date": _day(submitted),
+            "file_path": f"documents/theses/{base_filename}.pdf",
+            "image_path": [f"documents/images/{base_filename}.page1.jpg",
+                           f"documents/images/{base_filename}.page2.jpg"]
+        }
+        defenses.append(defense)
+        if defense["status"] == RequestStatus.PENDING:
+            continue
+        if defense["status"] == RequestStatus.REJECTED:
+            defense["rejected_date"] = _day(min(today, submitted + timedelta(days=rng.randint(1, 10))))
+            continue
+
+        approved = min(today, submitted + timedelta(days=rng.randint(1, 10)))
+        defense_date = approved + timedelta(days=rng.randint(7, 60))
+        if defense["status"] == RequestStatus.CLOSED and defense_date > today:
+            # جلسه هنوز برگزار نشده؛ فقط تایید شده است
+            defense["status"] = RequestStatus.APPROVED
+
+        # جلسه برگزار شده: در دفاع‌های مختومه هر دو نمره، در بقیه گاهی یکی از دو نمره
+        if defense_date > today:
+            graded = ()
+        elif defense["status"] == RequestStatus.CLOSED:
+            graded = ("internal", "external")
+        else:
+            graded = rng.choice(((), (), ("internal",), ("external",)))
+
+        # داوری که هنوز نمره نداده یک واحد از ظرفیتش را گرفته است (نمره‌دهی آن را برمی‌گرداند)
+        internal = _available(rng, data["professors"], None if "internal" in graded else "judge_capacity",
+                              exclude=course["professor_id"])
+        external = _available(rng, data["external_judges"], None if "external" in graded else "judge_capacity")
+        if internal is None or external is None:
+            # ظرفیت داوری نمانده؛ درخواست هنوز زمان‌بندی نشده است
+            defense["status"] = RequestStatus.PENDING
+            continue
+        for role, judge in (("internal", internal), ("external", external)):
+            if role not in graded:
+                judge["judge_capacity"] -= 1
+        defense.update({
+            "approved_date": _day(approved),
+            "defense_date": _day(defense_date),
+            "internal_judge_id": internal["user_id"],
+            "external_judge_id": external["user_id"]
+        })
+
+        for role in graded:
+            defense[f"{role}_grade"] = _grade(rng)
+            defense[f"{role}_grade_date"] = _day(min(today, defense_date + timedelta(days=rng.randint(0, 5))))
+        if defense["status"] == RequestStatus.CLOSED:
+            # بستن پایان‌نامه صندلی درس را برمی‌گرداند
+            course["capacity"] += 1
+            defense["final_grade"] = final_grade(defense["internal_grade"], defense["external_grade"])
+            defense["final_letter_grade"] = letter_grade(defense["final_grade"])
+
+    data["defense_requests"] = sorted(defenses, key=lambda d: d["submission_date"])
+    # آرشیو به ترتیب مختومه شدن (تاریخ آخرین نمره)
+    data["defended_theses"] = sorted(
+        (dict(d) for d in defenses if d["status"] == RequestStatus.CLOSED),
+        key=lambda d: max(d["internal_grade_date"], d["external_grade_date"]))
+    return data
+
+
+def write(data: Dict[str, List[Dict[str, Any]]], force: bool = False) -> bool:
+    """
+    نوشتن مجموعه‌ها با بارگذاری انبوه backend فعال (bulk_insert)، هر مجموعه جداگانه.
+    اگر داده‌ای وجود داشته باشد فقط با force=True جایگزین می‌شود. بازگشت: True در صورت موفقیت
+    """
+    storage = get_storage()
+    if not storage.is_empty():
+        if not force:
+            print("⚠️  مسیر داده خالی نیست؛ برای جایگزینی از --force استفاده کنید "
+                  "(یا با THESIS_DATA_ROOT مسیر دیگری انتخاب کنید).")
+            return False
+        storage.clear()
+
+    return all(storage.bulk_insert(collection, records) for collection, records in data.items())
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.storage.generate",
+                                     description="ساخت داده‌های ساختگی در مسیر THESIS_DATA_ROOT")
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--today", default=DEFAULT_TODAY, help="تاریخ مرجع (YYYY-MM-DD)")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--force", action="store_true", help="جایگزینی داده‌های موجود")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    data = generate(args.students, args.seed, datetime.strptime(args.today, "%Y-%m-%d").date(), args.password)
+    generated = time.perf_counter()
+    if not write(data, args.force):
+        print("❌ داده‌ها نوشته نشدند.")
+        return 1
+
+    for collection, records in data.items():
+        print(f"✅ {collection}: {len(records)} رکورد")
+    print(f"✅ {sum(len(records) for records in data.values())} رکورد در {generated - started:.1f}s ساخته و "
+          f"در {time.perf_counter() - generated:.1f}s با backend {get_storage().name} نوشته شد.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
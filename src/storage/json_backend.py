@@ -0,0 +1,124 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from src.storage.base import COLLECTIONS, StorageBackend, StorageSession, matches
+from src.utils.cache import file_signature
+from src.utils.changelog import is_logged, log_end, read_events
+from src.utils.file_io import get_full_path, read_json, read_json_versioned, write_json
+from src.utils.locking import file_lock
+from src.utils.indexes import find_all, find_positions
+from src.utils.transaction import update_many, recover_transactions
+
+
+class JsonSession(StorageSession):
+    """session روی کپی مجموعه‌هایی که update_many قفل و بارگذاری کرده است"""
+    def __init__(self, collections: Dict[str, List[Dict[str, Any]]]):
+        self._collections = collections
+        # مسیر -> شماره ردیف‌هایی که در همین تراکنش اضافه یا تغییر داده شده‌اند.
+        # ایندکس‌ها وضعیت قبل از تراکنش را نشان می‌دهند، پس این ردیف‌ها جداگانه بررسی می‌شوند.
+        self._dirty: Dict[str, set] = {}
+
+    def _locate(self, path: str, match: Dict[str, Any]) -> Optional[int]:
+        """شماره ردیف اولین رکورد منطبق یا None"""
+        records = self._collections[path]
+        if not match:
+            return 0 if records else None
+
+        # اولین فیلد با ایندکس جستجو و بقیه فیلدها روی نتایج بررسی می‌شوند
+        field, value = next(iter(match.items()))
+        positions = find_positions(path, field, value)
+        dirty = self._dirty.get(path)
+        if dirty:
+            positions = sorted(dirty.union(positions))
+        return next((p for p in positions if p < len(records) and matches(records[p], match)), None)
+
+    def _find(self, collection: str, match: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        path = COLLECTIONS[collection]
+        position = self._locate(path, match)
+        if position is None:
+            return None
+        # ردیفی که برگردانده می‌شود ممکن است تغییر داده شود
+        self._dirty.setdefault(path, set()).add(position)
+        return self._collections[path][position]
+
+    def get(self, collection, match):
+        path = COLLECTIONS[collection]
+        position = self._locate(path, match)
+        return dict(self._collections[path][position]) if position is not None else None
+
+    def insert(self, collection, record):
+        records = self._collections[COLLECTIONS[collection]]
+        records.append(dict(record))
+        self._dirty.setdefault(COLLECTIONS[collection], set()).add(len(records) - 1)
+
+    def update(self, collection, match, changes):
+        record = self._find(collection, match)
+        if not record:
+            return None
+        record.update(changes)
+        return dict(record)
+
+    def increment(self, collection, match, field, delta, minimum=0):
+        record = self._find(collection, match)
+        if not record or record.get(field, 0) + delta < minimum:
+            return None
+        record[field] = record.get(field, 0) + delta
+        return record[field]
+
+
+class JsonBackend(StorageBackend):
+    """
+    ذخیره‌سازی در فایل‌های JSON پوشه data (پیش‌فرض).
+    خواندن‌ها از کش و ایندکس‌های هش file_io انجام می‌شوند و نوشتن‌ها با update_many
+    (قفل فایل و ژورنال) ثبت می‌شوند.
+    """
+    name = "json"
+
+    def all(self, collection):
+        return read_json(COLLECTIONS[collection], copy=False)
+
+    def find_all(self, collection, field, value):
+        return find_all(COLLECTIONS[collection], field, value)
+
+    def version(self, collection):
+        return read_json_versioned(COLLECTIONS[collection])[1]
+
+    def transaction(self, collections: Iterable[str], operation: Callable[[StorageSession], Any]) -> Any:
+        paths = [COLLECTIONS[collection] for collection in collections]
+        return update_many(paths, lambda loaded: operation(JsonSession(loaded)))
+
+    def changes_since(self, collection, token):
+        path = COLLECTIONS[collection]
+        if not is_logged(path):
+            return super().changes_since(collection, token)
+
+        # token: (امضای snapshot، موقعیت خوانده شده در لاگ تغییرات)
+        full_path = get_full_path(path)
+        with file_lock(full_path):
+            records, _ = read_json_versioned(path)
+            snapshot = file_signature(full_path)
+            if token is None or token[0] != snapshot:
+                # snapshot بازنویسی شده (compact یا نوشتن کامل)؛ رویدادهای قبلی دیگر معتبر نیستند
+                return records, None, (snapshot, log_end(full_path))
+
+            events, end = read_events(full_path, token[1])
+            return records, sorted({event["pos"] for event in events}), (snapshot, end)
+
+    def recover(self):
+        return recover_transactions()
+
+    def bulk_insert(self, collection, records):
+        """
+        به جای یک رویداد لاگ تغییرات و ژورنال برای هر رکورد، کل snapshot یک بار به صورت اتمیک نوشته
+        می‌شود (همان کاری که compact بعد از تراکنش می‌کرد)
+        """
+        path = COLLECTIONS[collection]
+        with file_lock(get_full_path(path)):
+            return write_json(path, list(read_json(path, copy=False)) + list(records))
+
+    def is_empty(self) -> bool:
+        """بررسی خالی بودن همه مجموعه‌ها (برای ساخت داده‌های ساختگی)"""
+        return all(len(self.all(collection)) == 0 for collection in COLLECTIONS)
+
+    def clear(self) -> None:
+        """پاک کردن همه رکوردها؛ هر فایل با یک لیست خالی بازنویسی می‌شود (نسخه قبلی در .bak می‌ماند)"""
+        for path in COLLECTIONS.values():
+            write_json(path, [])
@@ -0,0 +1,42 @@
+import sys
+from src.storage.base import COLLECTIONS
+from src.storage.json_backend import JsonBackend
+from src.storage.sqlite_backend import SqliteBackend
+
+
+def migrate(database: str = None, force: bool = False) -> bool:
+    """
+    انتقال یک‌باره همه مجموعه‌های پوشه data به پایگاه داده SQLite.
+    اگر پایگاه داده قبلاً داده داشته باشد فقط با force=True از نو پر می‌شود.
+    بازگشت: True در صورت موفقیت
+    """
+    source = JsonBackend()
+    target = SqliteBackend(database)
+
+    if not target.is_empty():
+        if not force:
+            print(f"⚠️  پایگاه داده {target.database} خالی نیست؛ برای جایگزینی از --force استفاده کنید.")
+            return False
+        target.clear()
+
+    def _copy(session):
+        for collection in COLLECTIONS:
+            for record in source.all(collection):
+                session.insert(collection, record)
+        return True
+
+    if not target.transaction(COLLECTIONS, _copy):
+        print("❌ مهاجرت انجام نشد.")
+        return False
+
+    for collection in COLLECTIONS:
+        print(f"✅ {collection}: {len(target.all(collection))} رکورد")
+    print(f"✅ مهاجرت به {target.database} انجام شد. برای استفاده: THESIS_STORAGE=sqlite")
+    return True
+
+
+if __name__ == "__main__":
+    # python -m src.storage.migrate [--force] [مسیر پایگاه داده]
+    arguments = [argument for argument in sys.argv[1:] if argument != "--force"]
+    ok = migrate(arguments[0] if arguments else None, force="--force" in sys.argv[1:])
+    sys.exit(0 if ok else 1)
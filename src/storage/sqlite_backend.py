@@ -0,0 +1,198 @@
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable
+from src.storage.base import COLLECTIONS, StorageBackend, StorageSession, matches
+from src.utils import codec
+from src.utils.file_io import get_full_path
+from src.utils.indexes import INDEXED_FIELDS
+
+# مسیر پیش‌فرض پایگاه داده (قابل تغییر با متغیر محیطی)
+DEFAULT_DATABASE = "data/thesis.db"
+DATABASE_ENV = "THESIS_SQLITE_PATH"
+
+# حداکثر زمان انتظار برای قفل نوشتن پروسه‌های دیگر (میلی‌ثانیه)
+BUSY_TIMEOUT_MS = 5000
+
+
+def indexed_columns(collection: str) -> tuple:
+    """ستون‌های جداگانه (و ایندکس شده) هر جدول: کلیدهای طبیعی و وضعیت"""
+    return INDEXED_FIELDS.get(COLLECTIONS[collection], ())
+
+
+class SqliteSession(StorageSession):
+    """session روی یک تراکنش BEGIN IMMEDIATE در SQLite"""
+    def __init__(self, backend: "SqliteBackend", connection: sqlite3.Connection):
+        self._backend = backend
+        self._connection = connection
+        self.changed = set()
+
+    def _find(self, collection: str, match: Dict[str, Any]):
+        """برگرداندن (pos، رکورد) اولین ردیف منطبق یا None"""
+        rows = self._backend._select(self._connection, collection, match)
+        return next(((pos, record) for pos, record in rows if matches(record, match)), None)
+
+    def _write(self, collection: str, pos: int, record: Dict[str, Any]) -> None:
+        columns = indexed_columns(collection)
+        assignments = ", ".join(["data = ?"] + [f'"{column}" = ?' for column in columns])
+        self._connection.execute(
+            f'UPDATE "{collection}" SET {assignments} WHERE pos = ?',
+            [codec.dumps(record, compact=True)] + [record.get(column) for column in columns] + [pos],
+        )
+        self.changed.add(collection)
+
+    def get(self, collection, match):
+        found = self._find(collection, match)
+        return dict(found[1]) if found else None
+
+    def insert(self, collection, record):
+        columns = indexed_columns(collection)
+        names = ", ".join(["data"] + [f'"{column}"' for column in columns])
+        placeholders = ", ".join("?" * (len(columns) + 1))
+        self._connection.execute(
+            f'INSERT INTO "{collection}" ({names}) VALUES ({placeholders})',
+            [codec.dumps(record, compact=True)] + [record.get(column) for column in columns],
+        )
+        self.changed.add(collection)
+
+    def update(self, collection, match, changes):
+        found = self._find(collection, match)
+        if not found:
+            return None
+        pos, record = found
+        record.update(changes)
+        self._write(collection, pos, record)
+        return dict(record)
+
+    def increment(self, collection, match, field, delta, minimum=0):
+        found = self._find(collection, match)
+        if not found or found[1].get(field, 0) + delta < minimum:
+            return None
+        pos, record = found
+        record[field] = record.get(field, 0) + delta
+        self._write(collection, pos, record)
+        return record[field]
+
+
+class SqliteBackend(StorageBackend):
+    """
+    ذخیره‌سازی در SQLite (ماژول استاندارد sqlite3) با حالت WAL.
+    هر مجموعه یک جدول است: ستون pos ترتیب ثبت را نگه می‌دارد، کل رکورد در ستون data
+    به صورت JSON ذخیره می‌شود و کلیدهای طبیعی و وضعیت ستون‌های ایندکس شده جداگانه دارند؛
+    پس پیدا کردن یا تغییر یک رکورد (مثلاً یک نمره یا ظرفیت) O(log n) است.
+    """
+    name = "sqlite"
+
+    def __init__(self, database: str = None):
+        self.database = database or os.environ.get(DATABASE_ENV) or get_full_path(DEFAULT_DATABASE)
+        self._local = threading.local()  # هر thread اتصال جداگانه دارد
+        self._all_cache = {}  # collection -> (نسخه، رکوردها)
+        self._create_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.database), exist_ok=True)
+            # isolation_level=None: تراکنش‌ها به صورت صریح با BEGIN شروع می‌شوند
+            connection = sqlite3.connect(self.database, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._local.connection = connection
+        return connection
+
+    def _create_schema(self) -> None:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS _versions (collection TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            for collection in COLLECTIONS:
+                columns = "".join(f', "{column}"' for column in indexed_columns(collection))
+                connection.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{collection}" '
+                    f'(pos INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL{columns})'
+                )
+                for column in indexed_columns(collection):
+                    connection.execute(
+                        f'CREATE INDEX IF NOT EXISTS "{collection}_{column}" ON "{collection}" ("{column}")'
+                    )
+                connection.execute("INSERT OR IGNORE INTO _versions VALUES (?, 0)", (collection,))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _select(self, connection: sqlite3.Connection, collection: str, match: Dict[str, Any]):
+        """ردیف‌های کاندید برای match با استفاده از اولین ستون ایندکس شده؛ بازگشت [(pos، رکورد)]"""
+        column = next((field for field in match if field in indexed_columns(collection)), None)
+        if column is None:
+            cursor = connection.execute(f'SELECT pos, data FROM "{collection}" ORDER BY pos')
+        else:
+            cursor = connection.execute(
+                f'SELECT pos, data FROM "{collection}" WHERE "{column}" = ? ORDER BY pos', (match[column],)
+            )
+        return [(pos, codec.loads(data)) for pos, data in cursor]
+
+    def all(self, collection):
+        version = self.version(collection)
+        cached = self._all_cache.get(collection)
+        if cached is None or cached[0] != version:
+            records = [record for _, record in self._select(self._connection(), collection, {})]
+            cached = self._all_cache[collection] = (version, records)
+        return cached[1]
+
+    def find_all(self, collection, field, value):
+        if field not in indexed_columns(collection):
+            return [record for record in self.all(collection) if record.get(field) == value]
+        return [record for _, record in self._select(self._connection(), collection, {field: value})]
+
+    def version(self, collection):
+        row = self._connection().execute(
+            "SELECT version FROM _versions WHERE collection = ?", (collection,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def transaction(self, collections: Iterable[str], operation: Callable[[StorageSession], Any]) -> Any:
+        connection = self._connection()
+        try:
+            # BEGIN IMMEDIATE قفل نوشتن را از ابتدا می‌گیرد تا خواندن و نوشتن تراکنش سازگار باشند
+            connection.execute("BEGIN IMMEDIATE")
+            session = SqliteSession(self, connection)
+            try:
+                result = operation(session)
+                if result is None or result is False:
+                    connection.execute("ROLLBACK")
+                    return result
+
+                for collection in session.changed:
+                    connection.execute(
+                        "UPDATE _versions SET version = version + 1 WHERE collection = ?", (collection,)
+                    )
+                connection.execute("COMMIT")
+                return result
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except Exception as e:
+            print(f"❌ خطا در ثبت تراکنش روی {', '.join(collections)}: {e}")
+            return None
+
+    def is_empty(self) -> bool:
+        """بررسی خالی بودن همه جدول‌ها (برای مهاجرت)"""
+        connection = self._connection()
+        return all(
+            connection.execute(f'SELECT 1 FROM "{collection}" LIMIT 1').fetchone() is None
+            for collection in COLLECTIONS
+        )
+
+    def clear(self) -> None:
+        """پاک کردن همه رکوردها (برای مهاجرت مجدد)"""
+        def _clear(session):
+            for collection in COLLECTIONS:
+                session._connection.execute(f'DELETE FROM "{collection}"')
+                session.changed.add(collection)
+            return True
+
+        self.transaction(COLLECTIONS, _clear)
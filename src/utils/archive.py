@@ -0,0 +1,205 @@
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Sequence
+from src.utils import codec, io_stats
+
+# مجموعه‌هایی که به صورت آرشیو فقط‌افزودنی ذخیره می‌شوند: هر رکورد یک خط JSON فشرده در فایل
+# داده (JSON Lines) و یک جدول offset با طول ثابت کنار آن (.idx). فایل داده mmap می‌شود و هر
+# رکورد فقط هنگام دسترسی decode می‌شود، پس حافظه مصرفی با بزرگ شدن آرشیو ثابت می‌ماند.
+ARCHIVED_FILES = {
+    "data/theses/defended_theses.jsonl",
+}
+
+# هر ورودی جدول offset: محل شروع رکورد در فایل داده و طول آن (بدون \n)
+ENTRY = struct.Struct("<QI")
+
+
+def is_archived(file_path: str) -> bool:
+    """آیا مجموعه به صورت آرشیو mmap شده ذخیره می‌شود"""
+    return file_path in ARCHIVED_FILES
+
+
+def index_path(full_path: str) -> str:
+    """مسیر جدول offset یک آرشیو (قابل بازسازی از روی فایل داده)"""
+    return os.path.splitext(full_path)[0] + ".idx"
+
+
+def legacy_path(full_path: str) -> str:
+    """مسیر فایل JSON قدیمی همان مجموعه (برای تبدیل یک‌باره)"""
+    return os.path.splitext(full_path)[0] + ".json"
+
+
+def encode_records(records: List[Dict[str, Any]]) -> str:
+    """تبدیل رکوردها به خطوط فایل داده آرشیو"""
+    return "".join(codec.dumps(record, compact=True) + "\n" for record in records)
+
+
+def _map(path: str):
+    """mmap فقط خواندنی یک فایل (فایل خالی یا ناموجود: bytes خالی)"""
+    try:
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return b""
+
+
+def _write_at(path: str, data: bytes, offset: int) -> None:
+    """نوشتن data از موقعیت offset و کوتاه کردن باقی فایل؛ تکرار آن نتیجه یکسانی دارد"""
+    started = time.perf_counter()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        if os.fstat(fd).st_size != offset:
+            os.ftruncate(fd, offset)
+        os.lseek(fd, offset, os.SEEK_SET)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    io_stats.record_write(path, time.perf_counter() - started, len(data))
+
+
+def _line_entries(data, start: int) -> bytes:
+    """ورودی‌های جدول offset برای خطوط کامل data از موقعیت start (خط ناقص انتها نادیده گرفته می‌شود)"""
+    entries = []
+    while True:
+        end = data.find(b"\n", start)
+        if end < 0:
+            return b"".join(entries)
+        entries.append(ENTRY.pack(start, end - start))
+        start = end + 1
+
+
+def sync_index(full_path: str) -> None:
+    """
+    هماهنگ کردن جدول offset با فایل داده (باید زیر قفل آرشیو صدا زده شود).
+    ورودی‌هایی که به بعد از انتهای فایل داده اشاره دارند حذف و خطوط کامل بدون ورودی
+    (مثلاً نبودن .idx یا توقف برنامه بین دو نوشتن) اضافه می‌شوند.
+    """
+    data = _map(full_path)
+    index = _map(index_path(full_path))
+    try:
+        count = len(index) // ENTRY.size
+        while count:
+            offset, length = ENTRY.unpack_from(index, (count - 1) * ENTRY.size)
+            if offset + length < len(data):
+                break
+            count -= 1
+
+        end = 0
+        if count:
+            offset, length = ENTRY.unpack_from(index, (count - 1) * ENTRY.size)
+            end = offset + length + 1
+        missing = _line_entries(data, end)
+        if missing or len(index) != count * ENTRY.size:
+            _write_at(index_path(full_path), missing, count * ENTRY.size)
+    finally:
+        for mapped in (data, index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+
+def append_records(full_path: str, text: str, offset: int, count: int) -> None:
+    """
+    اضافه کردن خطوط text به آرشیو از موقعیت offset (انتهای فایل داده) و ورودی count جدول.
+    ابتدا فایل داده و سپس جدول offset نوشته می‌شود؛ تکرار آن هنگام بازیابی ژورنال بی‌خطر است.
+    """
+    data = text.encode('utf-8')
+    _write_at(full_path, data, offset)
+
+    entries = []
+    start = 0
+    for line in data.split(b"\n")[:-1]:
+        entries.append(ENTRY.pack(offset + start, len(line)))
+        start += len(line) + 1
+    _write_at(index_path(full_path), b"".join(entries), count * ENTRY.size)
+
+
+class RecordArchive(Sequence):
+    """
+    دسترسی فقط خواندنی به رکوردهای یک آرشیو از طریق mmap.
+    هر دسترسی یک دیکشنری تازه decode می‌کند و چیزی در حافظه نگه داشته نمی‌شود.
+    """
+    def __init__(self, full_path: str):
+        self.full_path = full_path
+        self._data = _map(full_path)
+        self._index = _map(index_path(full_path))
+        self._count = len(self._index) // ENTRY.size
+        # ورودی‌هایی که پس از باز شدن فایل داده نوشته شده‌اند دیده نمی‌شوند
+        while self._count and sum(self._entry(self._count - 1)) >= len(self._data):
+            self._count -= 1
+
+    def _entry(self, position: int) -> tuple:
+        return ENTRY.unpack_from(self._index, position * ENTRY.size)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def end(self) -> int:
+        """موقعیت انتهای آخرین رکورد کامل در فایل داده (محل اضافه شدن رکورد بعدی)"""
+        if not self._count:
+            return 0
+        offset, length = self._entry(self._count - 1)
+        return offset + length + 1
+
+    def checksum(self, count: int, start: int = 0, value: int = 0) -> int:
+        """
+        crc32 بایت‌های رکوردهای start تا count در فایل داده، در ادامه crc قبلی value
+        (برای اطمینان از دست‌نخوردن رکوردهایی که ساختار مشتقی از رویشان ساخته شده)
+        """
+        if start >= count:
+            return value
+        begin = self._entry(start)[0]
+        offset, length = self._entry(count - 1)
+        with memoryview(self._data) as view:
+            return zlib.crc32(view[begin:offset + length + 1], value)
+
+    def raw(self, position: int) -> bytes:
+        """بایت‌های کدگذاری شده یک رکورد بدون decode"""
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        offset, length = self._entry(position)
+        return self._data[offset:offset + length]
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._count))]
+        if position < 0:
+            position += self._count
+        return codec.loads(self.raw(position))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(self._count):
+            yield codec.loads(self.raw(position))
+
+
+class AppendBuffer(Sequence):
+    """
+    نمای یک آرشیو داخل تراکنش: رکوردهای موجود از آرشیو خوانده می‌شوند و رکوردهای جدید
+    تا زمان commit در appended نگه داشته می‌شوند.
+    """
+    def __init__(self, archive: Sequence):
+        self.archive = archive
+        self.appended = []
+
+    def __len__(self) -> int:
+        return len(self.archive) + len(self.appended)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if position < len(self.archive):
+            return self.archive[position]
+        return self.appended[position - len(self.archive)]
+
+    def append(self, record: Dict[str, Any]) -> None:
+        self.appended.append(record)
@@ -1,14 +1,16 @@
-import hashlib
 from typing import Optional, Dict, Any
-from src.models.user import Student, Professor, User, external_judge
-from src.utils.file_io import read_json, write_json
+from src.models import User, USER_MODELS
+from src.storage import get_storage
+from src.utils.passwords import hash_password, needs_rehash, submit_verify, get_executor
 
 
-def hash_password(password: str) -> str:
-    """
-    هش کردن رمز عبور با الگوریتم SHA-256
-    """
-    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+def collection_of(role: str) -> str:
+    """نام مجموعه کاربران یک نقش"""
+    if role == "student":
+        return "students"
+    elif role == "professor":
+        return "professors"
+    return "external_judges"
 
 
 def change_password(user: User, old_password: str, new_password: str, confirm_password: str) -> bool:
@@ -17,27 +19,20 @@ def change_password(user: User, old_password: str, new_password: str, confirm_pa
     بازگشت: True در صورت موفقیت، False در صورت شکست
     """
     try:
-        # تعیین مسیر فایل بر اساس نقش کاربر
-        role = user.get_role()
-        file_path = f"data/users/{role}s.json"
-
-        # خواندن داده کاربران از فایل
-        users_data = read_json(file_path)
-
-        if not users_data:
-            print("❌ خطا در خواندن اطلاعات کاربران!")
-            return False
-
-        # پیدا کردن کاربر فعلی در فایل
-        user_data = next((u for u in users_data if u["user_id"] == user.user_id), None)
-
-        if not user_data:
-            print("❌ اطلاعات کاربر یافت نشد!")
-            return False
+        # تعیین مجموعه کاربران بر اساس نقش کاربر
+        collection = collection_of(user.get_role())
+
+        # هش فعلی از همان شیء کاربر (session)؛ فایل کاربران فقط اگر شیء هش نداشته باشد خوانده می‌شود
+        hashed_old_password = user.password
+        if not hashed_old_password:
+            user_data = get_storage().find_one(collection, "user_id", user.user_id)
+            if not user_data:
+                print("❌ اطلاعات کاربر یافت نشد!")
+                return False
+            hashed_old_password = user_data["password"]
 
         # شرط اول: بررسی صحت رمز عبور فعلی
-        hashed_old_password = hash_password(old_password)
-        if user_data["password"] != hashed_old_password:
+        if not submit_verify(old_password, hashed_old_password).result():
             print("❌ رمز عبور فعلی اشتباه است!")
             return False
 
@@ -47,20 +42,20 @@ def change_password(user: User, old_password: str, new_password: str, confirm_pa
             return False
 
         # شرط سوم: هش کردن رمز عبور جدید و ذخیره در فایل
-        hashed_new_password = hash_password(new_password)
-
-        # آپدیت رمز عبور در داده‌های حافظه
-        user_data["password"] = hashed_new_password
-
-        # آپدیت رمز عبور در شیء کاربر فعلی
-        user._password = hashed_new_password
-
-        # ذخیره تغییرات در فایل
-        if write_json(file_path, users_data):
+        hashed_new_password = get_executor().submit(hash_password, new_password).result()
+
+        # ذخیره فقط همین فیلد (یک رویداد در لاگ مجموعه)، به شرط اینکه رمز در این فاصله تغییر نکرده باشد
+        updated = get_storage().update(collection, {"user_id": user.user_id, "password": hashed_old_password},
+                                       {"password": hashed_new_password})
+        if updated:
+            # آپدیت رمز عبور در شیء کاربر فعلی و باطل کردن sessionهای دیگر همین کاربر
+            user.password = hashed_new_password
+            from src.utils.sessions import revoke_user_sessions
+            revoke_user_sessions(user)
             print("✅ رمز عبور با موفقیت تغییر یافت.")
             return True
         else:
-            print("❌ خطا در ذخیره‌سازی تغییرات!")
+            print("❌ رمز عبور در این فاصله تغییر کرده یا ذخیره نشد؛ لطفاً دوباره وارد شوید.")
             return False
 
     except Exception as e:
@@ -73,63 +68,48 @@ def verify_user(user_id: str, password: str, role: str) -> Optional[User]:
     بررسی صحت credentials کاربر و برگرداندن شیء User در صورت موفقیت
     """
     try:
-        # انتخاب فایل مناسب بر اساس نقش کاربر
-        if role == "student":
-            file_path = "data/users/students.json"
-
-        elif role == "professor":
-            file_path = "data/users/professors.json"
-
-        else:
-            file_path = "data/users/external_judges.json"
-
-        # خواندن داده کاربران از فایل
-        users_data = read_json(file_path)
+        # انتخاب مجموعه مناسب بر اساس نقش کاربر
+        collection = collection_of(role)
 
-        # جستجوی کاربر با user_id مشخص
-        user_data = next((u for u in users_data if u["user_id"] == user_id), None)
+        # جستجوی کاربر با user_id مشخص (از طریق ایندکس)
+        user_data = get_storage().find_one(collection, "user_id", user_id)
 
         if user_data:
-            # بررسی تطابق رمز عبور (هش شده)
-            hashed_input_password = hash_password(password)
-            if user_data["password"] == hashed_input_password:
+            # بررسی تطابق رمز عبور (هش شده) در استخر نخ KDF
+            stored_password = user_data["password"]
+            if submit_verify(password, stored_password).result():
+                if needs_rehash(stored_password):
+                    user_data = dict(user_data, password=rehash_password(collection, user_id, password,
+                                                                         stored_password))
                 # ایجاد شیء User مناسب
-                if role == "student":
-                    return Student(
-                        user_data["user_id"],
-                        user_data["national_id"],
-                        user_data["name"],
-                        user_data["password"]
-                    )
-                elif role == "professor":
-                    return Professor(
-                        user_data["user_id"],
-                        user_data["national_id"],
-                        user_data["name"],
-                        user_data["password"]
-                    )
-                else:
-                    return external_judge(
-                        user_data["user_id"],
-                        user_data["national_id"],
-                        user_data["name"],
-                        user_data["password"]
-                    )
+                return USER_MODELS[role].from_dict(user_data)
         return None
     except Exception as e:
         print(f"خطا در بررسی کاربر: {e}")
         return None
 
 
+def rehash_password(collection: str, user_id: str, password: str, stored_password: str) -> str:
+    """
+    ساخت دوباره هش رمز قدیمی (SHA-256 یا پارامترهای کم‌هزینه‌تر) با KDF فعلی، هنگام ورود موفق.
+    بازگشت: هشی که اکنون برای کاربر معتبر است
+    """
+    new_password = get_executor().submit(hash_password, password).result()
+    # فقط اگر رمز در این فاصله تغییر نکرده باشد
+    if get_storage().update(collection, {"user_id": user_id, "password": stored_password},
+                            {"password": new_password}):
+        return new_password
+    return stored_password
+
+
 def find_user_by_id(user_id: str, role: str) -> Optional[Dict[str, Any]]:
     """
     پیدا کردن کاربر بر اساس ID و نقش
     بازگشت: دیکشنری داده کاربر یا None
     """
     try:
-        file_path = "data/users/students.json" if role == "student" else "data/users/professors.json"
-        users_data = read_json(file_path)
-        return next((u for u in users_data if u["user_id"] == user_id), None)
+        collection = "students" if role == "student" else "professors"
+        return get_storage().find_one(collection, "user_id", user_id)
     except Exception as e:
         print(f"خطا در یافتن کاربر: {e}")
         return None
@@ -150,7 +130,7 @@ def get_all_professors() -> list:
     بازگشت: لیستی از دیکشنری‌های اطلاعات اساتید
     """
     try:
-        return read_json("data/users/professors.json")
+        return [dict(p) for p in get_storage().all("professors")]
     except Exception as e:
         print(f"خطا در دریافت لیست اساتید: {e}")
         return []
@@ -162,7 +142,7 @@ def get_all_students() -> list:
     بازگشت: لیستی از دیکشنری‌های اطلاعات دانشجویان
     """
     try:
-        return read_json("data/users/students.json")
+        return [dict(s) for s in get_storage().all("students")]
     except Exception as e:
         print(f"خطا در دریافت لیست دانشجویان: {e}")
         return []
@@ -0,0 +1,88 @@
+import itertools
+import os
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+# تعداد پیش‌فرض فایل‌هایی که به صورت parse شده در حافظه نگه داشته می‌شوند
+DEFAULT_MAX_ENTRIES = int(os.environ.get("THESIS_CACHE_SIZE", "32"))
+
+# شمارنده سراسری نسخه‌ها؛ هر بار که محتوای یک مسیر در کش عوض شود یک عدد جدید می‌گیرد
+_version_counter = itertools.count(1)
+
+
+def file_signature(full_path: str) -> Optional[Tuple[int, int, int]]:
+    """
+    امضای ارزان یک فایل (mtime_ns، اندازه و inode) برای تشخیص تغییر آن.
+    چون نوشتن‌ها با os.replace انجام می‌شوند، هر نوشتن inode تازه‌ای دارد.
+    اگر فایل وجود نداشت None برمی‌گرداند.
+    """
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class JsonCache:
+    """
+    کش LRU برای داده‌های parse شده فایل‌های JSON.
+    هر ورودی همراه با امضای فایل ذخیره می‌شود و در هر دسترسی با یک os.stat اعتبارسنجی می‌شود.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # full_path -> (مسیرهای بررسی شده، signature, data, version)
+
+    def get(self, full_path: str) -> Optional[Tuple[Any, int]]:
+        """
+        برگرداندن (داده، نسخه) در صورتی که فایل از زمان ذخیره تغییر نکرده باشد، وگرنه None
+        """
+        entry = self._entries.get(full_path)
+        if entry is None:
+            return None
+
+        paths, signature, data, version = entry
+        if tuple(file_signature(path) for path in paths) != signature:
+            # فایل توسط برنامه یا پروسه دیگری تغییر کرده است
+            del self._entries[full_path]
+            return None
+
+        self._entries.move_to_end(full_path)
+        return data, version
+
+    def put(self, full_path: str, data: Any, extra_paths: tuple = ()) -> int:
+        """
+        ذخیره داده parse شده یک فایل در کش و برگرداندن نسخه جدید آن.
+        extra_paths فایل‌های دیگری است که داده به آن‌ها هم وابسته است (مثل لاگ تغییرات).
+        """
+        paths = (full_path,) + tuple(extra_paths)
+        signature = tuple(file_signature(path) for path in paths)
+        version = next(_version_counter)
+        if signature[0] is None:
+            return version
+
+        self._entries[full_path] = (paths, signature, data, version)
+        self._entries.move_to_end(full_path)
+
+        # حذف قدیمی‌ترین ورودی‌ها در صورت پر شدن کش
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return version
+
+    def invalidate(self, full_path: str = None) -> None:
+        """حذف یک مسیر (یا در صورت عدم تعیین، کل کش)"""
+        if full_path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(full_path, None)
+
+
+def copy_data(data: Any) -> Any:
+    """
+    کپی سطحی داده برای اینکه تغییرات فراخواننده به کش نشت نکند.
+    هر رکورد (دیکشنری) کپی می‌شود؛ لیست‌های داخلی مثل keywords مشترک می‌مانند.
+    """
+    if isinstance(data, list):
+        return [dict(item) if isinstance(item, dict) else item for item in data]
+    if isinstance(data, dict):
+        return dict(data)
+    return data
@@ -0,0 +1,189 @@
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from src.utils import codec, io_stats
+
+# مجموعه‌هایی که تغییراتشان به جای بازنویسی کل فایل به انتهای یک لاگ JSON Lines اضافه می‌شود.
+# فایل JSON اصلی snapshot فشرده‌شده است و وضعیت فعلی = snapshot + رویدادهای لاگ.
+# فایل‌های کاربران هم لاگ دارند تا تغییر رمز و ظرفیت داوری یک به‌روزرسانی نقطه‌ای باشد.
+LOGGED_FILES = {
+    "data/users/students.json",
+    "data/users/professors.json",
+    "data/users/external_judges.json",
+    "data/requests/enrollment_requests.json",
+    "data/requests/defense_requests.json",
+}
+
+# پسوند فایل لاگ کنار snapshot (مثلاً defense_requests.json.log.jsonl)
+LOG_SUFFIX = ".log.jsonl"
+
+# وقتی لاگ از این اندازه (بایت) بزرگ‌تر شود در snapshot ادغام (compact) می‌شود
+COMPACT_BYTES = int(os.environ.get("THESIS_LOG_COMPACT_BYTES", str(256 * 1024)))
+
+
+def is_logged(file_path: str) -> bool:
+    """آیا تغییرات این مجموعه به صورت لاگ افزایشی ذخیره می‌شود"""
+    return file_path in LOGGED_FILES
+
+
+def log_path(full_path: str) -> str:
+    """مسیر فایل لاگ یک snapshot"""
+    return full_path + LOG_SUFFIX
+
+
+def diff_events(original: List[Dict[str, Any]], updated: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    تبدیل تفاوت دو نسخه یک مجموعه به رویدادهای لاگ.
+    رکوردها فقط به انتها اضافه می‌شوند، پس هر رکورد با شماره ردیفش (pos) شناخته می‌شود:
+    - insert: رکورد جدید در ردیف pos
+    - update: مقدار جدید فیلدهای تغییر کرده (set) و فیلدهای حذف شده (unset)
+    """
+    if len(updated) < len(original):
+        raise ValueError("حذف رکورد در مجموعه‌های دارای لاگ پشتیبانی نمی‌شود")
+
+    at = datetime.now().isoformat(timespec="seconds")
+    events = []
+    for pos, (old, new) in enumerate(zip(original, updated)):
+        if old == new:
+            continue
+        event = {"op": "update", "pos": pos, "at": at,
+                 "set": {key: value for key, value in new.items() if key not in old or old[key] != value}}
+        removed = [key for key in old if key not in new]
+        if removed:
+            event["unset"] = removed
+        events.append(event)
+
+    for pos in range(len(original), len(updated)):
+        events.append({"op": "insert", "pos": pos, "at": at, "record": updated[pos]})
+    return events
+
+
+def encode_events(events: List[Dict[str, Any]]) -> str:
+    """تبدیل رویدادها به متن JSON Lines (هر رویداد یک خط)"""
+    return "".join(codec.dumps(event, compact=True) + "\n" for event in events)
+
+
+def apply_event(records: List[Dict[str, Any]], event: Dict[str, Any]) -> None:
+    """
+    اعمال یک رویداد روی لیست رکوردها.
+    اعمال دوباره رویدادهایی که قبلاً در snapshot آمده‌اند بی‌اثر است (insert با pos تکراری
+    نادیده گرفته می‌شود و update فقط مقدار فیلدها را دوباره تنظیم می‌کند)، پس اگر برنامه
+    بین نوشتن snapshot و خالی کردن لاگ متوقف شود وضعیت خراب نمی‌شود.
+    """
+    pos = event["pos"]
+    if event["op"] == "insert":
+        if pos >= len(records):
+            records.append(dict(event["record"]))
+    elif event["op"] == "update" and pos < len(records):
+        record = records[pos]
+        record.update(event.get("set", {}))
+        for key in event.get("unset", ()):
+            record.pop(key, None)
+
+
+def replay(records: List[Dict[str, Any]], full_path: str) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    بازسازی وضعیت فعلی از snapshot و رویدادهای لاگ.
+    خط ناقص انتهای لاگ (نوشتن نیمه‌تمام) نادیده گرفته می‌شود.
+    بازگشت: (رکوردها، تعداد رویدادهای اعمال شده)
+    """
+    try:
+        with open(log_path(full_path), 'rb') as file:
+            lines = file.readlines()
+    except FileNotFoundError:
+        return records, 0
+    io_stats.record_bytes_read(full_path, sum(map(len, lines)))
+
+    applied = 0
+    for line in lines:
+        if not line.endswith(b"\n"):
+            break
+        try:
+            event = codec.loads(line)
+        except json.JSONDecodeError:
+            break
+        apply_event(records, event)
+        applied += 1
+    return records, applied
+
+
+def read_events(full_path: str, start: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    خواندن رویدادهای لاگ از موقعیت start (برای به‌روزرسانی افزایشی ساختارهای مشتق).
+    بازگشت: (رویدادها، موقعیت انتهای آخرین رویداد کامل)
+    """
+    try:
+        with open(log_path(full_path), 'rb') as file:
+            file.seek(start)
+            lines = file.readlines()
+    except FileNotFoundError:
+        return [], start
+    io_stats.record_bytes_read(full_path, sum(map(len, lines)))
+
+    events = []
+    end = start
+    for line in lines:
+        if not line.endswith(b"\n"):
+            break
+        try:
+            events.append(codec.loads(line))
+        except json.JSONDecodeError:
+            break
+        end += len(line)
+    return events, end
+
+
+def append_to_log(full_path: str, text: str, offset: int) -> None:
+    """
+    نوشتن رویدادها در لاگ از موقعیت offset (اندازه لاگ قبل از تراکنش) و fsync.
+    چون ابتدا تا offset کوتاه می‌شود، تکرار آن هنگام بازیابی ژورنال نتیجه یکسانی دارد.
+    """
+    started = time.perf_counter()
+    fd = os.open(log_path(full_path), os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        os.ftruncate(fd, offset)
+        os.lseek(fd, offset, os.SEEK_SET)
+        data = memoryview(text.encode('utf-8'))
+        size = len(data)
+        while data:
+            data = data[os.write(fd, data):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    io_stats.record_write(full_path, time.perf_counter() - started, size)
+
+
+def log_size(full_path: str) -> int:
+    """اندازه فعلی لاگ (صفر اگر وجود نداشته باشد)"""
+    try:
+        return os.path.getsize(log_path(full_path))
+    except OSError:
+        return 0
+
+
+def log_end(full_path: str) -> int:
+    """
+    موقعیت انتهای آخرین رویداد کامل لاگ (محل نوشتن رویدادهای بعدی).
+    خط ناقص انتهای لاگ که replay نادیده می‌گیرد بازنویسی می‌شود تا رویدادهای بعدی پشت آن گم نشوند.
+    """
+    try:
+        with open(log_path(full_path), 'rb') as file:
+            end = file.seek(0, os.SEEK_END)
+            while end:
+                start = max(end - 4096, 0)
+                file.seek(start)
+                newline = file.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    return start + newline + 1
+                end = start
+    except FileNotFoundError:
+        pass
+    return 0
+
+
+def truncate_log(full_path: str) -> None:
+    """خالی کردن لاگ پس از ادغام آن در snapshot"""
+    if log_size(full_path):
+        append_to_log(full_path, "", 0)
@@ -0,0 +1,59 @@
+import json
+import os
+from typing import Any, Optional, Union
+
+# کتابخانه‌های سریع JSON در صورت نصب بودن استفاده می‌شوند (اختیاری)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# حالت فشرده (بدون تورفتگی) برای پوشه‌های داده عملیاتی؛ فایل‌ها حدوداً نصف می‌شوند
+COMPACT_ENV = "THESIS_JSON_COMPACT"
+COMPACT = os.environ.get(COMPACT_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+# نام کتابخانه‌ای که برای parse استفاده می‌شود
+BACKEND = "orjson" if orjson is not None else "ujson" if ujson is not None else "json"
+
+
+def loads(text: Union[str, bytes]) -> Any:
+    """
+    parse متن JSON با سریع‌ترین کتابخانه موجود.
+    ورودی bytes (UTF-8) ترجیح دارد؛ orjson برای str باید ابتدا آن را دوباره encode کند.
+    خطای parse همیشه به صورت json.JSONDecodeError بالا می‌رود.
+    """
+    if orjson is not None:
+        # orjson.JSONDecodeError زیرکلاس json.JSONDecodeError است
+        return orjson.loads(text)
+    if ujson is not None:
+        try:
+            return ujson.loads(text)
+        except ValueError as e:
+            if isinstance(text, bytes):
+                text = text.decode('utf-8', errors='replace')
+            raise json.JSONDecodeError(str(e), text, 0) from e
+    return json.loads(text)
+
+
+def dumps(data: Any, compact: Optional[bool] = None) -> str:
+    """
+    تبدیل داده به متن JSON (حروف فارسی بدون escape).
+    compact=None یعنی تنظیم سراسری THESIS_JSON_COMPACT.
+    خروجی خوانا (indent=4) همیشه با json استاندارد ساخته می‌شود تا قالب فایل‌های موجود
+    عوض نشود (orjson فقط تورفتگی ۲ را پشتیبانی می‌کند)؛ خروجی فشرده از کتابخانه سریع.
+    """
+    if compact is None:
+        compact = COMPACT
+
+    if not compact:
+        return json.dumps(data, ensure_ascii=False, indent=4)
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    if ujson is not None:
+        return ujson.dumps(data, ensure_ascii=False, escape_forward_slashes=False)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,181 @@
+from array import array
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+from src.models import RequestStatus
+from src.storage import get_storage
+
+# NumPy اختیاری است؛ بدون آن فیلترها با حلقه روی آرایه‌های عددی انجام می‌شوند
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# کد عددی هر وضعیت (صفر: وضعیت ناشناخته)
+STATUS_CODES = {status: code for code, status in enumerate(RequestStatus, start=1)}
+
+# فیلدهای شناسه که در جدول intern به عدد تبدیل می‌شوند (صفر: بدون مقدار)
+ID_COLUMNS = ("student_id", "professor_id", "internal_judge_id", "external_judge_id")
+
+# بیت‌های ستون graded
+INTERNAL_GRADED = 1
+EXTERNAL_GRADED = 2
+
+
+def date_ordinal(value: Any) -> int:
+    """تبدیل تاریخ YYYY-MM-DD به عدد ordinal (صفر برای تاریخ ناموجود یا نامعتبر)"""
+    if not isinstance(value, str):
+        return 0
+    try:
+        return date.fromisoformat(value).toordinal()
+    except ValueError:
+        return 0
+
+
+class DefenseSnapshot:
+    """
+    نمای ستونی درخواست‌های دفاع برای فیلترهای پرتکرار (مثل لیست نمره‌دهی داوران).
+    هر ستون یک array عددی هم‌طول با مجموعه است: شناسه‌ها intern و به عدد تبدیل می‌شوند،
+    وضعیت کد کوچک دارد و تاریخ دفاع ordinal است، پس فیلتر بدون parse تاریخ و بدون
+    دسترسی به دیکشنری‌ها انجام می‌شود (با NumPy به صورت برداری).
+    """
+    def __init__(self):
+        self._codes = {None: 0}  # شناسه -> کد
+        self.columns = {name: array('l') for name in ID_COLUMNS}
+        self.columns["status"] = array('b')
+        self.columns["defense_date"] = array('l')
+        self.columns["graded"] = array('b')
+        self.records: Sequence[Dict[str, Any]] = []
+        self.token = None
+
+    def __len__(self) -> int:
+        return len(self.columns["status"])
+
+    def code_of(self, value: Any) -> Optional[int]:
+        """کد عددی یک شناسه در ستون‌های شناسه (None اگر در هیچ ردیفی نیامده باشد)"""
+        return self._codes.get(value)
+
+    def _code(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._codes)
+        return code
+
+    def _row(self, record: Dict[str, Any]) -> Dict[str, int]:
+        row = {name: self._code(record.get(name)) for name in ID_COLUMNS}
+        row["status"] = STATUS_CODES.get(record.get("status"), 0)
+        row["defense_date"] = date_ordinal(record.get("defense_date"))
+        row["graded"] = ((INTERNAL_GRADED if "internal_grade" in record else 0)
+                         | (EXTERNAL_GRADED if "external_grade" in record else 0))
+        return row
+
+    def _set_row(self, position: int, record: Dict[str, Any]) -> None:
+        for name, value in self._row(record).items():
+            column = self.columns[name]
+            if position < len(column):
+                column[position] = value
+            else:
+                column.append(value)
+
+    def sync(self) -> None:
+        """هماهنگ کردن ستون‌ها با آخرین وضعیت مجموعه (فقط ردیف‌های تغییر کرده)"""
+        self.apply(*get_storage().changes_since("defense_requests", self.token))
+
+    def apply(self, records: Sequence[Dict[str, Any]], positions: Optional[List[int]], token: Any = None) -> None:
+        """اعمال تغییرات ردیف‌های positions (None: ساخت دوباره کامل) و ردیف‌های اضافه شده"""
+        if positions is None or len(records) < len(self):
+            self.__init__()
+            positions = []
+
+        for position in positions:
+            if position < len(self):
+                self._set_row(position, records[position])
+        for position in range(len(self), len(records)):
+            self._set_row(position, records[position])
+
+        self.records = records
+        self.token = token
+
+    def find(self, status: Optional[RequestStatus] = None, judge_id: Optional[str] = None,
+             external_judge_id: Optional[str] = None, due_by: Optional[date] = None,
+             external_graded: Optional[bool] = None, ungraded_by: Optional[str] = None,
+             positions: Optional[Sequence[int]] = None) -> List[int]:
+        """
+        شماره ردیف درخواست‌هایی که همه شرط‌ها را دارند:
+        judge_id داور داخلی یا خارجی، due_by تاریخ دفاع ثبت شده و گذشته تا آن روز،
+        ungraded_by داوری که هنوز نمره خودش را ثبت نکرده است.
+        positions (مرتب) جستجو را به همان ردیف‌ها محدود می‌کند، مثلاً اعضای یک صف کاری.
+        """
+        codes = {}
+        for name, value in (("judge", judge_id), ("external_judge_id", external_judge_id),
+                            ("ungraded_by", ungraded_by)):
+            if value is not None:
+                codes[name] = self._codes.get(value)
+                if codes[name] is None:
+                    return []  # شناسه‌ای که در هیچ ردیفی نیامده
+        status_code = STATUS_CODES.get(status, 0) if status is not None else None
+        due = due_by.toordinal() if due_by is not None else None
+
+        if np is not None:
+            return self._find_numpy(status_code, codes, due, external_graded, positions)
+
+        internal = self.columns["internal_judge_id"]
+        external = self.columns["external_judge_id"]
+        statuses = self.columns["status"]
+        dates = self.columns["defense_date"]
+        graded = self.columns["graded"]
+        return [
+            i for i in (range(len(self)) if positions is None else positions)
+            if (status_code is None or statuses[i] == status_code)
+            and ("judge" not in codes or internal[i] == codes["judge"] or external[i] == codes["judge"])
+            and ("external_judge_id" not in codes or external[i] == codes["external_judge_id"])
+            and (due is None or 0 < dates[i] <= due)
+            and (external_graded is None or bool(graded[i] & EXTERNAL_GRADED) == external_graded)
+            and ("ungraded_by" not in codes
+                 or (internal[i] == codes["ungraded_by"] and not graded[i] & INTERNAL_GRADED)
+                 or (external[i] == codes["ungraded_by"] and not graded[i] & EXTERNAL_GRADED))
+        ]
+
+    def _find_numpy(self, status_code, codes, due, external_graded, positions) -> List[int]:
+        """همان find با ماسک‌های برداری NumPy روی بافر آرایه‌ها (بدون کپی، جز برای زیرمجموعه positions)"""
+        rows = None if positions is None else np.asarray(positions, dtype=np.intp)
+
+        def column(name, dtype):
+            values = np.frombuffer(self.columns[name], dtype=dtype)
+            return values if rows is None else values[rows]
+
+        ids = np.dtype(f"i{array('l').itemsize}")
+        mask = np.ones(len(self) if rows is None else len(rows), dtype=bool)
+        if status_code is not None:
+            mask &= column("status", np.int8) == status_code
+        if "judge" in codes:
+            mask &= ((column("internal_judge_id", ids) == codes["judge"])
+                     | (column("external_judge_id", ids) == codes["judge"]))
+        if "external_judge_id" in codes:
+            mask &= column("external_judge_id", ids) == codes["external_judge_id"]
+        if due is not None:
+            dates = column("defense_date", ids)
+            mask &= (dates > 0) & (dates <= due)
+        if external_graded is not None:
+            mask &= ((column("graded", np.int8) & EXTERNAL_GRADED) != 0) == external_graded
+        if "ungraded_by" in codes:
+            graded = column("graded", np.int8)
+            mask &= (((column("internal_judge_id", ids) == codes["ungraded_by"]) & ((graded & INTERNAL_GRADED) == 0))
+                     | ((column("external_judge_id", ids) == codes["ungraded_by"])
+                        & ((graded & EXTERNAL_GRADED) == 0)))
+        found = np.flatnonzero(mask)
+        return (found if rows is None else rows[found]).tolist()
+
+    def select(self, **conditions) -> List[Dict[str, Any]]:
+        """رکوردهای منطبق با شرط‌های find (فقط برای خواندن)"""
+        return [self.records[position] for position in self.find(**conditions)]
+
+
+_snapshot = DefenseSnapshot()
+
+
+def get_defense_snapshot() -> DefenseSnapshot:
+    """
+    نمای ستونی مشترک درخواست‌های دفاع. صف‌های کاری (src.utils.work_queues) آن را با همان
+    تغییرات changes_since خودشان به‌روز می‌کنند؛ استفاده مستقل نیاز به sync دارد.
+    """
+    return _snapshot
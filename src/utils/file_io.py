@@ -1,77 +1,360 @@
 import json
 import os
+import shutil
+import stat
+import tempfile
+import time
 from typing import Any, Dict, List
+from src.utils import codec, io_stats
+from src.utils.cache import JsonCache, copy_data
+from src.utils.locking import file_lock, bump_version
+from src.utils.changelog import is_logged, log_path, replay, truncate_log
+from src.utils.archive import is_archived, index_path, legacy_path, encode_records, sync_index, RecordArchive
 
 # پیدا کردن مسیر root پروژه
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# پوشه‌ای که data و documents زیر آن قرار دارند؛ با THESIS_DATA_ROOT می‌توان برنامه را روی
+# داده‌های دیگری (مثلاً داده‌های ساختگی src.storage.generate) اجرا کرد
+DATA_ROOT_ENV = "THESIS_DATA_ROOT"
+DATA_ROOT = os.path.abspath(os.environ.get(DATA_ROOT_ENV) or PROJECT_ROOT)
+
+# کش سراسری داده‌های parse شده (مشترک بین همه منوها)
+_cache = JsonCache()
+
 
 def get_full_path(relative_path: str) -> str:
-    """تبدیل مسیر نسبی به مسیر مطلق نسبت به root پروژه"""
-    return os.path.join(PROJECT_ROOT, relative_path)
+    """تبدیل مسیر نسبی به مسیر مطلق نسبت به root داده‌ها (پیش‌فرض root پروژه)"""
+    return os.path.join(DATA_ROOT, relative_path)
 
 
-def read_json(file_path: str) -> List[Dict[str, Any]]:
+def read_json(file_path: str, copy: bool = True) -> List[Dict[str, Any]]:
     """
     خواندن داده از یک فایل JSON و بازگرداندن آن به صورت لیستی از دیکشنری‌ها.
     اگر فایل وجود نداشت، یک لیست خالی برمی‌گرداند.
+    داده parse شده کش می‌شود و تا وقتی فایل تغییر نکرده دوباره خوانده نمی‌شود.
+    copy=False نسخه کش شده را مستقیماً برمی‌گرداند و فقط برای خواندن (بدون تغییر) مناسب است.
     """
     try:
-        full_path = get_full_path(file_path)
+        data, _ = read_json_versioned(file_path)
+        if not copy:
+            return data
+        io_stats.record_copy(get_full_path(file_path))
+        return copy_data(data)
+
+    except Exception as e:
+        print(f"❌ خطای ناشناخته در خواندن فایل {file_path}: {e}")
+        return []
+
+
+def read_json_versioned(file_path: str):
+    """
+    برگرداندن (داده کش شده، نسخه) برای یک فایل.
+    نسخه با هر تغییر فایل عوض می‌شود و برای ساخت ساختارهای مشتق (مثل ایندکس‌ها) به کار می‌رود.
+    داده برگشتی نباید تغییر داده شود.
+    """
+    full_path = get_full_path(file_path)
+    started = time.perf_counter()
+
+    cached = _cache.get(full_path)
+    if cached is not None:
+        io_stats.record_read(full_path, time.perf_counter() - started, hit=True)
+        return cached
+
+    result = _load_versioned(file_path, full_path)
+    io_stats.record_read(full_path, time.perf_counter() - started, hit=False)
+    return result
+
+
+def _load_versioned(file_path: str, full_path: str):
+    """خواندن فایل از دیسک (در صورت نبودن در کش) و قرار دادن آن در کش"""
+    if is_archived(file_path):
+        return _open_archive(file_path, full_path)
+
+    if not is_logged(file_path):
+        data = _load_json(file_path, full_path)
+        return data, _cache.put(full_path, data)
+
+    # snapshot و لاگ تغییرات زیر قفل خوانده می‌شوند تا با compact همزمان ناسازگار نشوند
+    with file_lock(full_path):
+        data, _ = replay(_load_json(file_path, full_path), full_path)
+        return data, _cache.put(full_path, data, _companion_paths(full_path))
+
+
+def _open_archive(file_path: str, full_path: str):
+    """
+    باز کردن آرشیو mmap شده یک مجموعه (تبدیل یک‌باره فایل JSON قدیمی در صورت نیاز).
+    بازگشت: (RecordArchive، نسخه)
+    """
+    with file_lock(full_path):
+        if not os.path.exists(full_path):
+            _import_legacy_archive(file_path, full_path)
+        sync_index(full_path)
+        archive = RecordArchive(full_path)
+        return archive, _cache.put(full_path, archive, _companion_paths(full_path))
+
+
+def _import_legacy_archive(file_path: str, full_path: str) -> None:
+    """تبدیل فایل JSON قدیمی مجموعه به آرشیو؛ فایل قدیمی با پسوند .imported کنار گذاشته می‌شود"""
+    legacy = legacy_path(full_path)
+    # خطای خواندن فایل قدیمی بالا می‌رود تا آرشیو خالی جای داده‌های آن را نگیرد
+    records = _decode_file(legacy) if os.path.exists(legacy) else []
+    _atomic_write(full_path, encode_records(records), keep_backup=False)
+    if os.path.exists(legacy):
+        os.replace(legacy, legacy + ".imported")
+        print(f"✅ {len(records)} رکورد از {os.path.basename(legacy)} به آرشیو {file_path} منتقل شد.")
+
+
+def _relative_path(full_path: str) -> str:
+    return os.path.relpath(full_path, DATA_ROOT).replace(os.sep, "/")
+
+
+def _companion_paths(full_path: str) -> tuple:
+    """فایل‌هایی که داده یک مجموعه علاوه بر خود فایل به آن‌ها وابسته است (لاگ تغییرات یا جدول offset)"""
+    file_path = _relative_path(full_path)
+    if is_logged(file_path):
+        return (log_path(full_path),)
+    if is_archived(file_path):
+        return (index_path(full_path),)
+    return ()
+
+
+# پسوند فایل نسخه سالم قبلی که هنگام هر نوشتن نگه داشته می‌شود
+BACKUP_SUFFIX = ".bak"
+
+# encodingهایی که به ترتیب برای خواندن فایل امتحان می‌شوند.
+# cp1256 و latin-1 هر دو همه بایت‌ها را می‌پذیرند، پس cp1256 (فایل‌های فارسی قدیمی) باید اول باشد.
+ENCODINGS = ['utf-8', 'utf-8-sig', 'cp1256', 'latin-1']
+
+
+# encoding تشخیص داده شده فایل‌های غیر UTF-8: مسیر کامل -> ((mtime_ns، اندازه)، encoding)
+# تا وقتی فایل تغییر نکرده، خواندن بعدی فقط با همان encoding یک بار decode می‌شود
+_encodings: Dict[str, tuple] = {}
+
+# دستور تبدیل یک‌باره فایل‌های قدیمی به UTF-8
+NORMALIZE_COMMAND = "python -m src.utils.normalize_encoding"
+
+
+def _decode_file(full_path: str) -> Any:
+    """
+    خواندن و parse یک فایل JSON با encodingهای مختلف.
+    در صورت خراب بودن JSON خطای json.JSONDecodeError بالا می‌رود.
+    """
+    return detect_and_decode(full_path)[0]
+
+
+def detect_and_decode(full_path: str) -> tuple:
+    """
+    خواندن فایل (یک بار open) و parse آن با اولین encoding مناسب.
+    بازگشت: (داده، encoding)
+    """
+    with open(full_path, 'rb') as file:
+        signature = _signature(os.fstat(file.fileno()))
+        raw = file.read()
+    io_stats.record_bytes_read(full_path, len(raw))
+
+    known = _encodings.get(full_path)
+    if known is not None and known[0] == signature:
+        encodings = [known[1]] + [encoding for encoding in ENCODINGS if encoding != known[1]]
+    else:
+        # فایل تغییر کرده (مثلاً با write_json به UTF-8 بازنویسی شده)؛ ترتیب پیش‌فرض.
+        # latin-1 و cp1256 تقریباً هر بایتی را می‌پذیرند، پس نباید قبل از utf-8 امتحان شوند.
+        _encodings.pop(full_path, None)
+        encodings = ENCODINGS
 
+    decode_error = None
+    for encoding in encodings:
+        try:
+            # متن UTF-8 مستقیماً به صورت bytes به codec داده می‌شود (برای orjson سریع‌تر است)
+            data = codec.loads(raw if encoding == 'utf-8' else raw.decode(encoding))
+        except UnicodeDecodeError:
+            continue
+        except json.JSONDecodeError as e:
+            # مثلاً فایل دارای BOM که با utf-8 ساده خوانده نمی‌شود؛ encoding بعدی را امتحان کن
+            decode_error = decode_error or e
+            continue
+
+        if encoding != 'utf-8' and known is None:
+            print(f"⚠️  فایل {os.path.relpath(full_path, DATA_ROOT)} با encoding {encoding} ذخیره شده است؛ "
+                  f"برای تبدیل یک‌باره به UTF-8: {NORMALIZE_COMMAND}")
+        if encoding != 'utf-8':
+            _encodings[full_path] = (signature, encoding)
+        return data, encoding
+
+    if decode_error is not None:
+        raise decode_error
+    raise UnicodeError(f"no usable encoding for {full_path}")
+
+
+def _signature(stat_result: os.stat_result) -> tuple:
+    """امضای یک نسخه از فایل برای کش encoding"""
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+def _load_json(file_path: str, full_path: str) -> List[Dict[str, Any]]:
+    """خواندن واقعی فایل از دیسک (بدون کش)"""
+    try:
         # اگر فایل وجود ندارد، ایجادش کن
         if not os.path.exists(full_path):
-            # اطمینان از وجود پوشه مقصد
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
-            # ایجاد فایل با محتوای خالی
-            with open(full_path, 'w', encoding='utf-8') as file:
-                json.dump([], file, ensure_ascii=False, indent=4)
+            _atomic_write(full_path, codec.dumps([]))
             return []
 
-        # خواندن فایل با encodingهای مختلف
-        encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1256']
-
-        for encoding in encodings:
-            try:
-                with open(full_path, 'r', encoding=encoding) as file:
-                    data = json.load(file)
-                    # print(f"✅ فایل {file_path} با encoding {encoding} خوانده شد")
-                    return data
-            except UnicodeDecodeError:
-                continue
-            except json.JSONDecodeError:
-                # اگر فایل JSON معتبر نیست، آن را بازنویسی کنیم
-                # print(f"⚠️  فایل {file_path} معتبر نیست، در حال بازنویسی...")
-                with open(full_path, 'w', encoding='utf-8') as file:
-                    json.dump([], file, ensure_ascii=False, indent=4)
-                return []
-
-        # اگر هیچ encodingی کار نکرد
-        print(f"❌ نتوانستیم فایل {file_path} را با encodingهای مختلف بخوانیم")
-        return []
+        try:
+            return _decode_file(full_path)
+        except json.JSONDecodeError:
+            # فایل خراب است؛ به جای پاک کردن داده‌ها از آخرین نسخه سالم بازیابی می‌کنیم
+            return _recover_from_backup(file_path, full_path)
+        except UnicodeError:
+            # اگر هیچ encodingی کار نکرد
+            print(f"❌ نتوانستیم فایل {file_path} را با encodingهای مختلف بخوانیم")
+            return []
 
     except Exception as e:
         print(f"❌ خطای ناشناخته در خواندن فایل {file_path}: {e}")
         return []
 
 
+def _recover_from_backup(file_path: str, full_path: str) -> List[Dict[str, Any]]:
+    """
+    بازیابی یک فایل JSON خراب از نسخه پشتیبان (.bak).
+    اگر نسخه پشتیبان هم قابل استفاده نبود، فایل خراب دست نخورده باقی می‌ماند.
+    """
+    backup_path = full_path + BACKUP_SUFFIX
+    try:
+        data = _decode_file(backup_path)
+    except (OSError, ValueError):
+        print(f"❌ فایل {file_path} معتبر نیست و نسخه پشتیبان سالمی هم ندارد؛ فایل بدون تغییر رها شد.")
+        return []
+
+    print(f"⚠️  فایل {file_path} معتبر نیست؛ از آخرین نسخه سالم بازیابی شد.")
+    # بازگرداندن نسخه سالم بدون از دست دادن فایل خراب (برای بررسی بعدی)
+    os.replace(full_path, full_path + ".corrupt")
+    _atomic_write(full_path, codec.dumps(data), keep_backup=False)
+    return data
+
+
+def _fsync_directory(directory: str) -> None:
+    """ثبت قطعی تغییر نام فایل در پوشه (در سیستم‌عامل‌هایی که پشتیبانی می‌کنند)"""
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _keep_backup(full_path: str) -> None:
+    """نگه داشتن نسخه فعلی فایل به عنوان آخرین نسخه سالم (با hard link در صورت امکان)"""
+    if not os.path.exists(full_path):
+        return
+
+    backup_path = full_path + BACKUP_SUFFIX
+    if os.path.exists(backup_path):
+        os.remove(backup_path)
+    try:
+        os.link(full_path, backup_path)
+    except OSError:
+        shutil.copy2(full_path, backup_path)
+
+
+def _stage_write(full_path: str, text: str) -> str:
+    """
+    نوشتن محتوای جدید در یک فایل موقت کنار فایل اصلی و fsync آن (بدون جایگزینی).
+    بازگشت: مسیر فایل موقت
+    """
+    directory = os.path.dirname(full_path)
+    os.makedirs(directory, exist_ok=True)
+
+    started = time.perf_counter()
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(full_path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+            io_stats.record_write(full_path, time.perf_counter() - started, os.fstat(file.fileno()).st_size)
+
+        # حفظ دسترسی‌های فایل اصلی (mkstemp فایل را با دسترسی 600 می‌سازد)
+        if os.path.exists(full_path):
+            os.chmod(temp_path, stat.S_IMODE(os.stat(full_path).st_mode))
+        else:
+            os.chmod(temp_path, 0o644)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return temp_path
+
+
+def _publish_write(full_path: str, temp_path: str, keep_backup: bool = True) -> None:
+    """جایگزینی فایل اصلی با فایل موقت آماده شده توسط _stage_write"""
+    if keep_backup:
+        _keep_backup(full_path)
+    os.replace(temp_path, full_path)
+
+
+def _atomic_write(full_path: str, text: str, keep_backup: bool = True) -> None:
+    """
+    نوشتن اتمیک: نوشتن در یک فایل موقت کنار فایل اصلی، fsync و سپس os.replace.
+    خواننده‌ها همیشه یا نسخه کامل قبلی را می‌بینند یا نسخه کامل جدید را.
+    """
+    temp_path = _stage_write(full_path, text)
+    try:
+        _publish_write(full_path, temp_path, keep_backup)
+        _fsync_directory(os.path.dirname(full_path))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _record_write(full_path: str, data: Any) -> None:
+    """ثبت یک نوشتن موفق: افزایش شماره نسخه و جایگزینی داده کش (باید زیر قفل صدا زده شود)"""
+    bump_version(full_path)
+    if is_archived(_relative_path(full_path)):
+        # آرشیو همیشه از روی فایل (mmap) خوانده می‌شود، نه از داده در حافظه
+        _cache.invalidate(full_path)
+        return
+    # داده نوشته شده جایگزین نسخه کش می‌شود تا خواندن بعدی نیازی به parse نداشته باشد
+    _cache.put(full_path, copy_data(data), _companion_paths(full_path))
+
+
 def write_json(file_path: str, data: List[Dict[str, Any]]) -> bool:
     """
     نوشتن داده (لیستی از دیکشنری‌ها) به یک فایل JSON.
+    نوشتن به صورت اتمیک انجام می‌شود و نسخه قبلی فایل با پسوند .bak نگه داشته می‌شود.
+    برای مجموعه‌های دارای لاگ تغییرات این کار همان compact است و لاگ خالی می‌شود.
     بازگشت: True در صورت موفقیت، False در صورت خطا
     """
     try:
         full_path = get_full_path(file_path)
-        # اطمینان از وجود پوشه مقصد
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
 
-        with open(full_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, ensure_ascii=False, indent=4)
+        # ابتدا کل داده serialize می‌شود تا خطای احتمالی قبل از دست زدن به فایل رخ دهد
+        text = encode_records(data) if is_archived(file_path) else codec.dumps(data)
+
+        with file_lock(full_path):
+            _atomic_write(full_path, text)
+            if is_logged(file_path):
+                # کل وضعیت در snapshot نوشته شد؛ لاگ تغییرات ادغام (compact) شده است
+                truncate_log(full_path)
+            if is_archived(file_path):
+                # جدول offset از روی فایل داده جدید از نو ساخته می‌شود
+                if os.path.exists(index_path(full_path)):
+                    os.remove(index_path(full_path))
+                sync_index(full_path)
+            _record_write(full_path, data)
         return True
     except Exception as e:
+        _cache.invalidate(get_full_path(file_path))
         print(f"❌ خطا در نوشتن فایل {file_path}: {e}")
         return False
 
+
+def invalidate_cache(file_path: str = None) -> None:
+    """پاک کردن کش یک فایل (یا کل کش) تا خواندن بعدی مستقیماً از دیسک انجام شود"""
+    _cache.invalidate(get_full_path(file_path) if file_path else None)
+
 def get_next_id(existing_data: List[Dict[str, Any]], id_field: str = "id") -> str:
     """
     تولید یک ID منحصر به فرد برای رکورد جدید.
@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
 import re
-from src.utils.file_io import read_json, write_json
+from src.storage import get_storage, key_of, DEFENSE_REQUEST_KEY
+from src.utils.text_index import search_text
+from src.utils import io_stats, profiling
 
 def validate_email(email: str) -> bool:
     """
@@ -66,6 +68,40 @@ def display_menu(menu_title: str, options: list) -> None:
     print(f"{'-' * 50}")
 
 
+def menu_action(role: str, action, *args):
+    """
+    اجرای یک گزینه منو به عنوان یک اقدام با نام "نقش.نام تابع" (مثلاً student.request_defense).
+    شمارنده‌های ورودی/خروجی (src.utils.io_stats) و پروفایل اختیاری (src.utils.profiling) به تفکیک
+    همین اقدام گزارش می‌شوند.
+    """
+    name = f"{role}.{action.__name__}"
+    with profiling.profile(name), io_stats.action(name):
+        return action(*args)
+
+
+def parse_selection(text: str, count: int) -> list:
+    """
+    تبدیل انتخاب کاربر مثل "1,3,5-8" به اندیس‌های (از صفر) یک لیست count عضوی، به ترتیب و بدون تکرار.
+    بازگشت: لیست اندیس‌ها یا [] اگر ورودی نامعتبر باشد
+    """
+    selected = []
+    for part in text.replace("،", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                start, end = (int(value) for value in part.split("-", 1))
+            else:
+                start = end = int(part)
+        except ValueError:
+            return []
+        if not 1 <= start <= end <= count:
+            return []
+        selected.extend(range(start - 1, end))
+    return sorted(set(selected))
+
+
 def get_semester_year(defense_date: str, date_format: str = "%Y-%m-%d") -> str:
     """
     محاسبه سال-نیمسال بر اساس تاریخ دفاع پایان نامه
@@ -85,13 +121,54 @@ def get_semester_year(defense_date: str, date_format: str = "%Y-%m-%d") -> str:
         return f"{year}-{year + 1} (نیمسال اول)"
 
 
+# کش نتیجه تطبیق نام‌ها: (مجموعه کاربران، query) -> (نسخه مجموعه، مجموعه user_idها)
+_name_match_cache = {}
+_NAME_MATCH_CACHE_SIZE = 256
+
+
+def match_user_ids(collection: str, search_query: str) -> frozenset:
+    """
+    پیدا کردن user_id کاربرانی که نامشان شامل search_query است.
+    نتیجه تا زمانی که مجموعه کاربران تغییر نکرده بین جستجوها کش می‌شود.
+    """
+    storage = get_storage()
+    version = storage.version(collection)
+    key = (collection, search_query)
+
+    cached = _name_match_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    user_ids = frozenset(u.user_id for u in storage.models(collection)
+                         if search_query in (u.name or "").lower())
+
+    if len(_name_match_cache) >= _NAME_MATCH_CACHE_SIZE:
+        _name_match_cache.clear()
+    _name_match_cache[key] = (version, user_ids)
+    return user_ids
+
+
+def _theses_by_ids(*conditions: tuple) -> list:
+    """
+    پایان‌نامه‌هایی که فیلد آن‌ها در یکی از مجموعه user_idهای داده شده باشد (با ایندکس).
+    هر شرط یک (field، user_ids) است؛ پایان‌نامه تکراری فقط یک بار برگردانده می‌شود.
+    """
+    storage = get_storage()
+    found = {}
+    for field, user_ids in conditions:
+        for user_id in user_ids:
+            for thesis in storage.find_all("defended_theses", field, user_id):
+                found.setdefault(tuple(key_of(thesis, DEFENSE_REQUEST_KEY).values()), thesis)
+    return list(found.values())
+
+
 def search_theses(search_query: str, search_type: str):
     """
     جستجو در پایان‌نامه‌های مختومه
     """
     try:
         # خواندن پایان‌نامه‌های مختومه
-        theses = read_json("data/theses/defended_theses.json")
+        theses = get_storage().all("defended_theses")
 
         if not theses:
             return []
@@ -99,65 +176,96 @@ def search_theses(search_query: str, search_type: str):
         # نرمالایز کردن query
         search_query = search_query.strip().lower()
 
-        results = []
-
-        for thesis in theses:
-            # جستجو بر اساس نوع
-            if search_type == "title" and search_query in thesis.get("title", "").lower():
-                results.append(thesis)
-
-            elif search_type == "professor":
-                # جستجو بر اساس استاد راهنما
-                prof_id = thesis.get("professor_id", "")
-                professors = read_json("data/users/professors.json")
-                professor = next((p for p in professors if p["user_id"] == prof_id), {})
-                if search_query in professor.get("name", "").lower():
-                    results.append(thesis)
-
-            elif search_type == "keywords":
-                # جستجو در کلمات کلیدی
-                keywords = thesis.get("keywords", [])
-                if any(search_query in keyword.lower() for keyword in keywords):
-                    results.append(thesis)
-
-            elif search_type == "author":
-                # جستجو بر اساس نویسنده (دانشجو)
-                student_id = thesis.get("student_id", "")
-                students = read_json("data/users/students.json")
-                student = next((s for s in students if s["user_id"] == student_id), {})
-                if search_query in student.get("name", "").lower():
-                    results.append(thesis)
-
-            elif search_type == "year":
-                # جستجو بر اساس سال دفاع
-                defense_date = thesis.get("defense_date", "")
-                if defense_date.startswith(search_query):
-                    results.append(thesis)
-
-            elif search_type == "judges":
-                # جستجو بر اساس داوران
-                internal_judge_id = thesis.get("internal_judge_id", "")
-                external_judge_id = thesis.get("external_judge_id", "")
-
-                # خواندن اطلاعات داوران
-                professors = read_json("data/users/professors.json")
-                external_judges = read_json("data/users/external_judges.json")
-
-                # بررسی داور داخلی
-                internal_judge = next((p for p in professors if p["user_id"] == internal_judge_id), {})
-                external_judge = next((j for j in external_judges if j["user_id"] == external_judge_id), {})
-
-                if (search_query in internal_judge.get("name", "").lower() or
-                        search_query in external_judge.get("name", "").lower()):
-                    results.append(thesis)
-
-        return results
+        if search_type == "title":
+            return [t for t in theses if search_query in t.get("title", "").lower()]
+
+        elif search_type == "professor":
+            # جستجو بر اساس استاد راهنما: یک بار تبدیل نام به user_id و سپس فیلتر با ایندکس
+            prof_ids = match_user_ids("professors", search_query)
+            return _theses_by_ids(("professor_id", prof_ids))
+
+        elif search_type == "keywords":
+            # جستجو در کلمات کلیدی
+            return [t for t in theses
+                    if any(search_query in keyword.lower() for keyword in t.get("keywords", []))]
+
+        elif search_type == "author":
+            # جستجو بر اساس نویسنده (دانشجو)
+            student_ids = match_user_ids("students", search_query)
+            return _theses_by_ids(("student_id", student_ids))
+
+        elif search_type == "year":
+            # جستجو بر اساس سال دفاع
+            return [t for t in theses if t.get("defense_date", "").startswith(search_query)]
+
+        elif search_type == "judges":
+            # جستجو بر اساس داوران (داور داخلی از بین اساتید، داور خارجی از بین داوران خارجی)
+            internal_ids = match_user_ids("professors", search_query)
+            external_ids = match_user_ids("external_judges", search_query)
+            return _theses_by_ids(("internal_judge_id", internal_ids), ("external_judge_id", external_ids))
+
+        elif search_type == "fulltext":
+            # جستجوی متنی رتبه‌بندی شده از طریق ایندکس معکوس
+            return search_text(search_query)
+
+        return []
 
     except Exception as e:
         print(f"خطا در جستجو: {e}")
         return []
 
 
+# توابع زیر داخل یک تراکنش (storage.transaction) روی session آن صدا زده می‌شوند
+
+def update_request(session, collection: str, reference: dict, key_fields: tuple, changes: dict,
+                   expected_status: str):
+    """
+    تغییر یک درخواست فقط اگر هنوز در وضعیت expected_status باشد (compare-and-swap روی status).
+    درخواست با key_fields در داده تازه پیدا می‌شود.
+    بازگشت: کپی درخواست به‌روز شده یا None (اگر درخواست پیدا نشد یا وضعیتش عوض شده بود)
+    """
+    match = dict(key_of(reference, key_fields), status=expected_status)
+    return session.update(collection, match, changes)
+
+
+def take_course_seat(session, course_id: str):
+    """
+    کم کردن یک واحد از ظرفیت درس
+    بازگشت: ظرفیت باقی‌مانده یا None اگر درس پیدا نشد یا ظرفیت پر است
+    """
+    return session.increment("courses", {"course_id": course_id}, "capacity", -1)
+
+
+def release_course_seat(session, course_id: str = None, professor_id: str = None):
+    """
+    برگرداندن یک واحد به ظرفیت درس، بر اساس کد درس یا (اولین درس) استاد راهنما
+    بازگشت: درس به‌روز شده یا None اگر درسی پیدا نشد
+    """
+    match = {"course_id": course_id} if course_id is not None else {"professor_id": professor_id}
+    if session.increment("courses", match, "capacity", +1) is None:
+        return None
+    return session.get("courses", match)
+
+
+def change_judge_capacity(session, collection: str, judge_id: str, delta: int):
+    """
+    تغییر ظرفیت داوری یک استاد یا داور خارجی؛ ظرفیت هیچ‌وقت منفی نمی‌شود.
+    بازگشت: ظرفیت جدید یا None اگر تغییری ممکن نبود
+    """
+    return session.increment(collection, {"user_id": judge_id}, "judge_capacity", delta)
+
+
+def close_defense(session, defense: dict):
+    """
+    کارهای بستن یک پایان‌نامه داخل تراکنش نمره‌دهی:
+    برگرداندن ظرفیت درس استاد راهنما و اضافه کردن پایان‌نامه به آرشیو.
+    بازگشت: درس به‌روز شده یا None اگر درسی برای استاد پیدا نشد
+    """
+    course = release_course_seat(session, professor_id=defense["professor_id"])
+    session.insert("defended_theses", defense)
+    return course
+
+
 def open_file(file_path):
     """باز کردن فایل با برنامه پیشفرض سیستم"""
     import os
@@ -0,0 +1,85 @@
+from typing import Any, Dict, List, Optional
+from src.utils.file_io import read_json_versioned
+
+# کلیدهای طبیعی هر مجموعه که معمولاً بر اساس آن‌ها جستجو می‌شود.
+# ایندکس فیلدهای دیگر هم در صورت نیاز به صورت تنبل ساخته می‌شود.
+INDEXED_FIELDS = {
+    "data/users/students.json": ("user_id",),
+    "data/users/professors.json": ("user_id",),
+    "data/users/external_judges.json": ("user_id",),
+    "data/courses/thesis_courses.json": ("course_id", "professor_id"),
+    "data/requests/enrollment_requests.json": ("student_id", "professor_id", "course_id", "status"),
+    "data/requests/defense_requests.json": (
+        "student_id", "professor_id", "internal_judge_id", "external_judge_id", "status"
+    ),
+    "data/theses/defended_theses.jsonl": (
+        "student_id", "professor_id", "internal_judge_id", "external_judge_id"
+    ),
+}
+
+# (file_path, field) -> (نسخه داده، {مقدار: [شماره ردیف‌ها]})
+_indexes = {}
+
+
+def _build_indexes(records: List[Dict[str, Any]], fields: set) -> Dict[str, Dict[Any, List[int]]]:
+    """
+    ساخت ایندکس هش از مقدار هر فیلد به شماره ردیف رکوردها.
+    همه فیلدها در یک بار پیمایش ساخته می‌شوند (در آرشیوها هر دسترسی یعنی یک decode).
+    """
+    indexes = {field: {} for field in fields}
+    for position, record in enumerate(records):
+        for field, index in indexes.items():
+            value = record.get(field)
+            if value is not None:
+                index.setdefault(value, []).append(position)
+    return indexes
+
+
+def find_positions(file_path: str, field: str, value: Any) -> List[int]:
+    """
+    شماره ردیف رکوردهایی از فایل که فیلد field آن‌ها برابر value است (به ترتیب فایل).
+    ایندکس‌ها با تغییر نسخه فایل (هر write_json یا تغییر از بیرون) دوباره ساخته می‌شوند.
+    """
+    records, version = read_json_versioned(file_path)
+
+    cached = _indexes.get((file_path, field))
+    if cached is None or cached[0] != version:
+        # ساخت همه ایندکس‌های کلید طبیعی مجموعه در یک بار
+        stale = {name for name in set(INDEXED_FIELDS.get(file_path, ())) | {field}
+                 if _indexes.get((file_path, name), (None,))[0] != version}
+        for name, index in _build_indexes(records, stale).items():
+            _indexes[(file_path, name)] = (version, index)
+        cached = _indexes[(file_path, field)]
+
+    return cached[1].get(value, [])
+
+
+def find_all(file_path: str, field: str, value: Any, records: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    پیدا کردن همه رکوردهای منطبق با استفاده از ایندکس.
+    اگر records (کپی گرفته شده با read_json) داده شود، رکوردها از همان لیست برگردانده می‌شوند
+    تا تغییر آن‌ها و سپس write_json روی همان لیست درست کار کند.
+    در غیر این صورت رکوردهای کش برگردانده می‌شوند که فقط برای خواندن هستند.
+    """
+    positions = find_positions(file_path, field, value)
+
+    if records is None:
+        records, _ = read_json_versioned(file_path)
+    elif len(records) != len(read_json_versioned(file_path)[0]):
+        # لیست داده شده با فایل هم‌خوان نیست (مثلاً قبلاً به آن اضافه شده)؛ جستجوی خطی
+        return [r for r in records if r.get(field) == value]
+
+    return [records[p] for p in positions]
+
+
+def find_one(file_path: str, field: str, value: Any, records: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+    """پیدا کردن اولین رکورد منطبق یا None"""
+    matches = find_all(file_path, field, value, records)
+    return matches[0] if matches else None
+
+
+def find_last(file_path: str, field: str, value: Any, records: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+    """پیدا کردن آخرین رکورد منطبق (جدیدترین) یا None"""
+    matches = find_all(file_path, field, value, records)
+    return matches[-1] if matches else None
+
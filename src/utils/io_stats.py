@@ -0,0 +1,214 @@
+"""
+شمارنده‌های ورودی/خروجی لایه file_io به تفکیک مسیر: تعداد خواندن‌ها و نسبت برخورد کش، بایت‌های
+خوانده و نوشته شده و هیستوگرام زمان خواندن و نوشتن.
+شمارنده‌ها در محدوده هر اقدام منو (action) جمع می‌شوند تا مشخص شود یک گزینه منو چند بار
+و چه حجمی از کدام فایل‌ها می‌خواند یا می‌نویسد.
+
+    THESIS_IO_STATS=1             گزارش هر اقدام در stderr
+    THESIS_IO_STATS=io.jsonl      افزودن گزارش JSON هر اقدام به فایل
+
+یا معادل آن‌ها: python run.py --io-stats [io.jsonl]؛ در پایان اجرا گزارش کل جلسه هم نوشته می‌شود.
+بدون این تنظیم شمارش خاموش است (هزینه فقط یک شرط در هر فراخوانی).
+"""
+import atexit
+import os
+import sys
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from src.utils import codec
+
+ENV = "THESIS_IO_STATS"
+# مقصد گزارش‌ها: "1"/"stderr" یا مسیر فایل JSON Lines؛ خالی یعنی شمارش خاموش
+_target = ""
+enabled = False
+
+# مرز بالای دسته‌های هیستوگرام زمان (میلی‌ثانیه)؛ دسته آخر بیشتر از آخرین مرز است
+BUCKETS_MS = (0.05, 0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+
+@dataclass(slots=True)
+class PathStats:
+    """شمارنده‌های یک مسیر"""
+    reads: int = 0  # فراخوانی read_json/read_json_versioned
+    cache_hits: int = 0
+    copies: int = 0  # کپی عمیق داده کش شده (read_json با copy=True)
+    bytes_read: int = 0  # بایت‌هایی که واقعاً از دیسک خوانده و decode شده‌اند
+    read_seconds: float = 0.0
+    writes: int = 0  # نوشتن‌های فیزیکی (فایل کامل، لاگ تغییرات یا آرشیو)
+    bytes_written: int = 0  # بایت‌های serialize شده و نوشته شده
+    write_seconds: float = 0.0
+    read_histogram: List[int] = field(default_factory=lambda: [0] * (len(BUCKETS_MS) + 1))
+    write_histogram: List[int] = field(default_factory=lambda: [0] * (len(BUCKETS_MS) + 1))
+
+    def merge(self, other: "PathStats") -> None:
+        for name in ("reads", "cache_hits", "copies", "bytes_read", "read_seconds", "writes", "bytes_written",
+                     "write_seconds"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for mine, theirs in ((self.read_histogram, other.read_histogram),
+                             (self.write_histogram, other.write_histogram)):
+            for i, count in enumerate(theirs):
+                mine[i] += count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "reads": self.reads,
+            "cache_hit_ratio": round(self.cache_hits / self.reads, 3) if self.reads else None,
+            "copies": self.copies,
+            "bytes_read": self.bytes_read,
+            "read_ms": round(self.read_seconds * 1000, 3),
+            "writes": self.writes,
+            "bytes_written": self.bytes_written,
+            "write_ms": round(self.write_seconds * 1000, 3),
+            "read_histogram_ms": _histogram(self.read_histogram),
+            "write_histogram_ms": _histogram(self.write_histogram),
+        }
+
+
+def _histogram(counts: List[int]) -> Dict[str, int]:
+    """{"<=مرز": تعداد} فقط برای دسته‌های غیرخالی"""
+    labels = [f"<={bound}" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+    return {label: count for label, count in zip(labels, counts) if count}
+
+
+# شمارنده‌های اقدام جاری و کل جلسه: مسیر کامل -> PathStats
+_current: Dict[str, PathStats] = {}
+_totals: Dict[str, PathStats] = {}
+
+
+def _stats(full_path: str) -> PathStats:
+    # ژورنال هر تراکنش نام یکتایی دارد؛ همه در یک ردیف جمع می‌شوند
+    if os.path.basename(os.path.dirname(full_path)) == ".journal":
+        full_path = os.path.join(os.path.dirname(full_path), "*")
+    stats = _current.get(full_path)
+    if stats is None:
+        stats = _current[full_path] = PathStats()
+    return stats
+
+
+def record_read(full_path: str, seconds: float, hit: bool) -> None:
+    """ثبت یک خواندن (از کش یا دیسک) و زمان آن"""
+    if not enabled:
+        return
+    stats = _stats(full_path)
+    stats.reads += 1
+    stats.cache_hits += hit
+    stats.read_seconds += seconds
+    stats.read_histogram[bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+
+
+def record_copy(full_path: str) -> None:
+    if enabled:
+        _stats(full_path).copies += 1
+
+
+def record_bytes_read(full_path: str, size: int) -> None:
+    """ثبت بایت‌های خوانده شده از دیسک (snapshot، لاگ تغییرات)"""
+    if enabled:
+        _stats(full_path).bytes_read += size
+
+
+def record_write(full_path: str, seconds: float, size: int) -> None:
+    """ثبت یک نوشتن فیزیکی، حجم و زمان آن"""
+    if not enabled:
+        return
+    stats = _stats(full_path)
+    stats.writes += 1
+    stats.bytes_written += size
+    stats.write_seconds += seconds
+    stats.write_histogram[bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+
+
+def _merge_into_totals() -> None:
+    for path, stats in _current.items():
+        if path in _totals:
+            _totals[path].merge(stats)
+        else:
+            _totals[path] = stats
+    _current.clear()
+
+
+def build_report(name: str, stats: Dict[str, PathStats], seconds: Optional[float] = None) -> Dict[str, Any]:
+    """گزارش قابل تبدیل به JSON؛ مسیرها نسبت به root داده‌ها و به ترتیب زمان صرف شده"""
+    from src.utils.file_io import DATA_ROOT
+
+    ordered = sorted(stats.items(), key=lambda item: item[1].read_seconds + item[1].write_seconds, reverse=True)
+    return {
+        "action": name,
+        "seconds": round(seconds, 6) if seconds is not None else None,
+        "reads": sum(s.reads for s in stats.values()),
+        "writes": sum(s.writes for s in stats.values()),
+        "bytes_read": sum(s.bytes_read for s in stats.values()),
+        "bytes_written": sum(s.bytes_written for s in stats.values()),
+        "paths": {os.path.relpath(path, DATA_ROOT).replace(os.sep, "/"): s.to_dict() for path, s in ordered},
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """جدول متنی گزارش برای چاپ"""
+    seconds = f" در {report['seconds'] * 1000:.1f}ms" if report.get("seconds") is not None else ""
+    lines = [f"📈 ورودی/خروجی «{report['action']}»{seconds}: {report['reads']} خواندن، {report['writes']} نوشتن، "
+             f"{report['bytes_read']} بایت خوانده، {report['bytes_written']} بایت نوشته",
+             f"   {'مسیر':<45} {'خواندن':>7} {'hit':>5} {'کپی':>5} {'ms':>8} {'بایت':>10} "
+             f"{'نوشتن':>6} {'ms':>8} {'بایت':>10}"]
+    for path, s in report["paths"].items():
+        hit = f"{s['cache_hit_ratio']:.0%}" if s["cache_hit_ratio"] is not None else "-"
+        lines.append(f"   {path:<45} {s['reads']:>7} {hit:>5} {s['copies']:>5} {s['read_ms']:>8} "
+                     f"{s['bytes_read']:>10} {s['writes']:>6} {s['write_ms']:>8} {s['bytes_written']:>10}")
+    return "\n".join(lines)
+
+
+def _dump(report: Dict[str, Any]) -> None:
+    if _target.lower() in ("1", "true", "yes", "stderr"):
+        print(format_report(report), file=sys.stderr)
+        return
+    try:
+        with open(_target, "a", encoding="utf-8") as f:
+            f.write(codec.dumps(report, compact=True) + "\n")
+    except OSError as e:
+        print(f"❌ خطا در نوشتن گزارش ورودی/خروجی در {_target}: {e}", file=sys.stderr)
+
+
+@contextmanager
+def action(name: str):
+    """محدوده یک اقدام منو: شمارنده‌های داخل آن جداگانه گزارش و سپس به کل جلسه اضافه می‌شوند"""
+    if not enabled:
+        yield
+        return
+
+    # کارهای بیرون از اقدام‌ها (مثل ورود) فقط در کل جلسه حساب می‌شوند
+    _merge_into_totals()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        report = build_report(name, _current, time.perf_counter() - started)
+        _merge_into_totals()
+        _dump(report)
+
+
+def totals_report() -> Dict[str, Any]:
+    """گزارش کل جلسه (همه اقدام‌ها و کارهای بیرون از آن‌ها)"""
+    _merge_into_totals()
+    return build_report("کل جلسه", _totals)
+
+
+def _dump_totals() -> None:
+    if enabled and (_totals or _current):
+        _dump(totals_report())
+
+
+# گزارش کل جلسه هنگام خروج از برنامه نوشته می‌شود
+atexit.register(_dump_totals)
+
+
+def configure(target: Optional[str]) -> None:
+    """روشن کردن شمارش با مقصد گزارش target ("stderr" یا مسیر فایل)؛ None یا خالی یعنی خاموش"""
+    global _target, enabled
+    _target = (target or "").strip()
+    enabled = bool(_target)
+
+
+configure(os.environ.get(ENV))
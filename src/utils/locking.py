@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # ویندوز
+    fcntl = None
+    import msvcrt
+
+# پسوند فایل قفل کنار هر مجموعه؛ محتوای آن شماره نسخه مجموعه است
+LOCK_SUFFIX = ".lock"
+
+# در ویندوز قفل msvcrt اجباری است، پس بایتی دورتر از محتوای فایل (شماره نسخه) قفل می‌شود
+_WINDOWS_LOCK_OFFSET = 1 << 30
+
+# قفل‌های گرفته شده توسط thread فعلی: full_path -> [fd, تعداد دفعات گرفتن]
+# flock روی هر open جداگانه عمل می‌کند؛ پس گرفتن دوباره در همان thread باید بازگشتی باشد،
+# ولی threadهای مختلف (با fdهای جدا) مثل پروسه‌های جدا همدیگر را منتظر می‌گذارند.
+_local = threading.local()
+
+
+def _held() -> dict:
+    if not hasattr(_local, "held"):
+        _local.held = {}
+    return _local.held
+
+
+def _lock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    else:
+        os.lseek(fd, _WINDOWS_LOCK_OFFSET, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                time.sleep(0.01)
+
+
+def _unlock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, _WINDOWS_LOCK_OFFSET, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def acquire(full_path: str) -> None:
+    """گرفتن قفل انحصاری (advisory) بین پروسه‌ها روی یک فایل داده"""
+    held = _held()
+    entry = held.get(full_path)
+    if entry is not None:
+        entry[1] += 1
+        return
+
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    fd = os.open(full_path + LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _lock_fd(fd)
+    except BaseException:
+        os.close(fd)
+        raise
+    held[full_path] = [fd, 1]
+
+
+def release(full_path: str) -> None:
+    """آزاد کردن قفل گرفته شده با acquire"""
+    held = _held()
+    entry = held[full_path]
+    entry[1] -= 1
+    if entry[1] == 0:
+        del held[full_path]
+        _unlock_fd(entry[0])
+        os.close(entry[0])
+
+
+@contextmanager
+def file_lock(full_path: str):
+    """context manager برای قفل انحصاری یک فایل داده"""
+    acquire(full_path)
+    try:
+        yield
+    finally:
+        release(full_path)
+
+
+def read_version(full_path: str) -> int:
+    """شماره نسخه فعلی یک مجموعه (تعداد نوشتن‌های موفق روی آن)"""
+    try:
+        with open(full_path + LOCK_SUFFIX, 'r', encoding='utf-8') as file:
+            return int(file.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def bump_version(full_path: str) -> int:
+    """افزایش شماره نسخه یک مجموعه؛ باید در حالی که قفل آن گرفته شده صدا زده شود"""
+    version = read_version(full_path) + 1
+    fd = os.open(full_path + LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, str(version).encode('ascii'))
+        os.ftruncate(fd, len(str(version)))
+    finally:
+        os.close(fd)
+    return version
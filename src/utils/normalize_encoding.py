@@ -0,0 +1,56 @@
+import os
+import sys
+from src.storage.base import COLLECTIONS
+from src.utils.archive import is_archived
+from src.utils.file_io import get_full_path, detect_and_decode, invalidate_cache, _atomic_write, _encodings
+from src.utils.locking import file_lock
+
+
+def normalize_file(file_path: str) -> bool:
+    """
+    تبدیل یک فایل داده به UTF-8 (بدون BOM).
+    متن فایل عیناً با encoding جدید نوشته می‌شود؛ قالب‌بندی و لاگ تغییرات دست نمی‌خورند.
+    بازگشت: True اگر فایل تبدیل شد
+    """
+    full_path = get_full_path(file_path)
+    if not os.path.exists(full_path):
+        return False
+
+    with file_lock(full_path):
+        _, encoding = detect_and_decode(full_path)
+        if encoding == 'utf-8':
+            return False
+
+        with open(full_path, 'rb') as file:
+            text = file.read().decode(encoding)
+        # decode با utf-8-sig خودش BOM را حذف می‌کند
+        _atomic_write(full_path, text)
+        # محتوای منطقی تغییری نکرده؛ فقط کش encoding و داده دور ریخته می‌شود
+        _encodings.pop(full_path, None)
+        invalidate_cache(file_path)
+    print(f"✅ {file_path}: {encoding} -> utf-8")
+    return True
+
+
+def normalize_all() -> int:
+    """
+    تبدیل یک‌باره همه فایل‌های داده به UTF-8 تا خواندن‌های بعدی فقط یک بار decode شوند.
+    بازگشت: تعداد فایل‌های تبدیل شده
+    """
+    converted = 0
+    for file_path in COLLECTIONS.values():
+        if is_archived(file_path):
+            # آرشیوها همیشه با UTF-8 نوشته می‌شوند
+            continue
+        try:
+            converted += normalize_file(file_path)
+        except Exception as e:
+            print(f"❌ خطا در تبدیل فایل {file_path}: {e}")
+    print(f"✅ {converted} فایل به UTF-8 تبدیل شد." if converted else "✅ همه فایل‌ها UTF-8 هستند.")
+    return converted
+
+
+if __name__ == "__main__":
+    # python -m src.utils.normalize_encoding
+    normalize_all()
+    sys.exit(0)
@@ -0,0 +1,150 @@
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+# الگوریتم هش رمز: scrypt (پیش‌فرض) یا pbkdf2؛ اگر OpenSSL از scrypt پشتیبانی نکند pbkdf2 استفاده می‌شود
+KDF_ENV = "THESIS_KDF"
+KDF = os.environ.get(KDF_ENV, "scrypt").strip().lower()
+if KDF not in ("scrypt", "pbkdf2") or (KDF == "scrypt" and not hasattr(hashlib, "scrypt")):
+    KDF = "pbkdf2"
+
+# ضریب هزینه: برای scrypt لگاریتم دوی N، برای pbkdf2 تعداد تکرار
+COST_ENV = "THESIS_KDF_COST"
+DEFAULT_COST = {"scrypt": 14, "pbkdf2": 600_000}
+COST = int(os.environ.get(COST_ENV) or DEFAULT_COST[KDF])
+
+# تعداد نخ‌های محاسبه هش؛ همزمانی ورودها (و حافظه scrypt) را محدود می‌کند
+WORKERS_ENV = "THESIS_KDF_WORKERS"
+WORKERS = int(os.environ.get(WORKERS_ENV) or os.cpu_count() or 1)
+
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+# تعداد تطبیق‌های موفق اخیر که دوباره KDF را اجرا نمی‌کنند
+CACHE_SIZE = 1024
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode('ascii').rstrip("=")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: bytes, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+    n = 1 << log_n
+    return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p, dklen=KEY_BYTES,
+                          maxmem=256 * r * n * p + (1 << 20))
+
+
+def hash_password(password: str) -> str:
+    """
+    هش کردن رمز عبور با salt تصادفی و KDF تنظیم شده.
+    خروجی خودتوصیف است (الگوریتم و پارامترها در خود رشته)، مثل:
+    scrypt$14$8$1$<salt>$<key>  یا  pbkdf2_sha256$600000$<salt>$<key>
+    """
+    salt = os.urandom(SALT_BYTES)
+    secret = password.encode('utf-8')
+    if KDF == "scrypt":
+        key = _scrypt(secret, salt, COST, SCRYPT_R, SCRYPT_P)
+        return f"scrypt${COST}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(key)}"
+    key = hashlib.pbkdf2_hmac("sha256", secret, salt, COST, KEY_BYTES)
+    return f"pbkdf2_sha256${COST}${_b64(salt)}${_b64(key)}"
+
+
+def _is_legacy(stored: str) -> bool:
+    """هش قدیمی: SHA-256 بدون salt به صورت hex"""
+    return len(stored) == 64 and "$" not in stored
+
+
+def _derive(password: str, stored: str) -> Optional[bytes]:
+    """محاسبه کلید رمز با پارامترهای هش ذخیره شده (None برای قالب ناشناخته)"""
+    secret = password.encode('utf-8')
+    parts = stored.split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            log_n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            return _scrypt(secret, _unb64(parts[4]), log_n, r, p)
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            return hashlib.pbkdf2_hmac("sha256", secret, _unb64(parts[2]), int(parts[1]), KEY_BYTES)
+    except (ValueError, MemoryError):
+        pass
+    return None
+
+
+# کلید تصادفی همین پردازه برای اثر انگشت رمز در کش (رمز خام نگه داشته نمی‌شود)
+_CACHE_KEY = os.urandom(32)
+_verified: "OrderedDict[tuple, None]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _fingerprint(password: str, stored: str) -> tuple:
+    return stored, hmac.new(_CACHE_KEY, password.encode('utf-8'), hashlib.sha256).digest()
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """
+    بررسی رمز عبور با هش ذخیره شده (قالب جدید یا SHA-256 قدیمی).
+    تطبیق‌های موفق اخیر در کش می‌مانند تا ورود دوباره KDF را تکرار نکند؛
+    کلید کش شامل خود هش است، پس با تغییر رمز خودبه‌خود بی‌اعتبار می‌شود.
+    """
+    if not isinstance(stored, str) or not stored:
+        return False
+    if _is_legacy(stored):
+        return hmac.compare_digest(hashlib.sha256(password.encode('utf-8')).hexdigest(), stored)
+
+    fingerprint = _fingerprint(password, stored)
+    with _cache_lock:
+        if fingerprint in _verified:
+            _verified.move_to_end(fingerprint)
+            return True
+
+    key = _derive(password, stored)
+    if key is None or not hmac.compare_digest(key, _unb64(stored.rsplit("$", 1)[1])):
+        return False
+
+    with _cache_lock:
+        _verified[fingerprint] = None
+        while len(_verified) > CACHE_SIZE:
+            _verified.popitem(last=False)
+    return True
+
+
+def needs_rehash(stored: str) -> bool:
+    """آیا هش با الگوریتم یا پارامترهای فعلی ساخته نشده (و باید هنگام ورود دوباره ساخته شود)"""
+    if not isinstance(stored, str) or _is_legacy(stored):
+        return True
+    parts = stored.split("$")
+    if KDF == "scrypt":
+        return parts[:4] != ["scrypt", str(COST), str(SCRYPT_R), str(SCRYPT_P)]
+    return parts[:2] != ["pbkdf2_sha256", str(COST)]
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    استخر نخ مشترک محاسبه هش.
+    scrypt و pbkdf2 در hashlib هنگام محاسبه GIL را آزاد می‌کنند، پس نخ‌ها واقعاً موازی اجرا
+    می‌شوند و نیازی به استخر پردازه نیست.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="kdf")
+        return _executor
+
+
+def submit_verify(password: str, stored: str) -> Future:
+    """ارسال بررسی رمز به استخر نخ (برای ورودهای همزمان در حالت سرور)"""
+    return get_executor().submit(verify_password, password, stored)
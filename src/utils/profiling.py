@@ -0,0 +1,112 @@
+"""
+پروفایل کردن اختیاری اقدام‌های منو با cProfile و (در صورت نیاز) tracemalloc.
+برای هر اقدام نمونه‌برداری شده یک فایل .pstats و در حالت حافظه یک گزارش متنی از بیشترین
+تخصیص‌های حافظه در پوشه مقصد نوشته می‌شود:
+
+    THESIS_PROFILE=profiles            پوشه خروجی (روشن کردن پروفایل)
+    THESIS_PROFILE_RATE=0.05           نسبت اقدام‌هایی که پروفایل می‌شوند (پیش‌فرض همه)
+    THESIS_PROFILE_MEMORY=1            ثبت تخصیص‌های حافظه با tracemalloc
+
+یا معادل آن‌ها: python run.py --profile profiles --profile-rate 0.05 --profile-memory
+اقدام‌هایی که نمونه‌برداری نمی‌شوند فقط هزینه یک عدد تصادفی دارند، پس با نرخ کم می‌توان
+پروفایل را همیشه روشن گذاشت. خواندن فایل‌ها: python -m pstats <فایل>.pstats
+"""
+import cProfile
+import itertools
+import os
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Optional
+
+ENV = "THESIS_PROFILE"
+RATE_ENV = "THESIS_PROFILE_RATE"
+MEMORY_ENV = "THESIS_PROFILE_MEMORY"
+
+# تعداد خطوط پرتخصیص در گزارش حافظه
+TOP_ALLOCATIONS = 25
+
+directory: Optional[str] = None
+rate = 1.0
+memory = False
+
+# شماره ترتیبی برای یکتا ماندن نام فایل‌ها در یک ثانیه
+_sequence = itertools.count(1)
+_active = False
+
+
+def configure(output_dir: Optional[str], sample_rate: float = 1.0, trace_memory: bool = False) -> None:
+    """تنظیم پوشه خروجی (None یعنی خاموش)، نرخ نمونه‌برداری بین 0 و 1 و ثبت حافظه"""
+    global directory, rate, memory
+    directory = output_dir or None
+    rate = min(max(sample_rate, 0.0), 1.0)
+    memory = trace_memory
+
+
+def _configure_from_env() -> None:
+    try:
+        sample_rate = float(os.environ.get(RATE_ENV, "1"))
+    except ValueError:
+        print(f"⚠️  مقدار {RATE_ENV} نامعتبر است؛ همه اقدام‌ها پروفایل می‌شوند.", file=sys.stderr)
+        sample_rate = 1.0
+    configure(os.environ.get(ENV, "").strip(), sample_rate,
+              os.environ.get(MEMORY_ENV, "").strip().lower() in ("1", "true", "yes"))
+
+
+_configure_from_env()
+
+
+def _output_path(name: str, suffix: str, stamp: str) -> str:
+    return os.path.join(directory, f"{stamp}-{name}{suffix}")
+
+
+def _write_allocations(path: str, name: str, snapshot: tracemalloc.Snapshot, peak: int) -> None:
+    # تخصیص‌های خود tracemalloc و این ماژول در گزارش نمی‌آیند
+    snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),
+                                       tracemalloc.Filter(False, __file__)))
+    statistics = snapshot.statistics("lineno")
+    lines = [f"# {name}: {sum(stat.size for stat in statistics)} bytes still allocated, peak {peak} bytes",
+             f"# top {TOP_ALLOCATIONS} allocation sites (size, count, location)"]
+    for stat in statistics[:TOP_ALLOCATIONS]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size:>12} {stat.count:>8}  {frame.filename}:{frame.lineno}")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+@contextmanager
+def profile(name: str):
+    """پروفایل کردن یک اقدام (در صورت روشن بودن و انتخاب شدن در نمونه‌برداری)"""
+    global _active
+    # پروفایل‌های تو در تو پشتیبانی نمی‌شوند؛ اقدام بیرونی کل زمان را پوشش می‌دهد
+    if directory is None or _active or random.random() >= rate:
+        yield
+        return
+
+    tracing = memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    _active = True
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _active = False
+        snapshot = peak = None
+        if tracing:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_sequence)}"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            profiler.dump_stats(_output_path(name, ".pstats", stamp))
+            if snapshot is not None:
+                _write_allocations(_output_path(name, ".alloc.txt", stamp), name, snapshot, peak)
+        except OSError as e:
+            print(f"❌ خطا در ذخیره پروفایل {name} در {directory}: {e}", file=sys.stderr)
@@ -0,0 +1,155 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from src.models import User, USER_MODELS
+from src.storage import get_storage
+from src.utils import codec
+from src.utils.auth import verify_user, collection_of
+from src.utils.passwords import submit_verify
+
+# کلید امضای توکن‌ها؛ اگر تنظیم نشود برای هر پردازه تصادفی ساخته می‌شود
+# (برای پذیرفتن توکن در چند پردازه باید کلید مشترک تنظیم شود)
+SECRET_ENV = "THESIS_SESSION_SECRET"
+_SECRET = os.environ.get(SECRET_ENV, "").encode('utf-8') or os.urandom(32)
+
+# مدت اعتبار هر session (ثانیه)
+TTL_ENV = "THESIS_SESSION_TTL"
+TTL = int(os.environ.get(TTL_ENV) or 3600)
+
+# session فعال -> (شیء کاربر، زمان انقضا)
+_sessions: Dict[str, Tuple[User, float]] = {}
+# (نقش، شناسه کاربر) -> (شیء کاربر، زمان انقضا)؛ ورود دوباره همان کاربر شیء کاربر را دوباره نمی‌سازد.
+# تا وقتی کاربر session فعالی دارد نگه داشته می‌شود.
+_users: Dict[Tuple[str, str], Tuple[User, float]] = {}
+# sessionهای پایان یافته یا باطل شده -> زمان انقضا؛ تا انقضای توکن دوباره از ذخیره‌سازی بارگذاری نمی‌شوند
+_ended: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip("=")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64(hmac.new(_SECRET, payload.encode('ascii'), hashlib.sha256).digest())
+
+
+def _decode_token(token: str) -> Optional[dict]:
+    """بررسی امضا و انقضای توکن (None برای توکن نامعتبر یا منقضی)"""
+    try:
+        payload, signature = token.split(".")
+        if not hmac.compare_digest(_sign(payload), signature):
+            return None
+        claims = codec.loads(_unb64(payload))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if not isinstance(claims, dict) or claims.get("exp", 0) < time.time():
+        return None
+    return claims
+
+
+def _purge_expired() -> None:
+    """حذف sessionهای منقضی شده (با قفل _lock فراخوانی می‌شود)"""
+    now = time.time()
+    for table in (_sessions, _users):
+        for key in [key for key, (_, expires) in table.items() if expires < now]:
+            del table[key]
+    for sid in [sid for sid, expires in _ended.items() if expires < now]:
+        del _ended[sid]
+
+
+def create_session(user: User, ttl: Optional[int] = None) -> str:
+    """
+    ساخت session برای کاربر وارد شده.
+    بازگشت: توکن امضا شده (شناسه session، نقش، شناسه کاربر و زمان انقضا)
+    """
+    expires = int(time.time()) + (ttl or TTL)
+    claims = {"sid": secrets.token_urlsafe(16), "role": user.get_role(), "uid": user.user_id, "exp": expires}
+    payload = _b64(codec.dumps(claims, compact=True).encode('utf-8'))
+    with _lock:
+        _purge_expired()
+        _sessions[claims["sid"]] = (user, expires)
+        _users[(claims["role"], user.user_id)] = (user, expires)
+    return f"{payload}.{_sign(payload)}"
+
+
+def get_session_user(token: str) -> Optional[User]:
+    """
+    شیء کاربر یک session معتبر، بدون خواندن فایل کاربران.
+    توکنی که امضای درست دارد ولی در این پردازه ساخته نشده (کلید مشترک) یک بار از ذخیره‌سازی بارگذاری می‌شود.
+    """
+    claims = _decode_token(token)
+    if claims is None:
+        return None
+    with _lock:
+        entry = _sessions.get(claims["sid"])
+        if claims["sid"] in _ended:
+            return None
+    if entry is not None:
+        return entry[0]
+
+    user_data = get_storage().find_one(collection_of(claims["role"]), "user_id", claims["uid"])
+    if not user_data or claims["role"] not in USER_MODELS:
+        return None
+    user = USER_MODELS[claims["role"]].from_dict(user_data)
+    with _lock:
+        _sessions[claims["sid"]] = (user, claims["exp"])
+    return user
+
+
+def end_session(token: str) -> None:
+    """پایان session (خروج از حساب کاربری)"""
+    claims = _decode_token(token)
+    if claims is not None:
+        with _lock:
+            _sessions.pop(claims["sid"], None)
+            _ended[claims["sid"]] = claims["exp"]
+            # با پایان آخرین session کاربر، شیء کش شده او هم کنار گذاشته می‌شود
+            if not any(other.user_id == claims["uid"] and other.get_role() == claims["role"]
+                       for other, _ in _sessions.values()):
+                _users.pop((claims["role"], claims["uid"]), None)
+
+
+def authenticate(user_id: str, password: str, role: str) -> Optional[str]:
+    """
+    ورود کاربر و ساخت session.
+    رمز همیشه با هش ذخیره شده بررسی می‌شود (ممکن است در پردازه دیگری یا مستقیماً در فایل تغییر کرده باشد)؛
+    اگر همین کاربر در این پردازه session معتبری با همان هش داشته باشد شیء کاربر او دوباره ساخته نمی‌شود.
+    بازگشت: توکن session یا None در صورت اشتباه بودن اطلاعات ورود
+    """
+    with _lock:
+        user, expires = _users.get((role, user_id), (None, 0))
+    if user is not None and expires >= time.time():
+        stored = get_storage().find_one(collection_of(role), "user_id", user_id)
+        if stored and stored.get("password") == user.password:
+            if submit_verify(password, user.password).result():
+                return create_session(user)
+            return None
+
+    user = verify_user(user_id, password, role)
+    return create_session(user) if user else None
+
+
+def revoke_user_sessions(user: User) -> int:
+    """
+    باطل کردن sessionهای دیگر یک کاربر (مثلاً بعد از تغییر رمز)؛ sessionهایی که همین شیء را دارند می‌مانند.
+    بازگشت: تعداد sessionهای باطل شده
+    """
+    role = user.get_role()
+    with _lock:
+        stale = [sid for sid, (other, _) in _sessions.items()
+                 if other is not user and other.user_id == user.user_id and other.get_role() == role]
+        for sid in stale:
+            _ended[sid] = _sessions.pop(sid)[1]
+        if (role, user.user_id) in _users:
+            _users[(role, user.user_id)] = (user, _users[(role, user.user_id)][1])
+    return len(stale)
@@ -0,0 +1,310 @@
+"""
+جستجوی متن کامل رتبه‌بندی شده (BM25) در آرشیو پایان‌نامه‌های مختومه.
+ایندکس معکوس در حافظه نگه داشته می‌شود و روی دیسک یک فایل فقط‌افزودنی JSON Lines است که هر خط آن
+کلمات یک سند (به ترتیب آرشیو) را دارد؛ اضافه شدن یک پایان‌نامه فقط یک خط به انتهای آن اضافه می‌کند.
+کنار آن وضعیت آرشیوی که ایندکس از روی آن ساخته شده (امضای فایل و آخرین رکورد) ذخیره می‌شود تا
+بازنویسی آرشیو (حتی با همان تعداد رکورد) به بازسازی ایندکس برسد.
+"""
+import heapq
+import json
+import math
+import os
+import re
+import zlib
+from bisect import bisect_left
+from typing import Any, Dict, List, Tuple
+from src.storage import get_storage, COLLECTIONS
+from src.utils import codec
+from src.utils.archive import _write_at, RecordArchive
+from src.utils.cache import file_signature
+from src.utils.file_io import BACKUP_SUFFIX, get_full_path, _atomic_write
+from src.utils.locking import file_lock
+
+# ایندکس معکوس کنار خود آرشیو ذخیره می‌شود: هر خط {"length": طول وزن‌دار، "terms": {کلمه: وزن}}
+INDEX_FILE = "data/theses/defended_theses.index.jsonl"
+# وضعیت آرشیو در زمان آخرین به‌روزرسانی ایندکس: {"source": امضا، "docs": تعداد سندها، "crc": checksum رکوردها}
+INDEX_STATE_FILE = "data/theses/defended_theses.index.state.json"
+# قالب قبلی (کل ایندکس در یک فایل JSON که با هر پایان‌نامه بازنویسی می‌شد)
+LEGACY_INDEX_FILE = "data/theses/defended_theses.index.json"
+
+# وزن هر بخش از پایان‌نامه در امتیاز
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "keywords": 2.0,
+    "abstract": 1.0,
+    "names": 1.0,
+}
+
+# پارامترهای BM25
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# حداقل طول یک کلمه برای گسترش پیشوندی در جستجو و حداکثر تعداد کلمات گسترش یافته
+PREFIX_MIN_LENGTH = 3
+PREFIX_MAX_TERMS = 32
+
+# یکسان‌سازی حروف عربی/فارسی و ارقام
+_CHAR_MAP = str.maketrans({
+    "\u064a": "\u06cc",  # ي -> ی
+    "\u0649": "\u06cc",  # ى -> ی
+    "\u0643": "\u06a9",  # ك -> ک
+    "\u0629": "\u0647",  # ة -> ه
+    "\u06c0": "\u0647",  # ۀ -> ه
+    "\u0623": "\u0627",  # أ -> ا
+    "\u0625": "\u0627",  # إ -> ا
+    "\u0622": "\u0627",  # آ -> ا
+    "\u0624": "\u0648",  # ؤ -> و
+    "\u200c": "",  # نیم‌فاصله (ZWNJ)
+    "\u0640": "",  # کشیده (تطویل)
+    **{chr(0x06F0 + i): str(i) for i in range(10)},  # ارقام فارسی
+    **{chr(0x0660 + i): str(i) for i in range(10)},  # ارقام عربی
+})
+# اعراب و تنوین
+_DIACRITICS = re.compile("[\u064b-\u065f\u0670]")
+_TOKEN = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """یکسان‌سازی متن فارسی برای ایندکس و جستجو (ی/ک عربی، نیم‌فاصله، اعراب، ارقام)"""
+    return _DIACRITICS.sub("", str(text).translate(_CHAR_MAP)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """تبدیل متن به لیست کلمات نرمال‌شده"""
+    return _TOKEN.findall(normalize_text(text))
+
+
+def _user_name(collection: str, user_id: str) -> str:
+    user = get_storage().find_one(collection, "user_id", user_id) if user_id else None
+    return user.get("name", "") if user else ""
+
+
+def thesis_fields(thesis: Dict[str, Any]) -> Dict[str, str]:
+    """استخراج متن بخش‌های قابل جستجوی یک پایان‌نامه"""
+    names = [
+        _user_name("students", thesis.get("student_id", "")),
+        _user_name("professors", thesis.get("professor_id", "")),
+        _user_name("professors", thesis.get("internal_judge_id", "")),
+        _user_name("external_judges", thesis.get("external_judge_id", "")),
+    ]
+    return {
+        "title": thesis.get("title", ""),
+        "keywords": " ".join(thesis.get("keywords", [])),
+        "abstract": thesis.get("abstract", ""),
+        "names": " ".join(names),
+    }
+
+
+class ThesisTextIndex:
+    """
+    ایندکس معکوس روی آرشیو پایان‌نامه‌های مختومه با رتبه‌بندی BM25.
+    شناسه هر سند همان شماره ردیف آن در آرشیو (به ترتیب ثبت) است؛ چون آرشیو فقط
+    به انتهایش اضافه می‌شود، ایندکس هم به صورت افزایشی به‌روز می‌شود.
+    """
+    def __init__(self):
+        self.doc_lengths = []  # طول وزن‌دار هر سند
+        self.total_length = 0.0
+        self.postings = {}  # term -> [[doc, weighted_tf], ...]
+        self._sorted_terms = None
+        self._norms = None  # مخرج BM25 برای هر سند (وابسته به طول سند)
+
+    @property
+    def doc_count(self) -> int:
+        return len(self.doc_lengths)
+
+    def add_entry(self, entry: Dict[str, Any]) -> int:
+        """اضافه کردن یک سند از روی خط ذخیره شده آن و برگرداندن شماره سند"""
+        doc = self.doc_count
+        for term, frequency in entry["terms"].items():
+            self.postings.setdefault(term, []).append([doc, frequency])
+
+        self.doc_lengths.append(entry["length"])
+        self.total_length += entry["length"]
+        self._sorted_terms = None
+        self._norms = None
+        return doc
+
+    def add(self, thesis: Dict[str, Any]) -> Dict[str, Any]:
+        """اضافه کردن یک پایان‌نامه به انتهای ایندکس؛ بازگشت: خط قابل ذخیره آن"""
+        frequencies = {}
+        for field, text in thesis_fields(thesis).items():
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+
+        entry = {"length": sum(frequencies.values()), "terms": frequencies}
+        self.add_entry(entry)
+        return entry
+
+    def _expand(self, token: str) -> List[str]:
+        """کلمات ایندکس که با token شروع می‌شوند (برای پوشش پسوندهای فارسی)"""
+        if len(token) < PREFIX_MIN_LENGTH:
+            return [token] if token in self.postings else []
+
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+
+        terms = []
+        i = bisect_left(self._sorted_terms, token)
+        while (i < len(self._sorted_terms) and len(terms) < PREFIX_MAX_TERMS
+               and self._sorted_terms[i].startswith(token)):
+            terms.append(self._sorted_terms[i])
+            i += 1
+        return terms
+
+    def _doc_norms(self) -> List[float]:
+        """محاسبه (و کش) بخش وابسته به طول سند در فرمول BM25"""
+        if self._norms is None:
+            average_length = self.total_length / self.doc_count or 1.0
+            self._norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                           for length in self.doc_lengths]
+        return self._norms
+
+    def search(self, query: str, limit: int = 50) -> List[Tuple[int, float]]:
+        """
+        جستجوی رتبه‌بندی شده؛ خروجی لیستی از (شماره سند، امتیاز) به ترتیب نزولی امتیاز
+        """
+        if not self.doc_count:
+            return []
+
+        norms = self._doc_norms()
+        scores = {}
+
+        for token in set(tokenize(query)):
+            for term in self._expand(token):
+                posting = self.postings[term]
+                idf = math.log(1 + (self.doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+                boost = idf * (BM25_K1 + 1)
+                for doc, frequency in posting:
+                    scores[doc] = scores.get(doc, 0.0) + boost * frequency / (frequency + norms[doc])
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+
+# ایندکس بارگذاری شده در حافظه: (inode فایل ایندکس، موقعیت خوانده شده در آن، شیء ایندکس)
+_loaded = (None, 0, None)
+
+
+def _read_entries(index: ThesisTextIndex, full_path: str, offset: int) -> int:
+    """
+    اضافه کردن خطوط کامل فایل ایندکس از موقعیت offset به index.
+    خط ناقص انتهای فایل (نوشتن نیمه‌تمام) نادیده گرفته می‌شود. بازگشت: موقعیت انتهای آخرین خط کامل
+    """
+    with open(full_path, 'rb') as file:
+        file.seek(offset)
+        lines = file.readlines()
+
+    for line in lines:
+        if not line.endswith(b"\n"):
+            break
+        try:
+            index.add_entry(codec.loads(line))
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+            break
+        offset += len(line)
+    return offset
+
+
+def _encode(entries: List[Dict[str, Any]]) -> str:
+    return "".join(codec.dumps(entry, compact=True) + "\n" for entry in entries)
+
+
+def _source_signature() -> list:
+    """امضای ارزان منبع ایندکس: نسخه مجموعه و (mtime_ns، اندازه، inode) فایل آرشیو"""
+    signature = file_signature(get_full_path(COLLECTIONS["defended_theses"]))
+    return [get_storage().version("defended_theses")] + list(signature or (None, None, None))
+
+
+def _checksum(theses, count: int, start: int = 0, value: int = 0) -> int:
+    """
+    checksum رکوردهای ایندکس شده: crc32 بایت‌های count رکورد اول آرشیو (افزایشی از start با crc قبلی
+    value). برای backendهای دیگر که فایل آرشیو ندارند فقط آخرین رکورد بررسی می‌شود.
+    """
+    if isinstance(theses, RecordArchive):
+        return theses.checksum(count, start, value)
+    return zlib.crc32(codec.dumps(theses[count - 1], compact=True).encode('utf-8')) if count else 0
+
+
+def _read_state(full_path: str) -> Dict[str, Any]:
+    try:
+        with open(full_path, 'rb') as file:
+            state = codec.loads(file.read())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def _appended_only(state: Dict[str, Any], signature: list, theses, docs: int) -> bool:
+    """
+    آیا آرشیو از زمان state فقط رکورد جدید گرفته است: همان فایل (inode)، دست‌کم همان تعداد رکورد
+    و رکوردهای ایندکس شده دست‌نخورده (همان checksum)
+    """
+    source = state.get("source") or []
+    return (state.get("docs") == docs and len(source) == len(signature) and source[3] == signature[3]
+            and len(theses) >= docs and state.get("crc") == _checksum(theses, docs))
+
+
+def get_text_index() -> ThesisTextIndex:
+    """
+    بارگذاری ایندکس از دیسک و هماهنگ کردن آن با آرشیو.
+    خطوطی که پردازه‌های دیگر اضافه کرده‌اند خوانده می‌شوند. اگر امضای آرشیو با وضعیت ذخیره شده کنار
+    ایندکس یکی باشد کار دیگری لازم نیست؛ اگر آرشیو فقط رکورد جدید گرفته باشد خطوط همان رکوردها به
+    انتهای فایل اضافه می‌شود و در غیر این صورت (بازنویسی، کوتاه شدن یا تغییر رکوردهای قبلی) یا اگر
+    فایل ایندکس قابل خواندن نباشد ایندکس از نو ساخته می‌شود.
+    """
+    global _loaded
+
+    full_path = get_full_path(INDEX_FILE)
+    state_path = get_full_path(INDEX_STATE_FILE)
+    with file_lock(full_path):
+        inode, offset, index = _loaded
+        try:
+            stat_result = os.stat(full_path)
+        except FileNotFoundError:
+            stat_result = None
+
+        if stat_result is None or stat_result.st_ino != inode or stat_result.st_size < offset:
+            # فایل جدید، بازسازی شده یا کوتاه شده؛ خواندن از ابتدا
+            inode, offset, index = (stat_result.st_ino if stat_result else None), 0, ThesisTextIndex()
+        if stat_result is not None and stat_result.st_size > offset:
+            offset = _read_entries(index, full_path, offset)
+
+        # امضا پیش از خواندن آرشیو گرفته می‌شود؛ نوشتن همزمان فقط باعث بررسی دوباره در دفعه بعد می‌شود
+        signature = _source_signature()
+        state = _read_state(state_path)
+        if state.get("source") == signature and state.get("docs") == index.doc_count:
+            _loaded = (inode, offset, index)
+            return index
+
+        theses = get_storage().all("defended_theses")
+        docs = index.doc_count
+        if not _appended_only(state, signature, theses, docs):
+            index = ThesisTextIndex()
+            _atomic_write(full_path, _encode([index.add(thesis) for thesis in theses]), keep_backup=False)
+            stat_result = os.stat(full_path)
+            inode, offset = stat_result.st_ino, stat_result.st_size
+            checksum = _checksum(theses, len(theses))
+        else:
+            checksum = _checksum(theses, len(theses), docs, state["crc"])
+            if docs < len(theses):
+                # خطوط جدید از انتهای آخرین خط کامل نوشته می‌شوند (خط ناقص قبلی بازنویسی می‌شود)
+                data = _encode([index.add(thesis) for thesis in theses[docs:]]).encode('utf-8')
+                _write_at(full_path, data, offset)
+                inode, offset = os.stat(full_path).st_ino, offset + len(data)
+
+        state = {"source": signature, "docs": index.doc_count, "crc": checksum}
+        _atomic_write(state_path, codec.dumps(state, compact=True), keep_backup=False)
+
+        for legacy_path in (get_full_path(LEGACY_INDEX_FILE), get_full_path(LEGACY_INDEX_FILE) + BACKUP_SUFFIX):
+            if os.path.exists(legacy_path):
+                os.remove(legacy_path)
+
+        _loaded = (inode, offset, index)
+        return index
+
+
+def search_text(query: str, limit: int = 50) -> List[Dict[str, Any]]:
+    """جستجوی متن کامل در آرشیو و برگرداندن پایان‌نامه‌ها به ترتیب امتیاز"""
+    index = get_text_index()
+    theses = get_storage().all("defended_theses")
+    return [theses[doc] for doc, _ in index.search(query, limit) if doc < len(theses)]
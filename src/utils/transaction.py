@@ -0,0 +1,207 @@
+import os
+import re
+import uuid
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Iterable, List
+from src.utils import codec
+from src.utils.archive import is_archived, encode_records, append_records, AppendBuffer
+from src.utils.changelog import (COMPACT_BYTES, is_logged, diff_events, encode_events, append_to_log,
+                                 log_end, log_size)
+from src.utils.file_io import (get_full_path, read_json, write_json, invalidate_cache, _decode_file, _stage_write,
+                               _publish_write, _atomic_write, _fsync_directory, _record_write)
+from src.utils.locking import file_lock, bump_version
+
+# پوشه ژورنال تراکنش‌ها؛ هر تراکنش در حال commit یک فایل در این پوشه دارد
+JOURNAL_DIR = "data/.journal"
+
+# فایل‌های موقتی که _stage_write کنار هر فایل داده می‌سازد
+_TEMP_FILE = re.compile(r"^\..+\.tmp$")
+
+
+def update_many(file_paths: Iterable[str], mutate: Callable[[Dict[str, List[Dict[str, Any]]]], Any]) -> Any:
+    """
+    تراکنش روی چند فایل: همه تغییرات یک عملیات با هم ثبت می‌شوند یا هیچ‌کدام.
+    قفل همه فایل‌ها به ترتیب مرتب‌شده مسیرها گرفته می‌شود (برای جلوگیری از بن‌بست)،
+    سپس mutate روی دیکشنری {مسیر: کپی داده} اجرا می‌شود و باید داده‌ها را درجا تغییر دهد.
+    اگر mutate مقدار None یا False برگرداند تراکنش لغو می‌شود و چیزی نوشته نمی‌شود.
+
+    ترتیب commit (write-ahead): ابتدا محتوای جدید همه فایل‌های تغییر کرده در فایل‌های موقت
+    نوشته و fsync می‌شود، سپس ژورنال تراکنش (لیست فایل‌های موقت) به صورت اتمیک ذخیره می‌شود
+    که نقطه commit است، و بعد فایل‌های موقت جایگزین فایل‌های اصلی می‌شوند.
+    برای مجموعه‌های دارای لاگ تغییرات (changelog) به جای فایل موقت فقط رویدادهای تغییر
+    در ژورنال می‌آیند و به انتهای لاگ اضافه می‌شوند؛ برای آرشیوها هم فقط رکوردهای جدید.
+    اگر برنامه وسط کار متوقف شود، recover_transactions در اجرای بعدی تراکنش را کامل می‌کند.
+    بازگشت: مقدار برگشتی mutate، یا None در صورت خطا
+    """
+    paths = sorted(set(file_paths))
+    try:
+        with ExitStack() as stack:
+            for path in paths:
+                stack.enter_context(file_lock(get_full_path(path)))
+
+            # زیر قفل، داده‌ها تازه‌اند و تا پایان تراکنش تغییر نمی‌کنند
+            originals = {path: read_json(path, copy=False) for path in paths}
+            # آرشیوها کپی نمی‌شوند؛ رکوردهای جدید آن‌ها جداگانه نگه داشته می‌شوند
+            collections = {path: AppendBuffer(originals[path]) if is_archived(path) else read_json(path)
+                           for path in paths}
+
+            result = mutate(collections)
+            if result is None or result is False:
+                return result
+
+            changed = [path for path in paths
+                       if (collections[path].appended if is_archived(path) else collections[path] != originals[path])]
+            if changed:
+                _commit(changed, originals, collections)
+            return result
+    except Exception as e:
+        print(f"❌ خطا در ثبت تراکنش روی فایل‌های {', '.join(paths)}: {e}")
+        return None
+
+
+def _commit(paths: List[str], originals: Dict[str, List[Dict[str, Any]]],
+            collections: Dict[str, List[Dict[str, Any]]]) -> None:
+    """نوشتن فایل‌های تغییر کرده با ژورنال؛ باید زیر قفل همه فایل‌ها صدا زده شود"""
+    entries = []
+    staged = []  # (مسیر نسبی، مسیر کامل، فایل موقت)
+    try:
+        for path in paths:
+            full_path = get_full_path(path)
+            if is_archived(path):
+                # فقط رکوردهای جدید به انتهای آرشیو اضافه می‌شوند (مثل لاگ تغییرات)
+                archive = originals[path]
+                entries.append({"path": path, "archive_offset": archive.end, "archive_count": len(archive),
+                                "append": encode_records(collections[path].appended)})
+                continue
+            if is_logged(path):
+                # فقط تغییرات به لاگ اضافه می‌شوند؛ offset برای تکرارپذیری بازیابی ثبت می‌شود
+                events = encode_events(diff_events(originals[path], collections[path]))
+                entries.append({"path": path, "log_offset": log_end(full_path), "append": events})
+                continue
+
+            # ابتدا کل داده serialize می‌شود تا خطای احتمالی قبل از ثبت ژورنال رخ دهد
+            text = codec.dumps(collections[path])
+            temp_path = _stage_write(full_path, text)
+            staged.append((path, full_path, temp_path))
+            entries.append({"path": path, "temp": os.path.basename(temp_path)})
+
+        journal = {"id": uuid.uuid4().hex, "files": entries}
+        journal_path = os.path.join(get_full_path(JOURNAL_DIR), f"{journal['id']}.json")
+        _atomic_write(journal_path, codec.dumps(journal, compact=True), keep_backup=False)
+    except BaseException:
+        # هنوز به نقطه commit نرسیده‌ایم؛ فایل‌های اصلی دست نخورده‌اند
+        for _, _, temp_path in staged:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
+
+    # از این نقطه تراکنش commit شده است
+    for entry in entries:
+        full_path = get_full_path(entry["path"])
+        if "archive_offset" in entry:
+            append_records(full_path, entry["append"], entry["archive_offset"], entry["archive_count"])
+        elif "append" in entry:
+            append_to_log(full_path, entry["append"], entry["log_offset"])
+        else:
+            _publish_write(full_path, os.path.join(os.path.dirname(full_path), entry["temp"]))
+    for directory in {os.path.dirname(full_path) for _, full_path, _ in staged}:
+        _fsync_directory(directory)
+    for path in paths:
+        _record_write(get_full_path(path), collections[path])
+
+    _remove_journal(journal_path)
+
+    # لاگ‌های بزرگ در snapshot ادغام می‌شوند (قفل‌ها هنوز گرفته شده‌اند)
+    for path in paths:
+        if is_logged(path) and log_size(get_full_path(path)) > COMPACT_BYTES:
+            write_json(path, collections[path])
+
+
+def _remove_journal(journal_path: str) -> None:
+    """حذف ژورنال یک تراکنش کامل شده"""
+    os.remove(journal_path)
+    _fsync_directory(os.path.dirname(journal_path))
+
+
+def _replay_journal(journal_path: str) -> bool:
+    """
+    کامل کردن یک تراکنش commit شده از روی ژورنال آن.
+    بازگشت: True اگر تراکنش (یا باقی‌مانده آن) اعمال شد
+    """
+    try:
+        journal = _decode_file(journal_path)
+        entries = journal["files"]
+    except (OSError, ValueError, KeyError, TypeError):
+        # ژورنال ناقص یعنی تراکنش به نقطه commit نرسیده؛ نادیده گرفته می‌شود (rollback)
+        os.remove(journal_path)
+        return False
+
+    with ExitStack() as stack:
+        for path in sorted({entry["path"] for entry in entries}):
+            stack.enter_context(file_lock(get_full_path(path)))
+
+        # ممکن است پروسه صاحب تراکنش همین حالا آن را تمام کرده باشد
+        if not os.path.exists(journal_path):
+            return False
+
+        for entry in entries:
+            full_path = get_full_path(entry["path"])
+            if "append" in entry:
+                if "archive_offset" in entry:
+                    append_records(full_path, entry["append"], entry["archive_offset"], entry["archive_count"])
+                else:
+                    append_to_log(full_path, entry["append"], entry["log_offset"])
+                bump_version(full_path)
+                invalidate_cache(entry["path"])
+                continue
+
+            temp_path = os.path.join(os.path.dirname(full_path), entry["temp"])
+            # فایل‌هایی که قبل از توقف جایگزین شده بودند دیگر فایل موقت ندارند
+            if os.path.exists(temp_path):
+                _publish_write(full_path, temp_path)
+                _fsync_directory(os.path.dirname(full_path))
+            bump_version(full_path)
+            invalidate_cache(entry["path"])
+
+        _remove_journal(journal_path)
+    return True
+
+
+def _remove_orphan_temps() -> int:
+    """
+    حذف فایل‌های موقت تراکنش‌ها یا نوشتن‌هایی که قبل از commit متوقف شده‌اند (rollback).
+    هر فایل موقت زیر قفل فایل اصلی آن بررسی می‌شود، پس نوشتن‌های در حال انجام دست نمی‌خورند.
+    """
+    removed = 0
+    journal_dir = get_full_path(JOURNAL_DIR)
+    for directory, _, names in os.walk(get_full_path("data")):
+        if directory == journal_dir:
+            continue
+        for name in names:
+            if not _TEMP_FILE.match(name) or name.count(".") < 3:
+                continue
+            # نام فایل موقت: .<نام فایل اصلی>.<پسوند تصادفی>.tmp
+            original = name[1:].rsplit(".", 2)[0]
+            with file_lock(os.path.join(directory, original)):
+                temp_path = os.path.join(directory, name)
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                    removed += 1
+    return removed
+
+
+def recover_transactions() -> int:
+    """
+    بازیابی تراکنش‌های ناتمام در شروع برنامه.
+    تراکنش‌هایی که ژورنال دارند تا انتها اعمال می‌شوند و فایل‌های موقت بقیه حذف می‌شوند.
+    بازگشت: تعداد تراکنش‌های تکمیل شده
+    """
+    replayed = 0
+    journal_dir = get_full_path(JOURNAL_DIR)
+    if os.path.isdir(journal_dir):
+        for name in sorted(os.listdir(journal_dir)):
+            if name.endswith(".json") and _replay_journal(os.path.join(journal_dir, name)):
+                replayed += 1
+
+    _remove_orphan_temps()
+    return replayed
@@ -0,0 +1,147 @@
+from collections import defaultdict
+from datetime import date
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from src.models import RequestStatus
+from src.storage import get_storage
+from src.utils.columnar import DefenseSnapshot, get_defense_snapshot
+
+# نام صف‌های کاری (کلید هر صف: نام صف و شناسه استاد یا داور)
+PENDING_ENROLLMENTS = "pending_enrollments"    # درخواست‌های اخذ منتظر تأیید استاد راهنما
+PENDING_DEFENSES = "pending_defenses"          # درخواست‌های دفاع منتظر تعیین جلسه
+DEFENSES_TO_GRADE = "defenses_to_grade"        # دفاع‌های تایید شده با تاریخ، برای داور داخلی و خارجی
+EXTERNAL_GRADES_OWED = "external_grades_owed"  # دفاع‌هایی که نمره داور خارجی ندارند
+
+QueueKey = Tuple[str, Any]
+
+
+def _enrollment_queues(record: Dict[str, Any]) -> Iterator[QueueKey]:
+    """صف‌هایی که یک درخواست اخذ در آن‌ها قرار می‌گیرد"""
+    if record.get("status") == RequestStatus.PENDING:
+        yield PENDING_ENROLLMENTS, record.get("professor_id")
+
+
+def _defense_queues(record: Dict[str, Any]) -> Iterator[QueueKey]:
+    """صف‌هایی که یک درخواست دفاع در آن‌ها قرار می‌گیرد"""
+    status = record.get("status")
+    if status == RequestStatus.PENDING:
+        yield PENDING_DEFENSES, record.get("professor_id")
+    elif status == RequestStatus.APPROVED and record.get("defense_date"):
+        for judge_id in {record.get("internal_judge_id"), record.get("external_judge_id")} - {None}:
+            yield DEFENSES_TO_GRADE, judge_id
+    if record.get("external_judge_id") and "external_grade" not in record:
+        yield EXTERNAL_GRADES_OWED, record["external_judge_id"]
+
+
+class WorkQueues:
+    """
+    صف‌های کاری هر کاربر روی یک مجموعه درخواست.
+    برای هر ردیف صف‌هایی که در آن‌ها عضو است نگه داشته می‌شود و با changes_since فقط ردیف‌هایی
+    که وضعیتشان عوض شده جابه‌جا می‌شوند؛ پس باز کردن یک منو به اندازه کارهای همان کاربر هزینه دارد
+    نه به اندازه همه درخواست‌های دانشگاه.
+    اگر snapshot (نمای ستونی src.utils.columnar) داده شود با همان تغییرات به‌روز می‌شود تا فیلتر
+    اعضای صف روی ستون‌های عددی (تاریخ ordinal، بیت‌های نمره) انجام شود.
+    """
+    def __init__(self, collection: str, rules: Callable[[Dict[str, Any]], Iterator[QueueKey]],
+                 snapshot: Optional[DefenseSnapshot] = None):
+        self.collection = collection
+        self.snapshot = snapshot
+        self._rules = rules
+        self._reset()
+
+    def _reset(self) -> None:
+        self._members: List[Tuple[QueueKey, ...]] = []  # ردیف -> صف‌های عضو
+        self._queues: Dict[QueueKey, Set[int]] = defaultdict(set)
+        self.records: Sequence[Dict[str, Any]] = []
+        self.token = None
+
+    def _place(self, position: int, record: Dict[str, Any]) -> None:
+        members = tuple(self._rules(record))
+        if position == len(self._members):
+            self._members.append(())
+        previous = self._members[position]
+        if members == previous:
+            return
+        for key in previous:
+            queue = self._queues[key]
+            queue.discard(position)
+            if not queue:
+                del self._queues[key]
+        for key in members:
+            self._queues[key].add(position)
+        self._members[position] = members
+
+    def sync(self) -> None:
+        """هماهنگ کردن صف‌ها با آخرین وضعیت مجموعه (فقط ردیف‌های تغییر کرده)"""
+        records, positions, token = get_storage().changes_since(self.collection, self.token)
+        if self.snapshot is not None:
+            self.snapshot.apply(records, positions, token)
+        if positions is None or len(records) < len(self._members):
+            self._reset()
+            positions = []
+
+        for position in positions:
+            if position < len(self._members):
+                self._place(position, records[position])
+        for position in range(len(self._members), len(records)):
+            self._place(position, records[position])
+
+        self.records = records
+        self.token = token
+
+    def positions(self, queue: str, owner_id: Any) -> List[int]:
+        """شماره ردیف اعضای صف به ترتیب ثبت در فایل"""
+        return sorted(self._queues.get((queue, owner_id), ()))
+
+    def items(self, queue: str, owner_id: Any) -> List[Dict[str, Any]]:
+        """رکوردهای صف به ترتیب ثبت در فایل (فقط برای خواندن)"""
+        return [self.records[position] for position in self.positions(queue, owner_id)]
+
+    def count(self, queue: str, owner_id: Any) -> int:
+        """تعداد کارهای صف"""
+        return len(self._queues.get((queue, owner_id), ()))
+
+
+_enrollments = WorkQueues("enrollment_requests", _enrollment_queues)
+# صف‌های دفاع و نمای ستونی مشترک درخواست‌های دفاع با هم به‌روز می‌شوند
+_defenses = WorkQueues("defense_requests", _defense_queues, get_defense_snapshot())
+
+_QUEUES = {
+    PENDING_ENROLLMENTS: _enrollments,
+    PENDING_DEFENSES: _defenses,
+    DEFENSES_TO_GRADE: _defenses,
+    EXTERNAL_GRADES_OWED: _defenses,
+}
+
+
+def get_queue(queue: str, owner_id: Any) -> List[Dict[str, Any]]:
+    """کارهای یک استاد یا داور در صف queue، هماهنگ با آخرین تغییرات"""
+    queues = _QUEUES[queue]
+    queues.sync()
+    return queues.items(queue, owner_id)
+
+
+def queue_count(queue: str, owner_id: Any) -> int:
+    """تعداد کارهای یک استاد یا داور در صف queue"""
+    queues = _QUEUES[queue]
+    queues.sync()
+    return queues.count(queue, owner_id)
+
+
+def _due_positions(judge_id: Any, due_by: Optional[date], **conditions) -> List[int]:
+    """
+    ردیف‌های صف نمره‌دهی judge_id که تاریخ دفاعشان تا due_by (پیش‌فرض امروز) گذشته، با فیلتر ستونی
+    snapshot.find روی همان ردیف‌های صف (conditions: شرط‌های دیگر find)
+    """
+    _defenses.sync()
+    return _defenses.snapshot.find(judge_id=judge_id, due_by=due_by or date.today(),
+                                   positions=_defenses.positions(DEFENSES_TO_GRADE, judge_id), **conditions)
+
+
+def due_defenses(judge_id: Any, due_by: Optional[date] = None) -> List[Dict[str, Any]]:
+    """دفاع‌های تایید شده‌ای که judge_id داور آن‌هاست و تاریخ دفاعشان تا due_by (پیش‌فرض امروز) گذشته"""
+    return [_defenses.records[position] for position in _due_positions(judge_id, due_by)]
+
+
+def grades_owed(judge_id: Any, due_by: Optional[date] = None) -> int:
+    """تعداد دفاع‌های گذشته که judge_id هنوز نمره‌ای برایشان ثبت نکرده (از بیت‌های ستون graded)"""
+    return len(_due_positions(judge_id, due_by, ungraded_by=judge_id))
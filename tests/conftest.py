@@ -0,0 +1,26 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+# اجرای تست‌ها از root پروژه یا هر پوشه دیگر (مثل run.py و benchmarks)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+@pytest.fixture
+def data_root(tmp_path, monkeypatch):
+    """کپی داده‌های نمونه پروژه (فایل‌های JSON) در یک پوشه موقت به عنوان root داده‌ها (مثل THESIS_DATA_ROOT)"""
+    from src import storage
+    from src.utils import file_io
+
+    shutil.copytree(os.path.join(PROJECT_ROOT, "data"), tmp_path / "data",
+                    ignore=shutil.ignore_patterns(".journal", "*.lock", "*.log.jsonl", "*.idx", "*.index.*",
+                                                  "*.bak", "*.db*"))
+    monkeypatch.setattr(file_io, "DATA_ROOT", str(tmp_path))
+    monkeypatch.setenv(storage.STORAGE_ENV, "json")
+    monkeypatch.setattr(storage, "_backend", None)
+    file_io.invalidate_cache()
+    yield tmp_path
+    file_io.invalidate_cache()
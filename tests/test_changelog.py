@@ -0,0 +1,49 @@
+"""لاگ تغییرات با خط ناقص در انتها (نوشتن نیمه‌تمام)"""
+from src.storage import get_storage
+from src.utils.changelog import encode_events, log_end, log_path, read_events, replay
+from src.utils.file_io import get_full_path, invalidate_cache
+
+EVENT = {"op": "update", "pos": 0, "at": "2025-01-01T00:00:00", "set": {"name": "الف"}}
+PARTIAL = b'{"op": "update", "pos": 1, "set": {"na'
+
+
+def _write_log(tmp_path, content: bytes) -> str:
+    full_path = str(tmp_path / "records.json")
+    with open(log_path(full_path), "wb") as file:
+        file.write(content)
+    return full_path
+
+
+def test_partial_trailing_line_is_ignored(tmp_path):
+    complete = encode_events([EVENT]).encode("utf-8")
+    full_path = _write_log(tmp_path, complete + PARTIAL)
+
+    records, applied = replay([{"name": "a"}, {"name": "b"}], full_path)
+    assert applied == 1
+    assert records == [{"name": "الف"}, {"name": "b"}]
+
+    events, end = read_events(full_path, 0)
+    assert events == [EVENT]
+    assert end == log_end(full_path) == len(complete)
+
+
+def test_trailing_line_without_newline_is_not_applied(tmp_path):
+    # حتی اگر خط آخر JSON کامل باشد، بدون \n هنوز نوشتنش تمام نشده است
+    full_path = _write_log(tmp_path, encode_events([EVENT]).encode("utf-8")[:-1])
+
+    assert replay([{"name": "a"}], full_path) == ([{"name": "a"}], 0)
+    assert read_events(full_path, 0) == ([], 0)
+    assert log_end(full_path) == 0
+
+
+def test_write_after_partial_line_is_kept(data_root):
+    storage = get_storage()
+    assert storage.update("students", {"user_id": "student_1"}, {"name": "اول"})
+    with open(log_path(get_full_path("data/users/students.json")), "ab") as file:
+        file.write(PARTIAL)
+    invalidate_cache()
+
+    assert storage.update("students", {"user_id": "student_2"}, {"name": "دوم"})
+    invalidate_cache()
+    names = {s["user_id"]: s["name"] for s in storage.all("students")}
+    assert (names["student_1"], names["student_2"]) == ("اول", "دوم")
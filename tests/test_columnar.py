@@ -0,0 +1,96 @@
+"""فیلترهای نمای ستونی درخواست‌های دفاع در هر دو مسیر (NumPy و حلقه روی array) در برابر حلقه ساده"""
+import random
+from datetime import date
+
+import pytest
+
+from src.models import RequestStatus
+from src.utils import columnar
+from src.utils.columnar import DefenseSnapshot
+
+JUDGES = ["prof_1", "prof_2", "ex_1", "ex_2"]
+TODAY = date(2025, 6, 1)
+
+
+def make_requests(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    requests = []
+    for i in range(count):
+        request = {"student_id": f"student_{i}", "professor_id": "prof_1", "status": rng.choice(list(RequestStatus))}
+        if rng.random() < 0.8:
+            request.update(internal_judge_id=rng.choice(JUDGES[:2]), external_judge_id=rng.choice(JUDGES[2:]),
+                           defense_date=f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+            if rng.random() < 0.3:
+                request["internal_grade"] = 17
+            if rng.random() < 0.3:
+                request["external_grade"] = 15
+        requests.append(request)
+    return requests
+
+
+def matches(request: dict, status=None, judge_id=None, due_by=None, external_graded=None, ungraded_by=None) -> bool:
+    internal, external = request.get("internal_judge_id"), request.get("external_judge_id")
+    return ((status is None or request["status"] == status)
+            and (judge_id is None or judge_id in (internal, external))
+            and (due_by is None or ("defense_date" in request
+                                    and date.fromisoformat(request["defense_date"]) <= due_by))
+            and (external_graded is None or ("external_grade" in request) == external_graded)
+            and (ungraded_by is None or (internal == ungraded_by and "internal_grade" not in request)
+                 or (external == ungraded_by and "external_grade" not in request)))
+
+
+CONDITIONS = [
+    {},
+    dict(status=RequestStatus.APPROVED, judge_id="prof_2", due_by=TODAY),
+    dict(judge_id="ex_1", external_graded=False),
+    dict(judge_id="prof_1", due_by=TODAY, ungraded_by="prof_1"),
+    dict(ungraded_by="ex_2"),
+    dict(judge_id="nobody"),
+]
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        if columnar.np is None:
+            pytest.skip("NumPy نصب نیست")
+    else:
+        monkeypatch.setattr(columnar, "np", None)
+    return request.param
+
+
+@pytest.mark.parametrize("conditions", CONDITIONS)
+def test_find_matches_loop(backend, conditions):
+    requests = make_requests(500)
+    snapshot = DefenseSnapshot()
+    snapshot.apply(requests, None)
+
+    expected = [i for i, r in enumerate(requests) if matches(r, **conditions)]
+    assert snapshot.find(**conditions) == expected
+    assert snapshot.select(**conditions) == [requests[i] for i in expected]
+
+
+@pytest.mark.parametrize("conditions", CONDITIONS)
+def test_find_within_positions(backend, conditions):
+    requests = make_requests(500, seed=2)
+    snapshot = DefenseSnapshot()
+    snapshot.apply(requests, None)
+
+    subset = list(range(3, 500, 7))
+    assert snapshot.find(positions=subset, **conditions) == [i for i in subset if matches(requests[i], **conditions)]
+    assert snapshot.find(positions=[], **conditions) == []
+
+
+def test_apply_updates_changed_rows(backend):
+    requests = make_requests(200, seed=3)
+    snapshot = DefenseSnapshot()
+    snapshot.apply(requests, None)
+
+    requests[10] = dict(requests[10], status=RequestStatus.APPROVED, internal_judge_id="prof_9",
+                        defense_date="2025-01-01")
+    requests.append({"student_id": "new", "status": RequestStatus.APPROVED, "internal_judge_id": "prof_9",
+                     "defense_date": "2025-02-01", "internal_grade": 18})
+    snapshot.apply(requests, [10])
+
+    assert snapshot.find(judge_id="prof_9", due_by=TODAY) == [10, 200]
+    assert snapshot.find(ungraded_by="prof_9") == [10]
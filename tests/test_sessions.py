@@ -0,0 +1,78 @@
+"""توکن‌های session: رد توکن باطل شده، دستکاری شده یا منقضی، و به‌روزرسانی هش قدیمی SHA-256 هنگام ورود"""
+import hashlib
+
+import pytest
+
+from src.models import USER_MODELS
+from src.storage import get_storage
+from src.utils import sessions
+from src.utils.passwords import needs_rehash, verify_password
+from src.utils.sessions import (authenticate, create_session, end_session, get_session_user,
+                                revoke_user_sessions)
+
+
+@pytest.fixture(autouse=True)
+def fresh_sessions(monkeypatch):
+    """جدول‌های session این پردازه برای هر تست خالی شروع می‌شوند"""
+    for table in ("_sessions", "_users", "_ended"):
+        monkeypatch.setattr(sessions, table, {})
+
+
+def _student(user_id: str = "student_1"):
+    return USER_MODELS["student"].from_dict(get_storage().find_one("students", "user_id", user_id))
+
+
+def test_valid_token_returns_user(data_root):
+    user = _student()
+    assert get_session_user(create_session(user)) is user
+
+
+def test_ended_session_is_rejected(data_root):
+    token = create_session(_student())
+    end_session(token)
+    assert get_session_user(token) is None
+
+
+def test_revoked_sessions_are_rejected(data_root):
+    old_token = create_session(_student())
+    current = _student()
+    current_token = create_session(current)
+
+    assert revoke_user_sessions(current) == 1
+    assert get_session_user(old_token) is None
+    assert get_session_user(current_token) is current
+
+
+def test_tampered_token_is_rejected(data_root):
+    token = create_session(_student())
+    payload, signature = token.split(".")
+
+    # ادعاهای دیگر با امضای توکن اصلی
+    claims = sessions.codec.loads(sessions._unb64(payload))
+    forged = sessions._b64(sessions.codec.dumps(dict(claims, uid="student_2"), compact=True).encode("utf-8"))
+    assert get_session_user(f"{forged}.{signature}") is None
+    # امضای دستکاری شده
+    assert get_session_user(f"{payload}.{signature[:-1]}{'A' if signature[-1] != 'A' else 'B'}") is None
+    # توکن بدون امضا یا بی‌معنی
+    assert get_session_user(payload) is None
+    assert get_session_user("not-a-token") is None
+
+
+def test_expired_token_is_rejected(data_root):
+    assert get_session_user(create_session(_student(), ttl=-1)) is None
+
+
+def test_legacy_sha256_hash_is_rehashed_on_login(data_root):
+    storage = get_storage()
+    legacy = hashlib.sha256("secret".encode("utf-8")).hexdigest()
+    assert storage.update("students", {"user_id": "student_3"}, {"password": legacy})
+
+    assert authenticate("student_3", "wrong", "student") is None
+    assert storage.find_one("students", "user_id", "student_3")["password"] == legacy
+
+    token = authenticate("student_3", "secret", "student")
+    assert token is not None
+    stored = storage.find_one("students", "user_id", "student_3")["password"]
+    assert stored != legacy and not needs_rehash(stored)
+    assert verify_password("secret", stored)
+    assert get_session_user(token).password == stored
@@ -0,0 +1,54 @@
+"""بازیابی تراکنشی که ژورنالش ثبت شده ولی پیش از اعمال کامل متوقف شده است"""
+import os
+
+import pytest
+
+from src.storage import get_storage
+from src.utils import transaction
+from src.utils.file_io import get_full_path, invalidate_cache
+from src.utils.transaction import JOURNAL_DIR, recover_transactions
+
+
+def _journals() -> list:
+    journal_dir = get_full_path(JOURNAL_DIR)
+    return os.listdir(journal_dir) if os.path.isdir(journal_dir) else []
+
+
+@pytest.mark.parametrize("collection, match, field, value, step", [
+    # مجموعه بدون لاگ: فایل موقت کامل پس از commit جایگزین فایل اصلی می‌شود
+    ("courses", {"course_id": "course_1"}, "capacity", 42, "_publish_write"),
+    # مجموعه دارای لاگ تغییرات: رویدادها پس از commit به لاگ اضافه می‌شوند
+    ("students", {"user_id": "student_1"}, "name", "نام تازه", "append_to_log"),
+])
+def test_recover_replays_leftover_journal(data_root, monkeypatch, collection, match, field, value, step):
+    storage = get_storage()
+    before = storage.find_one(collection, *next(iter(match.items())))[field]
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("توقف پس از نقطه commit")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(transaction, step, crash)
+        assert storage.update(collection, match, {field: value}) is None
+
+    # ژورنال مانده و فایل اصلی هنوز مقدار قبلی را دارد
+    assert len(_journals()) == 1
+    invalidate_cache()
+    assert storage.find_one(collection, *next(iter(match.items())))[field] == before
+
+    assert recover_transactions() == 1
+    assert _journals() == []
+    invalidate_cache()
+    assert storage.find_one(collection, *next(iter(match.items())))[field] == value
+    # اجرای دوباره بازیابی کاری انجام نمی‌دهد
+    assert recover_transactions() == 0
+
+
+def test_recover_discards_incomplete_journal(data_root):
+    journal_dir = get_full_path(JOURNAL_DIR)
+    os.makedirs(journal_dir)
+    with open(os.path.join(journal_dir, "torn.json"), "w", encoding="utf-8") as file:
+        file.write('{"id": "torn", "files": [{"path": "data/courses/thes')
+
+    assert recover_transactions() == 0
+    assert _journals() == []